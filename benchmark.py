@@ -0,0 +1,230 @@
+import os
+import sys
+import json
+import gzip
+import time
+import asyncio
+import hashlib
+import logging
+import argparse
+import tracemalloc
+import requests
+from main import SCRAPER_CLASSES
+from utils.url_utils import ProductFrontier
+from utils.listing import listing_entry, PDP_FETCHED_AT
+from utils.prices import normalize_records
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(SCRIPT_DIR, 'benchmarks', 'corpus')
+GOLDEN_DIR = os.path.join(SCRIPT_DIR, 'benchmarks', 'golden')
+# Fields that legitimately differ between two runs over the same pages.
+VOLATILE_FIELDS = (PDP_FETCHED_AT,)
+
+
+def page_file(url):
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=10).hexdigest() + '.html.gz'
+
+
+class Corpus:
+    """Saved responses of one store, replayed in place of the network."""
+
+    def __init__(self, store_name):
+        self.dir = os.path.join(CORPUS_DIR, store_name)
+        self.manifest_path = os.path.join(self.dir, 'manifest.json')
+        self.pages = {}
+        self.category = None
+        self.pdps = []
+        self.served = 0
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            self.pages = manifest['pages']
+            self.category = manifest['category']
+            self.pdps = manifest['pdps']
+
+    def __bool__(self):
+        return bool(self.pages)
+
+    def add(self, url, response):
+        os.makedirs(self.dir, exist_ok=True)
+        name = page_file(url)
+        with gzip.open(os.path.join(self.dir, name), 'wb') as f:
+            f.write(response.content)
+        self.pages[url] = {'file': name, 'status': response.status_code, 'encoding': response.encoding}
+
+    def save(self):
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({'category': self.category, 'pdps': self.pdps, 'pages': self.pages}, f, indent=2)
+
+    def response(self, url, method='GET'):
+        page = self.pages.get(url)
+        if page is None:
+            raise requests.exceptions.HTTPError(f"Not in corpus: {url}")
+        response = requests.models.Response()
+        with gzip.open(os.path.join(self.dir, page['file']), 'rb') as f:
+            response._content = f.read()
+        response.status_code = page['status']
+        response.encoding = page['encoding']
+        response.url = url
+        self.served += 1
+        return response
+
+
+def reset(scraper):
+    scraper.frontier = ProductFrontier()
+    scraper.products_by_url = {}
+    scraper.variant_results = {}
+    scraper.prefetched.clear()
+
+
+async def scrape_corpus(scraper, category, pdps):
+    reset(scraper)
+    entries = await scraper.scrape_products_links(category)
+    records = {}
+    for link in pdps:
+        records[link] = await scraper.scrape_pdp(link)
+    return entries, records
+
+
+def comparable(entries, records, default_currency):
+    listing = sorted(
+        (json.dumps(entry, sort_keys=True, ensure_ascii=False) for entry in entries or []),
+    )
+    pdps = {}
+    for link, record in records.items():
+        if isinstance(record, dict):
+            record = {key: value for key, value in record.items() if key not in VOLATILE_FIELDS}
+            if 'error' not in record:
+                normalize_records([record], default_currency)
+        pdps[link] = json.loads(json.dumps(record, sort_keys=True, ensure_ascii=False, default=str))
+    return {'listing': [json.loads(entry) for entry in listing], 'pdps': pdps}
+
+
+def golden_path(store_name):
+    return os.path.join(GOLDEN_DIR, f"{store_name}.json")
+
+
+def _by_link(entries):
+    return dict(listing_entry(entry) if isinstance(entry, dict) else (entry, entry) for entry in entries)
+
+
+def _record_diff(label, record, current):
+    if not isinstance(record, dict) or not isinstance(current, dict):
+        return [f"{label}: {record!r} != {current!r}"] if record != current else []
+    changed = sorted(key for key in set(record) | set(current) if record.get(key) != current.get(key))
+    return [f"{label}: {', '.join(changed)}"] if changed else []
+
+
+def golden_diff(expected, actual):
+    problems = []
+    listed, current = _by_link(expected['listing']), _by_link(actual['listing'])
+    for link in sorted(set(listed) | set(current)):
+        problems += _record_diff(f"listing {link}", listed.get(link), current.get(link))
+    for link in sorted(set(expected['pdps']) | set(actual['pdps'])):
+        problems += _record_diff(link, expected['pdps'].get(link), actual['pdps'].get(link))
+    return problems
+
+
+async def record_store(scraper, pdps):
+    corpus = Corpus(scraper.store_name)
+    categories = await scraper.get_unique_urls_from_file(os.path.join(scraper.module_dir, "categories.txt"))
+    live_request = scraper.make_request
+
+    def recording_request(url, method='GET'):
+        response = live_request(url, method)
+        corpus.add(url, response)
+        return response
+
+    scraper.make_request = recording_request
+    corpus.category = sorted(categories)[0]
+    entries = await scraper.scrape_products_links(corpus.category)
+    corpus.pdps = [listing_entry(entry)[0] for entry in entries][:pdps]
+    for link in corpus.pdps:
+        await scraper.scrape_pdp(link)
+    corpus.save()
+    print(f"Recorded {len(corpus.pages)} pages for {scraper.store_name}")
+
+
+async def bench_store(scraper, corpus, repeat):
+    scraper.make_request = corpus.response
+
+    timings = []
+    for _ in range(repeat):
+        corpus.served = 0
+        start = time.perf_counter()
+        entries, records = await scrape_corpus(scraper, corpus.category, corpus.pdps)
+        timings.append(time.perf_counter() - start)
+    pages = corpus.served
+
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    await scrape_corpus(scraper, corpus.category, corpus.pdps)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sys.getallocatedblocks() - blocks
+
+    best = min(timings)
+    return {
+        'pages': pages,
+        'pages_per_second': pages / best if best else 0.0,
+        'ms_per_page': best * 1000 / pages if pages else 0.0,
+        'peak_kb': peak / 1024,
+        'retained_blocks': blocks,
+        'result': comparable(entries, records, scraper.default_currency),
+    }
+
+
+async def main(args):
+    scrapers = [cls() for cls in SCRAPER_CLASSES if not args.stores or cls.__name__ in args.stores]
+    if args.record:
+        for scraper in scrapers:
+            try:
+                await record_store(scraper, args.pdps)
+            except Exception as e:
+                print(f"Recording {scraper.store_name} failed: {e}")
+        return 0
+
+    failures = 0
+    print(f"{'store':24s} {'pages':>6s} {'pages/s':>9s} {'ms/page':>8s} {'peak KB':>9s} {'blocks':>8s}  golden")
+    for scraper in scrapers:
+        corpus = Corpus(scraper.store_name)
+        if not corpus:
+            continue
+        stats = await bench_store(scraper, corpus, args.repeat)
+        path = golden_path(scraper.store_name)
+        if args.update_golden or not os.path.exists(path):
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(stats['result'], f, indent=2, ensure_ascii=False, sort_keys=True)
+            status, problems = 'written', []
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                problems = golden_diff(json.load(f), stats['result'])
+            status = 'ok' if not problems else f"{len(problems)} differences"
+        print(f"{scraper.store_name:24s} {stats['pages']:6d} {stats['pages_per_second']:9.1f} "
+              f"{stats['ms_per_page']:8.2f} {stats['peak_kb']:9.0f} {stats['retained_blocks']:8d}  {status}")
+        for problem in problems:
+            print(f"    {problem}")
+        failures += bool(problems)
+    return 1 if failures else 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay saved store pages through the parsers offline.")
+    parser.add_argument("--stores", nargs="*", help="Scraper class names to run (default: all with a corpus)")
+    parser.add_argument("--record", action="store_true",
+                        help="Fetch the first category's listing and its PDPs live and save them as the corpus")
+    parser.add_argument("--pdps", type=int, default=10, help="Product pages to record per store")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per store; the fastest is reported")
+    parser.add_argument("--update-golden", action="store_true",
+                        help="Accept the current records as the expected output")
+    parser.add_argument("--verbose", action="store_true", help="Keep scraper logging on")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if not args.verbose:
+        # Replays end pagination on a missing page, which scrapers log as an error.
+        logging.disable(logging.CRITICAL)
+    sys.exit(asyncio.run(main(args)))
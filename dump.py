@@ -4,6 +4,8 @@ import psycopg2
 from psycopg2 import sql
 from datetime import datetime
 from dotenv import load_dotenv
+from utils.prices import normalize_record
+from utils.snapshots import is_snapshot, iter_records
 
 load_dotenv()
 
@@ -21,6 +23,7 @@ if not all(DB_CONFIG.values()):
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 JSON_DIR = os.path.join(SCRIPT_DIR, 'jsondata')
+DEFAULT_CURRENCY = "PKR"
 
 def create_connection():
     try:
@@ -45,10 +48,14 @@ def create_table(conn):
         currency VARCHAR(3),
         original_price TEXT,
         sale_price TEXT,
+        original_price_minor BIGINT,
+        sale_price_minor BIGINT,
+        discount_percent SMALLINT,
         images JSONB NOT NULL DEFAULT '[]'::JSONB,
         brand TEXT,
         availability BOOLEAN,
         category TEXT,
+        categories JSONB NOT NULL DEFAULT '[]'::JSONB,
         product_url TEXT,
         variants JSONB NOT NULL DEFAULT '[]'::JSONB,
         attributes JSONB NOT NULL DEFAULT '{{}}'::JSONB,
@@ -80,16 +87,21 @@ def insert_product(conn, table_name, product):
     query = sql.SQL("""
     INSERT INTO {table} (
         store_name, title, sku, description, currency, 
-        original_price, sale_price, images, brand, availability,
-        category, product_url, variants, attributes, raw_data
+        original_price, sale_price, original_price_minor, sale_price_minor, discount_percent,
+        images, brand, availability,
+        category, categories, product_url, variants, attributes, raw_data
     ) VALUES (
         %s, %s, %s, %s, %s, 
-        %s, %s, %s::jsonb, %s, %s,
-        %s, %s, %s::jsonb, %s::jsonb, %s::jsonb
+        %s, %s, %s, %s, %s,
+        %s::jsonb, %s, %s,
+        %s, %s::jsonb, %s, %s::jsonb, %s::jsonb, %s::jsonb
     )
     """).format(table=sql.Identifier(table_name))
     
     try:
+        if 'original_price_minor' not in product:
+            # Snapshots written before prices were normalized at save time.
+            normalize_record(product, DEFAULT_CURRENCY)
         original_price = product.get('original_price')
         sale_price = product.get('sale_price')
         
@@ -104,10 +116,14 @@ def insert_product(conn, table_name, product):
                 product.get('currency'),
                 original_price,
                 sale_price,
+                product.get('original_price_minor'),
+                product.get('sale_price_minor'),
+                product.get('discount_percent'),
                 json.dumps(product.get('images', [])),
                 product.get('brand'),
                 availability,
                 product.get('category'),
+                json.dumps(product.get('categories', [])),
                 product.get('product_url'),
                 json.dumps(product.get('variants', [])),
                 json.dumps(product.get('attributes', {})),
@@ -138,16 +154,13 @@ def process_json_files():
             return
             
         for filename in os.listdir(JSON_DIR):
-            if filename.endswith('.json'):
+            if is_snapshot(filename):
                 filepath = os.path.join(JSON_DIR, filename)
                 print(f"Processing {filename}...")
                 
                 try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        products = json.load(f)
-                    
                     file_count = 0
-                    for product in products:
+                    for product in iter_records(filepath):
                         if insert_product(conn, table_name, product):
                             processed += 1
                             file_count += 1
@@ -0,0 +1,229 @@
+import os
+import json
+import argparse
+from datetime import datetime, timezone
+from utils.prices import normalize_record, parse_currency, parse_price, minor_digits
+from utils.history import SnapshotHistory, TIMESTAMP_FORMAT
+from utils.snapshots import is_snapshot, iter_records, replace_durably, snapshot_files, snapshot_extension
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    raise SystemExit("export.py needs pyarrow (listed in requirements.txt): pip install pyarrow")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+JSON_DIR = os.path.join(SCRIPT_DIR, 'jsondata')
+OLD_DIR = os.path.join(SCRIPT_DIR, 'oldjsondata')
+EXPORT_DIR = os.path.join(SCRIPT_DIR, 'parquet')
+DEFAULT_CURRENCY = "PKR"
+# Variant keys with a column of their own; every other key is an option such as size or colour.
+VARIANT_FIELDS = ('availability', 'price', 'original_price', 'sku')
+
+VARIANT_TYPE = pa.struct([
+    ('options', pa.map_(pa.string(), pa.string())),
+    ('availability', pa.bool_()),
+    ('price', pa.float64()),
+    ('original_price', pa.float64()),
+    ('price_minor', pa.int64()),
+    ('original_price_minor', pa.int64()),
+    ('sku', pa.string()),
+])
+
+SCHEMA = pa.schema([
+    ('store_name', pa.string()),
+    ('scrape_date', pa.date32()),
+    ('product_url', pa.string()),
+    ('title', pa.string()),
+    ('sku', pa.string()),
+    ('brand', pa.string()),
+    ('category', pa.string()),
+    ('categories', pa.list_(pa.string())),
+    ('currency', pa.string()),
+    ('original_price', pa.string()),
+    ('sale_price', pa.string()),
+    ('original_price_minor', pa.int64()),
+    ('sale_price_minor', pa.int64()),
+    ('discount_percent', pa.int16()),
+    ('availability', pa.bool_()),
+    ('image_count', pa.int32()),
+    ('variant_count', pa.int32()),
+    ('variants_available', pa.int32()),
+    ('images', pa.list_(pa.string())),
+    ('variants', pa.list_(VARIANT_TYPE)),
+    ('description', pa.string()),
+    ('attributes', pa.string()),
+    ('raw_data', pa.string()),
+    ('pdp_fetched_at', pa.timestamp('s', tz='UTC')),
+])
+
+
+def as_bool(value):
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.lower() in ['true', 'yes', 'available', '1']
+    return bool(value)
+
+
+def as_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def as_minor(value, currency):
+    # Variant prices are numbers on some stores and page text such as "PKR 4,990" on others.
+    if isinstance(value, bool):
+        return None
+    price = parse_price(value, currency)
+    return price.amount if price else None
+
+
+def as_major(amount, currency):
+    return amount / 10 ** minor_digits(currency) if amount is not None else None
+
+
+def as_timestamp(value):
+    try:
+        stamp = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return stamp if stamp.tzinfo else stamp.replace(tzinfo=timezone.utc)
+
+
+def variant_row(variant, currency):
+    options = {key: as_text(value) for key, value in variant.items() if key not in VARIANT_FIELDS}
+    price = as_minor(variant.get('price'), currency)
+    original_price = as_minor(variant.get('original_price'), currency)
+    return {
+        'options': list(options.items()),
+        'availability': as_bool(variant.get('availability')),
+        'price': as_major(price, currency),
+        'original_price': as_major(original_price, currency),
+        'price_minor': price,
+        'original_price_minor': original_price,
+        'sku': as_text(variant.get('sku')),
+    }
+
+
+def product_row(record, store_name, scrape_date):
+    if 'original_price_minor' not in record:
+        # Snapshots written before prices were normalized at save time.
+        normalize_record(record, DEFAULT_CURRENCY)
+    images = [image for image in record.get('images') or [] if isinstance(image, str)]
+    currency = parse_currency(record.get('currency')) or DEFAULT_CURRENCY
+    variants = [variant_row(variant, currency) for variant in record.get('variants') or [] if isinstance(variant, dict)]
+    return {
+        'store_name': record.get('store_name') or store_name,
+        'scrape_date': scrape_date,
+        'product_url': record.get('product_url') or record.get('product_link'),
+        'title': as_text(record.get('title')),
+        'sku': as_text(record.get('sku')),
+        'brand': as_text(record.get('brand')),
+        'category': as_text(record.get('category')),
+        'categories': [as_text(category) for category in record.get('categories') or []],
+        'currency': record.get('currency'),
+        'original_price': as_text(record.get('original_price')),
+        'sale_price': as_text(record.get('sale_price')),
+        'original_price_minor': record.get('original_price_minor'),
+        'sale_price_minor': record.get('sale_price_minor'),
+        'discount_percent': record.get('discount_percent'),
+        'availability': as_bool(record.get('availability')),
+        'image_count': len(images),
+        'variant_count': len(variants),
+        'variants_available': sum(1 for variant in variants if variant['availability']),
+        'images': images,
+        'variants': variants,
+        'description': as_text(record.get('description')),
+        'attributes': as_text(record.get('attributes')) if record.get('attributes') else None,
+        'raw_data': as_text(record.get('raw_data')) if record.get('raw_data') else None,
+        'pdp_fetched_at': as_timestamp(record.get('pdp_fetched_at')),
+    }
+
+
+def write_partition(records, store_name, scrape_date, row_group_size):
+    """Stream ``records`` into parquet/store=<store>/date=<date>/, one row group at a time."""
+    directory = os.path.join(EXPORT_DIR, f"store={store_name}", f"date={scrape_date.isoformat()}")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "part-0.parquet")
+    temp_path = path + '.tmp'
+    written = 0
+    with pq.ParquetWriter(temp_path, SCHEMA, compression='zstd') as writer:
+        rows = []
+        for record in records:
+            if 'error' in record:
+                continue
+            rows.append(product_row(record, store_name, scrape_date))
+            if len(rows) >= row_group_size:
+                writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=SCHEMA), row_group_size=row_group_size)
+                written += len(rows)
+                rows = []
+        if rows:
+            writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=SCHEMA), row_group_size=row_group_size)
+            written += len(rows)
+    if not written:
+        os.remove(temp_path)
+        return None, 0
+    replace_durably(temp_path, path)
+    return path, written
+
+
+def current_snapshots(directory=None):
+    """One snapshot per store, picked the way the scrapers pick their current snapshot."""
+    directory = directory or JSON_DIR
+    filenames = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+    stores = sorted({name[:-len(snapshot_extension(name))] for name in filenames if is_snapshot(name)})
+    for store_name in stores:
+        path = snapshot_files(directory, store_name)[0]
+        scrape_date = datetime.fromtimestamp(os.path.getmtime(path)).date()
+        yield store_name, scrape_date, path
+
+
+def export_current(args):
+    for store_name, scrape_date, path in current_snapshots():
+        if args.stores and store_name not in args.stores:
+            continue
+        try:
+            saved, count = write_partition(iter_records(path), store_name, scrape_date, args.row_group_size)
+            print(f"{store_name} {scrape_date}: {count} products -> {saved}")
+        except Exception as e:
+            print(f"  ERROR exporting {path}: {e}")
+
+
+def export_history(args):
+    """One partition per day of each store's delta history, from the last run of that day."""
+    stores = args.stores
+    if not stores and os.path.isdir(OLD_DIR):
+        stores = sorted(name for name in os.listdir(OLD_DIR) if os.path.isdir(os.path.join(OLD_DIR, name)))
+    for store_name in stores or []:
+        history = SnapshotHistory(os.path.join(OLD_DIR, store_name))
+        last_runs = {}
+        for timestamp, _, _ in history.entries():
+            last_runs[timestamp[:8]] = timestamp
+        for day, timestamp in sorted(last_runs.items()):
+            scrape_date = datetime.strptime(timestamp[:15], TIMESTAMP_FORMAT).date()
+            try:
+                records = history.reconstruct(timestamp[:15])
+                saved, count = write_partition(records, store_name, scrape_date, args.row_group_size)
+                print(f"{store_name} {scrape_date}: {count} products -> {saved}")
+            except Exception as e:
+                print(f"  ERROR exporting {store_name} {timestamp}: {e}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export product snapshots as a Parquet dataset partitioned by store and date.")
+    parser.add_argument("--stores", nargs="*", help="Store names to export (default: all)")
+    parser.add_argument("--history", action="store_true",
+                        help="Export every day kept in oldjsondata/ instead of the current snapshots")
+    parser.add_argument("--row-group-size", type=int, default=10000,
+                        help="Rows per Parquet row group, and at most this many are held in memory")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.history:
+        export_history(args)
+    else:
+        export_current(args)
@@ -0,0 +1,121 @@
+import os
+import sys
+import argparse
+from datetime import datetime
+from utils.history import SnapshotHistory, LEGACY_RE, TIMESTAMP_FORMAT
+from utils.snapshots import dumps_line
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OLD_DIR = os.path.join(SCRIPT_DIR, 'oldjsondata')
+
+
+def store_history(store_name):
+    return SnapshotHistory(os.path.join(OLD_DIR, store_name))
+
+
+def history_stores():
+    if not os.path.isdir(OLD_DIR):
+        return []
+    return sorted(name for name in os.listdir(OLD_DIR) if os.path.isdir(os.path.join(OLD_DIR, name)))
+
+
+def list_history(args):
+    for store_name in args.stores or history_stores():
+        entries = store_history(store_name).entries()
+        total = sum(os.path.getsize(path) for _, _, path in entries)
+        print(f"{store_name}: {len(entries)} runs, {total / 1024:.0f} KB")
+        for timestamp, kind, path in entries:
+            print(f"    {timestamp}  {kind:5s} {os.path.getsize(path) / 1024:9.1f} KB")
+
+
+def show_snapshot(args):
+    # A bare date means the last run of that day.
+    at = args.at + "_235959" if args.at and len(args.at) == 8 else args.at
+    records = store_history(args.store).reconstruct(at)
+    if not records:
+        print(f"No history for {args.store} at {args.at or 'latest'}", file=sys.stderr)
+        return 1
+    out = open(args.out, 'wb') if args.out else sys.stdout.buffer
+    try:
+        for record in records:
+            out.write(dumps_line(record))
+    finally:
+        if args.out:
+            out.close()
+    print(f"{len(records)} records", file=sys.stderr)
+    return 0
+
+
+def import_legacy(args):
+    """Fold the full copies older runs left in oldjsondata/ into each store's delta history.
+
+    Copies older than the store's first stored run become a chain of their own ahead of it
+    (the history always starts with a base), and copies newer than its last run are added
+    after it. Copies in between cannot be inserted without rewriting deltas and are skipped.
+    """
+    legacy = {}
+    for filename in os.listdir(OLD_DIR) if os.path.isdir(OLD_DIR) else []:
+        match = LEGACY_RE.match(filename)
+        if match and os.path.isfile(os.path.join(OLD_DIR, filename)):
+            legacy.setdefault(match['store'], []).append((match['timestamp'], filename))
+
+    for store_name, files in sorted(legacy.items()):
+        if args.stores and store_name not in args.stores:
+            continue
+        history = store_history(store_name)
+        entries = history.entries()
+        first = entries[0][0][:15] if entries else None
+        latest = entries[-1][0][:15] if entries else None
+        imported = 0
+        for timestamp, filename in sorted(files):
+            path = os.path.join(OLD_DIR, filename)
+            if first is not None and first <= timestamp <= latest:
+                print(f"  Skipping {filename}: history already has runs from {first} to {latest}")
+                continue
+            try:
+                history.record(path, datetime.strptime(timestamp, TIMESTAMP_FORMAT))
+            except Exception as e:
+                print(f"  ERROR importing {filename}: {e}")
+                continue
+            imported += 1
+            if args.delete:
+                os.remove(path)
+        print(f"{store_name}: imported {imported} of {len(files)} snapshots")
+    return 0
+
+
+def compact_history(args):
+    for store_name in args.stores or history_stores():
+        path = store_history(store_name).compact()
+        print(f"{store_name}: {path or 'nothing to compact'}")
+    return 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Inspect and maintain the delta history in oldjsondata/.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="Runs stored per store")
+    list_parser.add_argument("stores", nargs="*")
+    list_parser.set_defaults(handler=list_history)
+
+    show_parser = commands.add_parser("show", help="Rebuild a past snapshot as NDJSON")
+    show_parser.add_argument("store")
+    show_parser.add_argument("--at", help="Run timestamp (YYYYmmdd_HHMMSS) or date (YYYYmmdd); default latest")
+    show_parser.add_argument("--out", help="Write to this file instead of stdout")
+    show_parser.set_defaults(handler=show_snapshot)
+
+    import_parser = commands.add_parser("import", help="Convert legacy full copies into the history")
+    import_parser.add_argument("stores", nargs="*")
+    import_parser.add_argument("--delete", action="store_true", help="Remove each full copy once imported")
+    import_parser.set_defaults(handler=import_legacy)
+
+    compact_parser = commands.add_parser("compact", help="Store the latest snapshot as a new base")
+    compact_parser.add_argument("stores", nargs="*")
+    compact_parser.set_defaults(handler=compact_history)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(args.handler(args) or 0)
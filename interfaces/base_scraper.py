@@ -2,24 +2,59 @@ from abc import ABC, abstractmethod
 import logging
 import random
 import time
-import logging
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 import asyncio
 import os
-import json
-import shutil
 from datetime import datetime
+from collections import OrderedDict
+from utils.url_utils import create_frontier, canonicalize_url
+from utils.html_parser import parse_html
+from utils.parse_cache import content_hash, parser_version
+from utils.listing import PdpPolicy, listing_entry, fill_missing, mark_fetched
+from utils.snapshots import SnapshotWriter, COMPRESSIONS, snapshot_files
+from utils.history import SnapshotHistory
+
+
+class DeadlineReached(Exception):
+    pass
+
 
 class BaseScraper(ABC):
-    def __init__(self, base_url, logger_name, proxies=None, request_delay=0.1, max_retries=5):
+    # SoupStrainer keyword dicts for the subtrees a store actually reads; None parses the whole page.
+    listing_regions = None
+    pdp_regions = None
+    # ISO currency assumed when neither the price text nor the record names one.
+    default_currency = "PKR"
+    # Extra regexes for per-request noise in this store's pages, blanked before hashing for the parse cache.
+    volatile_patterns = ()
+    # Sibling colour pages fetched by expand_variants and kept until they are scraped as products.
+    variant_prefetch_limit = 256
+    # Runs stored as deltas in oldjsondata/<store>/ before the next full base.
+    history_compact_every = 30
+
+    def __init__(self, base_url, logger_name, proxies=None, request_delay=0.1, max_retries=5, frontier_path=None,
+                 parser_backend="html.parser"):
         self.base_url = base_url
+        self.parser_backend = parser_backend
         self.logger = logging.getLogger(logger_name)
         self.request_delay = request_delay
         self.max_retries = max_retries
         self.proxies = proxies or []
         self.session = self._create_session()
+        self.frontier = create_frontier(frontier_path)
+        self.products_by_url = {}
+        self.snapshot_writer = None
+        self.snapshot_compression = "none"
+        self.snapshot_level = None
+        self.scheduler = None
+        self.deadline = None
+        self.parse_pool = None
+        self.parse_cache = None
+        self.pdp_policy = PdpPolicy()
+        self.variant_results = {}
+        self.prefetched = OrderedDict()
         self._initialize_user_agents()
         
         self.headers = {
@@ -67,50 +102,133 @@ class BaseScraper(ABC):
     def _get_random_proxy(self):
         return random.choice(self.proxies) if self.proxies else None
 
-    def _throttle_request(self, url, attempt):
+    def _throttle_delay(self, url, attempt):
         time_delay = self.request_delay * (0.8 + 0.4 * random.random())
         self.log_info(f"Attempt {attempt+1} for url {url} throttle request time {time_delay}")
-        time.sleep(time_delay)
+        return time_delay
 
-    def make_request(self, url, method='GET'):
-        
-        max_attempts = self.max_retries
-        attempt = 0
+    def _attempt_request(self, url, method, attempt):
+        """One try at ``url``: the response, or None and how long to wait before the next try."""
+        headers = self.headers
+        headers['User-Agent'] = self._get_random_user_agent()
+        self.log_info(f"Attempt {attempt + 1} of {self.max_retries} - Requesting URL: {url}")
 
-        while attempt < max_attempts:
-            self.log_info(f"Attempt {attempt+1} for url {url}")
-            self._throttle_request(url,attempt)
-            headers = self.headers
-            headers['User-Agent'] = self._get_random_user_agent()
-            self.log_info(f"Attempt {attempt + 1} of {max_attempts} - Requesting URL: {url}")
+        try:
+            response = self.session.request(
+                method,
+                url,
+                headers=headers,
+                timeout=(20, 40), 
+                verify=False 
+            )
+            if response.status_code == 429:
+                retry_after = response.headers.get("Retry-After")
+                wait_time = int(retry_after) if retry_after and retry_after.isdigit() else (2 ** attempt)
+                self.log_warning(f"Received 429 status. Waiting {wait_time} seconds before retrying.")
+                return None, wait_time
+            response.raise_for_status()
+            return response, 0
 
-            try:
-                response = self.session.request(
-                    method,
-                    url,
-                    headers=headers,
-                    timeout=(20, 40), 
-                    verify=False 
-                )
-                if response.status_code == 429:
-                    retry_after = response.headers.get("Retry-After")
-                    wait_time = int(retry_after) if retry_after and retry_after.isdigit() else (2 ** attempt)
-                    self.log_warning(f"Received 429 status. Waiting {wait_time} seconds before retrying.")
-                    time.sleep(wait_time)
-                    attempt += 1
-                    continue
-                response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            backoff = 2 ** (attempt + 1)
+            self.log_warning(f"Attempt {attempt + 1} failed for {url}. Backing off for {backoff} seconds. Error: {str(e)}")
+            return None, backoff
+
+    def make_request(self, url, method='GET'):
+        for attempt in range(self.max_retries):
+            time.sleep(self._throttle_delay(url, attempt))
+            response, wait_time = self._attempt_request(url, method, attempt)
+            if response is not None:
                 return response
-                
-            except requests.exceptions.RequestException as e:
-                attempt += 1
-                backoff = 2 ** attempt
-                self.log_warning(f"Attempt {attempt} failed for {url}. Backing off for {backoff} seconds. Error: {str(e)}")
-                time.sleep(backoff)
+            if attempt + 1 < self.max_retries:
+                time.sleep(wait_time)
         raise requests.exceptions.HTTPError(f"All attempts failed for: {url}")
     
     async def async_make_request(self, url, method='GET'):
-        return await asyncio.to_thread(self.make_request, url, method)
+        if self.prefetched and method == 'GET':
+            response = self.prefetched.pop(canonicalize_url(url, self.base_url), None)
+            if response is not None:
+                return response
+        if self.scheduler is None:
+            self.check_deadline(url)
+            return await asyncio.to_thread(self.make_request, url, method)
+
+        # Only the request itself holds a scheduler slot; throttling and backoff wait outside it.
+        for attempt in range(self.max_retries):
+            self.check_deadline(url)
+            await asyncio.sleep(self._throttle_delay(url, attempt))
+            response, wait_time = await self.scheduler.run(self.store_name, self._attempt_request, url, method, attempt)
+            if response is not None:
+                return response
+            if attempt + 1 < self.max_retries:
+                await asyncio.sleep(wait_time)
+        raise requests.exceptions.HTTPError(f"All attempts failed for: {url}")
+
+    def parse_html(self, markup, regions=None, slices=None):
+        return parse_html(markup, self.parser_backend, regions=regions, slices=slices)
+
+    async def parse_response(self, parser, response, **context):
+        cache_key = None
+        if self.parse_cache is not None:
+            version = parser_version(parser)
+            cache_key = content_hash(response.content, context, self.volatile_patterns)
+            record = self.parse_cache.get(self.store_name, cache_key, version)
+            if record is not None:
+                return record
+
+        # Parsing is CPU-bound: without a pool it at least leaves the event loop.
+        if self.parse_pool is None:
+            record = await asyncio.to_thread(parser, response.text, **context)
+        else:
+            encoding = response.encoding or response.apparent_encoding
+            record = await self.parse_pool.parse(parser, response.content, encoding, **context)
+
+        if cache_key is not None and record is not None:
+            self.parse_cache.put(self.store_name, cache_key, version, record)
+        return record
+
+    async def expand_variants(self, product_link, soup, urls, extract, regions=None):
+        """Run ``extract(soup)`` once per colour page of a product, current page first.
+
+        Sibling pages not seen before are fetched concurrently and parsed once. Results
+        are shared for the whole run, and a sibling that has not been scraped yet keeps
+        its response, so when it comes up as a product itself neither its page nor its
+        siblings are fetched again.
+        """
+        current = canonicalize_url(product_link, self.base_url)
+        if current not in self.variant_results:
+            self.variant_results[current] = extract(soup)
+
+        keys = list(dict.fromkeys(canonicalize_url(url, self.base_url) for url in urls if url))
+        missing = [key for key in keys if key not in self.variant_results]
+        responses = await asyncio.gather(*(self.async_make_request(key) for key in missing), return_exceptions=True)
+        for key, response in zip(missing, responses):
+            if isinstance(response, Exception):
+                self.log_debug(f"Error loading variant page {key}: {response}")
+                continue
+            try:
+                self.variant_results[key] = extract(self.parse_html(response.text, regions))
+            except Exception as e:
+                self.log_debug(f"Error extracting variant page {key}: {e}")
+                continue
+            if key not in self.frontier:
+                self.prefetched[key] = response
+                if len(self.prefetched) > self.variant_prefetch_limit:
+                    self.prefetched.popitem(last=False)
+
+        results = {current: self.variant_results[current]}
+        for key in keys:
+            if key in self.variant_results:
+                results.setdefault(key, self.variant_results[key])
+        return results
+
+    def deadline_reached(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def check_deadline(self, url):
+        # Raised from every request, so pagination loops stop on their usual error path.
+        if self.deadline_reached():
+            raise DeadlineReached(f"Deadline reached before requesting {url}")
 
     @abstractmethod
     def scrape_pdp(self, product_link):
@@ -120,9 +238,77 @@ class BaseScraper(ABC):
     def scrape_products_links(self, url):
         pass
 
-    @abstractmethod
-    def scrape_category(self, url):
-        pass
+    async def scrape_category(self, url):
+        written = 0
+        all_products_links = await self.scrape_products_links(url)
+        for entry in all_products_links:
+            if self.deadline_reached():
+                self.log_warning(f"Deadline reached, stopping category {url}")
+                break
+            product_link, partial = listing_entry(entry)
+            product_key = canonicalize_url(product_link, self.base_url)
+            # Only the categories of written products are kept; the writer merges them on publish.
+            known_categories = self.products_by_url.get(product_key)
+            if known_categories is not None:
+                if url not in known_categories:
+                    known_categories.append(url)
+                continue
+
+            if self.pdp_policy.needs_pdp(product_key, partial):
+                pdp_data = await self.scrape_pdp(product_link)
+                if self.deadline_reached() and (pdp_data is None or 'error' in pdp_data):
+                    self.log_warning(f"Deadline reached, stopping category {url}")
+                    break
+                if pdp_data is not None and 'error' not in pdp_data:
+                    mark_fetched(pdp_data)
+                    if partial is not None:
+                        fill_missing(pdp_data, partial)
+            elif self.frontier.add(product_link):
+                pdp_data = self.pdp_policy.merge(product_key, partial)
+            else:
+                pdp_data = None
+
+            if pdp_data is not None:
+                pdp_data['categories'] = [url]
+                self.products_by_url[product_key] = self.snapshot_writer.write(pdp_data)
+                written += 1
+
+        return written
+
+    async def scrape_data(self):
+        self.products_by_url = {}
+        self.variant_results = {}
+        self.prefetched.clear()
+        try:
+            if self.pdp_policy.load(self.snapshot_path(), self.base_url):
+                self.log_info(f"PDP policy '{self.pdp_policy.mode}' against {len(self.pdp_policy.previous)} known products")
+            category_urls = await self.get_unique_urls_from_file(
+                os.path.join(self.module_dir, "categories.txt")
+            )
+            self.snapshot_writer = self.open_snapshot()
+            for url in category_urls:
+                if self.deadline_reached():
+                    self.log_warning("Deadline reached, saving partial data")
+                    break
+                await self.scrape_category(url)
+            if self.snapshot_writer.count:
+                saved_path = self.publish_snapshot(self.snapshot_writer)
+                if saved_path:
+                    self.log_info(f"Total {len(category_urls)} categories")
+                    self.log_info(f"Saved {self.snapshot_writer.count} products to {saved_path}")
+                    if self.pdp_policy.skipped:
+                        self.log_info(f"{self.pdp_policy.skipped} products refreshed from listing pages only")
+                    self.log_info(f"Product Sample Data: {self.snapshot_writer.sample}")
+            else:
+                self.log_error("No data scraped")
+        except Exception as e:
+            self.log_error(f"Scraping failed: {str(e)}")
+            if self.snapshot_writer is not None and self.snapshot_writer.count:
+                self.log_warning(f"Kept {self.snapshot_writer.count} scraped products in {self.snapshot_writer.partial_path}")
+        finally:
+            if self.snapshot_writer is not None:
+                self.snapshot_writer.close()
+                self.snapshot_writer = None
 
     def log_error(self, message):
         self.logger.error(message, exc_info=True)
@@ -136,40 +322,65 @@ class BaseScraper(ABC):
     def log_warning(self, message):
         self.logger.warning(message)
     
+    def data_dir(self, name="jsondata"):
+        project_root = os.path.abspath(os.path.join(
+            os.path.dirname(__file__), '..'
+        ))
+        return os.path.join(project_root, name)
+
+    def snapshot_path(self):
+        # The current snapshot, which is NDJSON unless only a legacy JSON array exists yet.
+        existing = snapshot_files(self.data_dir(), self.store_name)
+        return existing[0] if existing else os.path.join(self.data_dir(), f"{self.store_name}.jsonl")
+
+    def open_snapshot(self):
+        extension = ".jsonl" + COMPRESSIONS[self.snapshot_compression]
+        return SnapshotWriter(
+            os.path.join(self.data_dir(), f"{self.store_name}{extension}"), self.default_currency,
+            compression=self.snapshot_compression, level=self.snapshot_level
+        )
+
+    def snapshot_history(self):
+        return SnapshotHistory(
+            os.path.join(self.data_dir("oldjsondata"), self.store_name), compact_every=self.history_compact_every
+        )
+
+    def publish_snapshot(self, writer):
+        # The new snapshot replaces the current one atomically and only then are current
+        # files of another format removed, so readers always find one complete snapshot.
+        history = self.snapshot_history()
+        try:
+            previous_files = snapshot_files(self.data_dir(), self.store_name)
+            if previous_files and not history.entries():
+                # Start the history from the snapshot this run replaces.
+                ctime = os.path.getctime(previous_files[0])
+                history.record(previous_files[0], datetime.fromtimestamp(ctime))
+
+            current_file = writer.publish()
+            for previous_file in previous_files:
+                if previous_file != current_file:
+                    os.remove(previous_file)
+            self.log_info(f"Saved new data to {current_file}")
+
+        except Exception as e:
+            self.log_error(f"Error saving data: {str(e)}")
+            return None
+
+        try:
+            self.log_info(f"Recorded snapshot history in {history.record(current_file)}")
+        except Exception as e:
+            self.log_error(f"Error recording snapshot history: {str(e)}")
+        return current_file
+
     async def save_data(self, data):
         if not data:
             self.log_error("No data to save")
             return None
-            
+
+        writer = self.open_snapshot()
         try:
-            project_root = os.path.abspath(os.path.join(
-                os.path.dirname(__file__), '..'
-            ))
-            
-            json_dir = os.path.join(project_root, "jsondata")
-            old_dir = os.path.join(project_root, "oldjsondata")
-            os.makedirs(json_dir, exist_ok=True)
-            os.makedirs(old_dir, exist_ok=True)
-
-            current_file = os.path.join(json_dir, f"{self.store_name}.json")
-            old_file = None
-
-            if os.path.exists(current_file):
-                ctime = os.path.getctime(current_file)
-                timestamp = datetime.fromtimestamp(ctime).strftime("%Y%m%d_%H%M%S")
-                
-                old_filename = f"{self.store_name}_{timestamp}.json"
-                old_file = os.path.join(old_dir, old_filename)
-                
-                shutil.move(current_file, old_file)
-                self.log_info(f"Moved old data to {old_file}")
-
-            with open(current_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            
-            self.log_info(f"Saved new data to {current_file}")
-            return current_file
-            
-        except Exception as e:
-            self.log_error(f"Error saving data: {str(e)}")
-            return None
\ No newline at end of file
+            for record in data:
+                writer.write(record)
+        finally:
+            writer.close()
+        return self.publish_snapshot(writer)
\ No newline at end of file
@@ -0,0 +1,296 @@
+import re
+import html
+from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
+from interfaces.base_scraper import BaseScraper
+
+# Salesforce Commerce Cloud (SFRA) storefronts expose the listing grid and the
+# product model through controller endpoints, so we never need the PDP HTML.
+UPDATE_GRID_RE = re.compile(r'data-url="([^"]*Search-UpdateGrid[^"]*)"')
+CONTROLLER_BASE_RE = re.compile(r'(/on/demandware\.store/Sites-[^/"]+/[^/"]+/)')
+PID_RE = re.compile(r'data-pid="([^"]+)"')
+HREF_RE = re.compile(r'href="([^"]+\.html[^"]*)"')
+TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'[ \t\r\f\v]+')
+PID_FROM_URL_RE = re.compile(r'/([^/?#]+)\.html')
+# "Fabric: Lawn" / "Colour: Blue" lines of a product's details text.
+DETAIL_LINE_RE = re.compile(r'^(colou?r|fabric)\s*:\s*(.+)$', re.IGNORECASE | re.MULTILINE)
+BREADCRUMB_REGIONS = [{'name': 'ol', 'class_': 'breadcrumb'}]
+
+
+class SFCCScraper(BaseScraper):
+    grid_page_size = 48
+    site_path = None
+
+    def __init__(self, base_url, logger_name, proxies=None, request_delay=0.1, max_retries=5, frontier_path=None,
+                 parser_backend="html.parser"):
+        super().__init__(
+            base_url=base_url,
+            logger_name=logger_name,
+            proxies=proxies,
+            request_delay=request_delay,
+            max_retries=max_retries,
+            frontier_path=frontier_path,
+            parser_backend=parser_backend
+        )
+        self.controller_base = urljoin(self.base_url, self.site_path) if self.site_path else None
+        self.controller_page_fetched = False
+        self.product_pids = {}
+        # product URL -> (category name, breadcrumb) of the first listing it was found in.
+        self.listing_categories = {}
+
+    def _discover_controller_base(self, page_html):
+        if self.controller_base:
+            return True
+        match = CONTROLLER_BASE_RE.search(page_html)
+        if match:
+            self.controller_base = urljoin(self.base_url, match.group(1))
+            self.log_info(f"Discovered SFCC controller base {self.controller_base}")
+        return self.controller_base is not None
+
+    async def ensure_controller_base(self, page_url):
+        """Find the Sites-<site>/<locale> controller base, fetching ``page_url`` at most once per run.
+
+        Raises RuntimeError when it cannot be found: without it no Product-Variation URL is valid.
+        """
+        if self.controller_base:
+            return self.controller_base
+        if not self.controller_page_fetched and page_url:
+            self.controller_page_fetched = True
+            try:
+                response = await self.async_make_request(page_url)
+                self._discover_controller_base(response.text)
+            except Exception as e:
+                self.log_error(f"Error loading {page_url} to discover the SFCC controller base: {e}")
+        if not self.controller_base:
+            raise RuntimeError(
+                f"SFCC controller base not found for {self.base_url}; set site_path on {type(self).__name__}"
+            )
+        return self.controller_base
+
+    def _grid_url(self, url, page_html):
+        match = UPDATE_GRID_RE.search(page_html)
+        if match:
+            return urljoin(self.base_url, html.unescape(match.group(1)))
+        return url
+
+    def _paged_url(self, grid_url, start):
+        parsed = urlparse(grid_url)
+        query = parse_qs(parsed.query)
+        query['start'] = [str(start)]
+        query['sz'] = [str(self.grid_page_size)]
+        return urlunparse(parsed._replace(query=urlencode(query, doseq=True)))
+
+    def _parse_grid(self, page_html):
+        hrefs = [html.unescape(h) for h in HREF_RE.findall(page_html)]
+        tiles = []
+        for pid in dict.fromkeys(PID_RE.findall(page_html)):
+            suffix = f"/{pid}.html"
+            href = next((h for h in hrefs if suffix in h), None)
+            tiles.append((pid, urljoin(self.base_url, href) if href else None))
+        return tiles
+
+    def _listing_category(self, page_html, grid_url):
+        """Name and breadcrumb of a category page; the name falls back to the grid's cgid."""
+        soup = self.parse_html(page_html, BREADCRUMB_REGIONS)
+        crumbs = [crumb for crumb in (li.get_text(strip=True) for li in soup.select('ol.breadcrumb li')) if crumb]
+        name = crumbs[-1] if crumbs else (parse_qs(urlparse(grid_url).query).get('cgid') or [None])[0]
+        return name, crumbs
+
+    async def scrape_products_links(self, url):
+        all_product_links = []
+        seen_pids = set()
+
+        try:
+            response = await self.async_make_request(url)
+        except Exception as e:
+            self.log_error(f"Error loading category {url}: {e}")
+            return all_product_links
+
+        self._discover_controller_base(response.text)
+        grid_url = self._grid_url(url, response.text)
+        category = self._listing_category(response.text, grid_url)
+        start = 0
+
+        while True:
+            paginated_url = self._paged_url(grid_url, start)
+            try:
+                self.log_info(f"Scraping grid {paginated_url}")
+                page_html = (await self.async_make_request(paginated_url)).text
+            except Exception as e:
+                self.log_error(f"Error scraping grid {paginated_url}: {e}")
+                break
+
+            new_tiles = [(pid, link) for pid, link in self._parse_grid(page_html) if pid not in seen_pids]
+            if not new_tiles:
+                self.log_info(f"No new products at start={start}, stopping.")
+                break
+
+            if not self._discover_controller_base(page_html):
+                await self.ensure_controller_base(next((link for _, link in new_tiles if link), None))
+
+            for pid, link in new_tiles:
+                seen_pids.add(pid)
+                product_url = link or self._variation_url(pid)
+                self.product_pids[product_url] = pid
+                self.listing_categories.setdefault(product_url, category)
+                all_product_links.append(product_url)
+
+            start += self.grid_page_size
+
+        self.log_info(f"Collected {len(all_product_links)} product links from {url}")
+        return all_product_links
+
+    def _variation_url(self, pid):
+        if not self.controller_base:
+            raise RuntimeError(f"SFCC controller base of {self.base_url} is unknown")
+        return f"{self.controller_base}Product-Variation?{urlencode({'pid': pid, 'quantity': 1})}"
+
+    def _pid_for(self, product_link):
+        if product_link in self.product_pids:
+            return self.product_pids[product_link]
+        query = parse_qs(urlparse(product_link).query)
+        if query.get('pid'):
+            return query['pid'][0]
+        match = PID_FROM_URL_RE.search(urlparse(product_link).path)
+        return match.group(1) if match else None
+
+    def _html_to_text(self, value):
+        if not value:
+            return None
+        text = TAG_RE.sub('\n', value)
+        lines = [WHITESPACE_RE.sub(' ', line).strip() for line in html.unescape(text).split('\n')]
+        return '\n'.join(line for line in lines if line) or None
+
+    def _parse_price(self, price, product_data):
+        sales = price.get('sales') or {}
+        listed = price.get('list') or {}
+        product_data['currency'] = sales.get('currency') or listed.get('currency')
+        if listed.get('value') is not None and sales.get('value') is not None and listed['value'] > sales['value']:
+            product_data['original_price'] = listed.get('formatted')
+            product_data['sale_price'] = sales.get('formatted')
+            product_data['save_percent'] = str(round((listed['value'] - sales['value']) / listed['value'] * 100))
+        elif sales.get('value') is not None:
+            product_data['original_price'] = sales.get('formatted')
+
+    def parse_variation_product(self, product, product_data):
+        product_data['title'] = product.get('productName')
+        product_data['sku'] = product.get('id')
+        product_data['brand'] = product.get('brand')
+        product_data['description'] = self._html_to_text(
+            product.get('longDescription') or product.get('shortDescription')
+        )
+        product_data['category'] = self._payload_category(product)
+        if product_data['description']:
+            product_data['attributes']['details_text'] = product_data['description']
+            for label, value in DETAIL_LINE_RE.findall(product_data['description']):
+                product_data['attributes']['fabric' if label.lower() == 'fabric' else 'color'] = value.strip()
+
+        price = product.get('price') or {}
+        if price.get('type') == 'range':
+            price = price.get('min') or {}
+        self._parse_price(price, product_data)
+
+        for image in (product.get('images') or {}).get('large', []):
+            image_url = image.get('url')
+            if image_url:
+                image_url = urljoin(self.base_url, image_url)
+                if image_url not in product_data['images']:
+                    product_data['images'].append(image_url)
+
+        for group in product.get('attributes') or []:
+            section = {}
+            for attribute in group.get('attributes', []):
+                value = attribute.get('value')
+                value = ', '.join(value) if isinstance(value, list) else value
+                section[attribute.get('label')] = value
+                if (attribute.get('label') or '').lower() == 'fabric' and value:
+                    product_data['attributes']['fabric'] = value
+            if section:
+                product_data['attributes'][group.get('name') or group.get('ID')] = section
+
+        variants = []
+        for attribute in product.get('variationAttributes') or []:
+            values = attribute.get('values') or []
+            if attribute.get('attributeId') == 'color' or attribute.get('id') == 'color':
+                selected = next((v for v in values if v.get('selected')), None)
+                if selected:
+                    product_data['attributes']['color'] = selected.get('displayValue')
+                continue
+            for value in values:
+                variants.append({
+                    attribute.get('attributeId') or attribute.get('id'): value.get('displayValue') or value.get('value'),
+                    'availability': bool(value.get('selectable'))
+                })
+        product_data['variants'] = variants
+
+        if variants:
+            product_data['availability'] = any(v['availability'] for v in variants)
+        else:
+            product_data['availability'] = bool(product.get('available'))
+
+        product_data['raw_data'] = {
+            'pid': product.get('id'),
+            'master_id': product.get('masterId') or product.get('masterID'),
+        }
+        return product_data
+
+    def _payload_category(self, product):
+        # Not part of the stock SFRA model, but storefronts that add it know best.
+        for key in ('primaryCategory', 'category', 'primaryCategoryName'):
+            value = product.get(key)
+            if isinstance(value, dict):
+                value = value.get('name') or value.get('displayName') or value.get('id')
+            if isinstance(value, str) and value.strip():
+                return value.strip()
+        return None
+
+    async def fetch_variation(self, pid):
+        response = await self.async_make_request(self._variation_url(pid))
+        return response.json().get('product') or {}
+
+    async def scrape_pdp(self, product_link):
+        if not self.frontier.add(product_link):
+            return None
+
+        pid = self._pid_for(product_link)
+        if not pid:
+            self.log_warning(f"Could not resolve SFCC product id for {product_link}, skipping")
+            return None
+        # Workers that never saw a category page discover it from their first product page.
+        await self.ensure_controller_base(product_link)
+
+        product_data = {
+            'store_name': self.store_name,
+            'title': None,
+            'sku': None,
+            'description': None,
+            'currency': None,
+            'original_price': None,
+            'sale_price': None,
+            'images': [],
+            'brand': None,
+            'availability': None,
+            'category': None,
+            'product_url': product_link,
+            'variants': [],
+            'attributes': {},
+            'raw_data': {},
+        }
+
+        try:
+            product = await self.fetch_variation(pid)
+        except Exception as e:
+            self.log_error(f"Error loading Product-Variation for {pid}: {e}")
+            return None
+        if not product:
+            self.log_warning(f"Product-Variation returned no product for {pid}, skipping")
+            return None
+
+        self.parse_variation_product(product, product_data)
+        category, breadcrumb = self.listing_categories.get(product_link, (None, []))
+        product_data['category'] = product_data['category'] or category
+        if breadcrumb:
+            product_data['attributes']['breadcrumb'] = breadcrumb
+        if product.get('selectedProductUrl') and product_link not in self.product_pids:
+            product_data['product_url'] = urljoin(self.base_url, product['selectedProductUrl'])
+        return product_data
@@ -1,6 +1,18 @@
+import os
 import json
 import logging.config
 import asyncio
+import argparse
+import multiprocessing
+from utils.work_queue import open_work_queue
+from utils.distributed import run_coordinator, run_worker, merge_results
+from utils.scheduler import StoreScheduler
+from utils.parse_pool import ParsePool
+from utils.parse_cache import ParseCache
+from utils.listing import PdpPolicy, PDP_POLICIES
+from utils.patterns import REGISTRY
+from utils.snapshots import COMPRESSIONS, resolve_compression
+from utils.url_utils import create_frontier
 from scrapers.zeenwoman.scraper import ZeeWomanScraper
 from scrapers.wovworld.scraper import WovWorldScraper
 from scrapers.sputnikfootwear.scraper import SputnikFootWearScraper
@@ -35,48 +47,231 @@ def setup_logging():
         config = json.load(f)
     logging.config.dictConfig(config)
 
-async def main():
+SCRAPER_CLASSES = [
+    ZeeWomanScraper,
+    WovWorldScraper,
+    SputnikFootWearScraper,
+    SpeedSportsScraper,
+    SheepOfficialScraper,
+    ShafferScraper,
+    SapphireScraper,
+    SayaScraper,
+    SanaSafinazScraper,
+    SaeedGhaniScraper,
+    CambridgeShopScraper,
+    SulafahScraper,
+    EgoScrapper,
+    almirahscraper,
+    ImageScraper,
+    EthinicScraper,
+    GenerationScraper,
+    HushpuppiesScraper,
+    ismailfareedscaper,
+    chinyerescraper,
+    AlkaramScraper,
+    KhaddiScrapper,
+    DinnerScraper,
+    nakoosh_Scrapper,
+    insigma_scraper,
+    AmirAdnan_Scrapper,
+    Beechtree_Scrapper
+]
+
+
+def build_scrapers(stores=None):
+    classes = SCRAPER_CLASSES
+    if stores:
+        classes = [cls for cls in SCRAPER_CLASSES if cls.__name__ in stores]
+    return [cls() for cls in classes]
+
+
+def parse_deadlines(values):
+    deadlines = {}
+    for value in values or []:
+        store_name, _, seconds = value.partition("=")
+        deadlines[store_name] = float(seconds)
+    return deadlines
+
+
+def parse_pool_size(args):
+    # --parse-workers is per host; in worker mode each of the --processes workers gets a share.
+    workers = (os.cpu_count() or 1) if args.parse_workers is None else args.parse_workers
+    if args.mode == "worker" and workers:
+        workers = max(1, workers // max(1, args.processes))
+    return workers
+
+
+def start_parse_pool(args, scrapers):
+    processes = parse_pool_size(args)
+    if processes == 0:
+        return None
+    pool = ParsePool(processes=processes, initializer=setup_logging, collect_stats=args.pattern_stats)
+    for scraper in scrapers:
+        scraper.parse_pool = pool
+    return pool
+
+
+def open_parse_cache(args, scrapers):
+    if not args.parse_cache:
+        return None
+    cache = ParseCache(args.parse_cache, max_bytes=args.parse_cache_mb * 1024 * 1024)
+    for scraper in scrapers:
+        scraper.parse_cache = cache
+    return cache
+
+
+def open_frontiers(args, scrapers):
+    if not args.frontier_dir:
+        return []
+    frontiers = []
+    for scraper in scrapers:
+        path = os.path.join(args.frontier_dir, f"{scraper.store_name}.bloom")
+        scraper.frontier = create_frontier(path, capacity=args.frontier_capacity)
+        frontiers.append(scraper.frontier)
+    return frontiers
+
+
+def set_pdp_policy(args, scrapers):
+    for scraper in scrapers:
+        scraper.pdp_policy = PdpPolicy(args.pdp_policy, max_age=args.pdp_max_age_days * 24 * 3600)
+
+
+def set_snapshot_format(args, scrapers):
+    compression = resolve_compression(args.snapshot_compression)
+    for scraper in scrapers:
+        scraper.snapshot_compression = compression
+        scraper.snapshot_level = args.snapshot_level
+
+
+async def main(args):
     setup_logging()
-    scrapers = [
-        ZeeWomanScraper(),
-        WovWorldScraper(),
-        SputnikFootWearScraper(),
-        SpeedSportsScraper(),
-        SheepOfficialScraper(),
-        ShafferScraper(),
-        SapphireScraper(),
-        SayaScraper(),
-        SanaSafinazScraper(),
-        SaeedGhaniScraper(),
-        CambridgeShopScraper(),
-        SulafahScraper(),
-        EgoScrapper(),
-        almirahscraper(),
-        ImageScraper(),
-        EthinicScraper(),
-        GenerationScraper(),
-        HushpuppiesScraper(),
-        ismailfareedscaper(),
-        chinyerescraper(),
-        AlkaramScraper(),
-        KhaddiScrapper(),
-        DinnerScraper(),
-        nakoosh_Scrapper(),
-        insigma_scraper(),
-        AmirAdnan_Scrapper(),
-        Beechtree_Scrapper()
-
-
-
-    ]
-    tasks = [scraper.scrape_data() for scraper in scrapers]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    for result in results:
+    REGISTRY.enable(args.pattern_stats)
+    scrapers = build_scrapers(args.stores)
+    set_pdp_policy(args, scrapers)
+    set_snapshot_format(args, scrapers)
+    parse_pool = start_parse_pool(args, scrapers)
+    parse_cache = open_parse_cache(args, scrapers)
+    frontiers = open_frontiers(args, scrapers)
+    scheduler = StoreScheduler(
+        max_concurrency=args.max_concurrency,
+        max_active_stores=args.max_active_stores,
+        deadlines=parse_deadlines(args.deadline),
+        default_deadline=args.default_deadline
+    )
+    try:
+        results = await scheduler.run_stores(scrapers)
+    finally:
+        if parse_pool is not None:
+            parse_pool.close()
+        if parse_cache is not None:
+            print(f"Parse cache: {parse_cache.hits} hits, {parse_cache.misses} misses")
+            parse_cache.close()
+        for frontier in frontiers:
+            frontier.close()
+        if args.pattern_stats:
+            print(f"Regex and selector time:\n{REGISTRY.report()}")
+
+    for scraper, result in results:
         if isinstance(result, Exception):
-            print("A scraper task failed:", result)
+            print(f"Scraper {scraper.store_name} failed:", result)
         else:
-            print("A scraper completed:", result)
+            print(f"Scraper {scraper.store_name} completed:", result)
+
+
+async def coordinator_main(args):
+    setup_logging()
+    queue = open_work_queue(args.queue, visibility_timeout=args.visibility_timeout)
+    scrapers = build_scrapers(args.stores)
+    set_snapshot_format(args, scrapers)
+    saved = await run_coordinator(queue, scrapers)
+    for store_name, path in saved.items():
+        print(f"Saved {store_name} to {path}")
+
+
+async def worker_main(args):
+    setup_logging()
+    queue = open_work_queue(args.queue, visibility_timeout=args.visibility_timeout)
+    scrapers = build_scrapers(args.stores)
+    set_pdp_policy(args, scrapers)
+    parse_pool = start_parse_pool(args, scrapers)
+    parse_cache = open_parse_cache(args, scrapers)
+    try:
+        completed = await run_worker(queue, scrapers, idle_timeout=args.idle_timeout)
+    finally:
+        if parse_pool is not None:
+            parse_pool.close()
+        if parse_cache is not None:
+            parse_cache.close()
+    print(f"Worker finished {completed} tasks")
+
+
+async def merge_main(args):
+    setup_logging()
+    queue = open_work_queue(args.queue, visibility_timeout=args.visibility_timeout)
+    scrapers = build_scrapers(args.stores)
+    set_snapshot_format(args, scrapers)
+    saved = await merge_results(queue, scrapers)
+    for store_name, path in saved.items():
+        print(f"Saved {store_name} to {path}")
+
+
+def _worker_process(args):
+    asyncio.run(worker_main(args))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the store scrapers.")
+    parser.add_argument("--mode", choices=["local", "coordinator", "worker", "merge"], default="local")
+    parser.add_argument("--queue", default="sqlite:///queue/work_queue.db",
+                        help="sqlite:///path/to/queue.db on a shared volume, or redis://host:port/db")
+    parser.add_argument("--stores", nargs="*", help="Scraper class names to run (default: all)")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes to start on this host")
+    parser.add_argument("--visibility-timeout", type=int, default=600)
+    parser.add_argument("--idle-timeout", type=int, default=60)
+    parser.add_argument("--max-concurrency", type=int, default=16,
+                        help="Requests in flight across all stores, shared fairly between them")
+    parser.add_argument("--max-active-stores", type=int, default=None,
+                        help="Stores scraped at once; the stalest snapshots start first")
+    parser.add_argument("--deadline", action="append", metavar="STORE=SECONDS",
+                        help="Wall-clock budget for one store (store_name=seconds), repeatable")
+    parser.add_argument("--default-deadline", type=float, default=None,
+                        help="Wall-clock budget in seconds for stores without their own --deadline")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="Processes per host that parse product pages, started when a store first needs them "
+                             "(default: one per CPU, 0 parses in-process)")
+    parser.add_argument("--parse-cache", default=None, metavar="PATH",
+                        help="SQLite file caching parsed records by page content hash, e.g. cache/parse_cache.db "
+                             "(default: no cache)")
+    parser.add_argument("--parse-cache-mb", type=int, default=512, help="Size budget of the parse cache")
+    parser.add_argument("--frontier-dir", default=None, metavar="DIR",
+                        help="Dedupe each store's products through a Bloom filter file in DIR instead of "
+                             "an in-memory set; the file is cleared at the start of every run")
+    parser.add_argument("--frontier-capacity", type=int, default=1_000_000,
+                        help="Products per store the Bloom filter is sized for (0.1%% false positives)")
+    parser.add_argument("--pdp-policy", choices=PDP_POLICIES, default="always",
+                        help="When stores that read listing cards still fetch the product page")
+    parser.add_argument("--pdp-max-age-days", type=float, default=7,
+                        help="With --pdp-policy stale, refetch product pages older than this")
+    parser.add_argument("--snapshot-compression", choices=list(COMPRESSIONS), default="none",
+                        help="Compress jsondata snapshots (zstd needs the zstandard package)")
+    parser.add_argument("--snapshot-level", type=int, default=None,
+                        help="Compression level (default: 6 for gzip, 3 for zstd)")
+    parser.add_argument("--pattern-stats", action="store_true",
+                        help="Print hit counts and time of the registered regexes and selectors")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    args = parse_args()
+    if args.mode == "coordinator":
+        asyncio.run(coordinator_main(args))
+    elif args.mode == "worker":
+        workers = [multiprocessing.Process(target=_worker_process, args=(args,)) for _ in range(args.processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    elif args.mode == "merge":
+        asyncio.run(merge_main(args))
+    else:
+        asyncio.run(main(args))
@@ -1,18 +1,15 @@
 import os
-import re
-import json
-import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import AMIR_ADNAN
+from utils.text import paragraphs
+from utils.patterns import regex
 from urllib.parse import urljoin
-from urllib.parse import urlsplit, urlunsplit, urljoin
+from urllib.parse import urlsplit, urlunsplit
 
-import time
+
+PRICE_NOISE_RE = regex(r'(Rs\.?|,|\s)')
+NON_PRICE_RE = regex(r'[^\d.,]')
+CURRENCY_SYMBOL_RE = regex(r'(PKR|Rs|₹|\$|€|£)')
 
 
 class AmirAdnan_Scrapper(BaseScraper):
@@ -25,7 +22,6 @@ class AmirAdnan_Scrapper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "amir adnan"
-        self.all_product_links_ = []
 
 
     async def get_unique_urls_from_file(self, filename):
@@ -42,14 +38,13 @@ class AmirAdnan_Scrapper(BaseScraper):
     async def clean_price_string(self, price_str):
         if not price_str:
             return None
-        cleaned = re.sub(r'(Rs\.?|,|\s)', '', price_str)
+        cleaned = PRICE_NOISE_RE.sub('', price_str)
         return cleaned
 
 
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        self.all_product_links_.append(product_link)
 
         product_data = {
             'store_name': self.store_name,
@@ -71,7 +66,7 @@ class AmirAdnan_Scrapper(BaseScraper):
 
         try:
             response = await self.async_make_request(product_link)
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text)
 
             try:
                 title_tag = soup.find('h1', class_="product-single__title")
@@ -90,13 +85,7 @@ class AmirAdnan_Scrapper(BaseScraper):
             try:
                 description_div = soup.select_one('div.product-single__description')
                 if description_div:
-                    for br in description_div.find_all('br'):
-                        br.replace_with('\n')
-                    paragraphs = [
-                        tag.get_text(separator='\n', strip=True).replace('\xa0', ' ')
-                        for tag in description_div.find_all(['p', 'span'])
-                    ]
-                    product_data['description'] = '\n'.join(paragraphs)
+                    product_data['description'] = '\n'.join(paragraphs(description_div, tags=('p', 'span')))
             except Exception as e:
                 self.log_debug(f"Exception occurred while scraping product's description: {e}")
 
@@ -131,17 +120,17 @@ class AmirAdnan_Scrapper(BaseScraper):
                 sale_price_tag = soup.select_one('span.product__price.on-sale span.money')
                 if sale_price_tag:
                     sale_price_text = sale_price_tag.get_text(strip=True)
-                    cleaned_sale = re.sub(r'[^\d.,]', '', sale_price_text).lstrip('.')
+                    cleaned_sale = NON_PRICE_RE.sub('', sale_price_text).lstrip('.')
                     product_data['sale_price'] = cleaned_sale
 
                 original_price_tag = soup.select_one('span.product__price--compare span.money')
                 if original_price_tag:
                     original_price_text = original_price_tag.get_text(strip=True)
-                    cleaned_original = re.sub(r'[^\d.,]', '', original_price_text).lstrip('.')
+                    cleaned_original = NON_PRICE_RE.sub('', original_price_text).lstrip('.')
                     product_data['original_price'] = cleaned_original
 
                 currency_source = sale_price_text or original_price_text or ''
-                currency_match = re.search(r'(PKR|Rs|₹|\$|€|£)', currency_source)
+                currency_match = CURRENCY_SYMBOL_RE.search(currency_source)
                 if currency_match:
                     product_data['currency'] = currency_match.group(1)
             except Exception as e:
@@ -197,7 +186,7 @@ class AmirAdnan_Scrapper(BaseScraper):
                         response = await self.async_make_request(current_url)
                     
 
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = self.parse_html(response.text)
 
                         product_anchors = soup.select('a[href^="/collections/"][href*="/products/"]')
 
@@ -218,35 +207,4 @@ class AmirAdnan_Scrapper(BaseScraper):
                         break
 
                 self.log_info(f"Collected {len(all_product_links)} unique product links.")
-                return all_product_links  
-    
-    async def scrape_category(self, url):
-            all_products = []
-            all_products_links = await self.scrape_products_links(url)
-            for product_link in all_products_links:
-                pdp_data = await self.scrape_pdp(product_link)
-                if pdp_data is not None:
-                    all_products.append(pdp_data)
-            
-            return all_products
-        
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)  # ✅ FIXED
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
-
+                return all_product_links
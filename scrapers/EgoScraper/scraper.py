@@ -1,16 +1,8 @@
 import os
-import re
-import json
-import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import Ego_LOGGER
+from utils.text import text_lines
 from urllib.parse import urljoin
-import time
 
 
 class EgoScrapper(BaseScraper):
@@ -23,7 +15,6 @@ class EgoScrapper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "ego"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -37,10 +28,8 @@ class EgoScrapper(BaseScraper):
             return list(set(line.strip() for line in file if line.strip()))
 
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -63,7 +52,7 @@ class EgoScrapper(BaseScraper):
 
         try:
             response = await self.async_make_request(product_link)
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text)
 
             try:
                 product_title_tag = soup.find('h1', class_='product-single__title ttlTxt tt-u mb15')
@@ -171,11 +160,7 @@ class EgoScrapper(BaseScraper):
             try:
                 desc_div = soup.select_one('div.product-single__description.rte')
                 if desc_div:
-                    for br in desc_div.find_all('br'):
-                        br.replace_with('\n')
-                    raw_text = desc_div.get_text(separator='\n')
-                    lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
-                    description_text = '\n'.join(lines)
+                    description_text = '\n'.join(text_lines(desc_div))
                     product_data['description'] = description_text
             except Exception as e:
                 self.log_debug(f"Exception occurred while scraping product description: {e}")
@@ -190,8 +175,8 @@ class EgoScrapper(BaseScraper):
                     variant_id = input_tag.get("data-variant-id")
                     if variant_id:
                         variant_url = f"{product_link}?variant={variant_id}"
-                        variant_response = requests.get(variant_url)
-                        variant_soup = BeautifulSoup(variant_response.text, 'html.parser')
+                        variant_response = await self.async_make_request(variant_url)
+                        variant_soup = self.parse_html(variant_response.text)
                         add_to_cart_button = variant_soup.find("button", {"id": "AddToCart-template--16869896716541__product"})
                         if add_to_cart_button:
                             is_disabled = add_to_cart_button.has_attr("disabled")
@@ -244,7 +229,7 @@ class EgoScrapper(BaseScraper):
                 
                 response = await self.async_make_request(current_url)
 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self.parse_html(response.text)
 
                 product_links = soup.select('a.gimg-link[href^="/products/"]')
 
@@ -267,35 +252,3 @@ class EgoScrapper(BaseScraper):
 
         self.log_info(f"Collected {len(all_product_links)} product links.")
         return all_product_links
-
-
-   
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)  # ✅ FIXED
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
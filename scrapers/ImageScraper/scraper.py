@@ -1,16 +1,14 @@
 import os
-import re
-import json
-import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import IMAGE_LOGGER
+from utils.prices import normalize_prices
+from utils.images import ImageSet
+from utils.variants import VariantMatrix
+from utils.text import node_text, paragraphs
+from utils.patterns import regex
 from urllib.parse import urljoin
-import time
+
+SWATCH_COLOR_RE = regex(r'background-color:\s*(#[0-9a-fA-F]+)')
 
 
 class ImageScraper(BaseScraper):
@@ -23,7 +21,6 @@ class ImageScraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "image"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -37,10 +34,8 @@ class ImageScraper(BaseScraper):
             return list(set(line.strip() for line in file if line.strip()))
 
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -61,7 +56,7 @@ class ImageScraper(BaseScraper):
 
         try:
             response = await self.async_make_request(product_link)
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text)
 
             try:
                 # Product name
@@ -122,34 +117,19 @@ class ImageScraper(BaseScraper):
                     sale_tag = price_wrapper.select_one('.price-item--sale .money')
 
                     if original_tag and sale_tag:
-                        original_price_str = original_tag.get_text(strip=True)
-                        sale_price_str = sale_tag.get_text(strip=True)
-
-                        original_price_match = re.findall(r'[\d,]+', original_price_str)
-                        sale_price_match = re.findall(r'[\d,]+', sale_price_str)
-
-                        original_price = original_price_match[0] if original_price_match else None
-                        sale_price = sale_price_match[0] if sale_price_match else None
-
-                    elif sale_tag and not original_tag:
-                        sale_price_str = sale_tag.get_text(strip=True)
-                        sale_price_match = re.findall(r'[\d,]+', sale_price_str)
-                        original_price = sale_price_match[0] if sale_price_match else None
-                        sale_price = None
-
-                    if original_price:
-                        try:
-                            currency_match = re.match(r'([^\d]+)', original_price_str.strip())
-                            currency = currency_match.group(1).strip() if currency_match else None
-
-                            orig_val = int(re.sub(r'[^\d]', '', original_price_str))
-                            sale_val = int(re.sub(r'[^\d]', '', sale_price_str)) if sale_price else None
-
-                            if sale_val and orig_val > sale_val:
-                                discount = round(((orig_val - sale_val) / orig_val) * 100)
-                                save_percent = f"{discount}%"
-                        except Exception:
-                            save_percent = None
+                        prices = normalize_prices(original_tag.get_text(strip=True), sale_tag.get_text(strip=True),
+                                                  self.default_currency)
+                    elif sale_tag:
+                        prices = normalize_prices(sale_tag.get_text(strip=True), None, self.default_currency)
+                    else:
+                        prices = None
+
+                    if prices and prices['original_price']:
+                        original_price = prices['original_price']
+                        sale_price = prices['sale_price']
+                        currency = prices['currency']
+                        if prices['discount_percent'] is not None:
+                            save_percent = f"{prices['discount_percent']}%"
 
                 product_data['original_price'] = original_price
                 product_data['sale_price'] = sale_price
@@ -164,16 +144,10 @@ class ImageScraper(BaseScraper):
 
             try:
                 # Images
-                image_elements = soup.select('div.swiper-wrapper img')
-                for img in image_elements:
-                    src = img.get('src')
-                    if src:
-                        if src.startswith('//'):
-                            src = 'https:' + src
-                        elif not src.startswith('http'):
-                            src = urljoin(self.base_url, src)
-                        if src not in product_data['images']:
-                            product_data['images'].append(src)
+                images = ImageSet(self.base_url)
+                for img in soup.select('div.swiper-wrapper img'):
+                    images.add(img.get('src'))
+                product_data['images'] = images.to_list()
             except Exception as e:
                 self.log_debug(f"Exception occurred while scraping images: {e}")
 
@@ -190,7 +164,7 @@ class ImageScraper(BaseScraper):
                     color_span = label.find('span', class_='filter-color-box')
                     if color_span and 'style' in color_span.attrs:
                         style = color_span['style']
-                        match = re.search(r'background-color:\s*(#[0-9a-fA-F]+)', style)
+                        match = SWATCH_COLOR_RE.search(style)
                         if match:
                             color_code = match.group(1)
             except Exception as e:
@@ -202,10 +176,7 @@ class ImageScraper(BaseScraper):
                 # Description
                 description_div = soup.select_one('div.accordion__content.rte')
                 if description_div:
-                    for br in description_div.find_all('br'):
-                        br.replace_with('\n')
-                    paragraphs = [p.get_text(separator='\n', strip=True).replace('\xa0', ' ') for p in description_div.find_all('p')]
-                    product_data['description'] = '\n\n'.join(paragraphs)
+                    product_data['description'] = '\n\n'.join(paragraphs(description_div))
             except Exception as e:
                 self.log_debug(f"Exception occurred while scraping description: {e}")
                 product_data['description'] = ""
@@ -215,10 +186,7 @@ class ImageScraper(BaseScraper):
                 shipment_text = None
                 shipment_div = soup.select_one('div#ProductAccordion-collapsible_tab_8LbGXL-template--24274139414891__main')
                 if shipment_div:
-                    for br in shipment_div.find_all('br'):
-                        br.replace_with('\n')
-                    paragraphs = [p.get_text(strip=True).replace('\xa0', ' ') for p in shipment_div.find_all('p')]
-                    shipment_text = '\n\n'.join(paragraphs)
+                    shipment_text = '\n\n'.join(paragraphs(shipment_div, separator=''))
 
                 # Product Care
                 product_care_text = None
@@ -228,9 +196,7 @@ class ImageScraper(BaseScraper):
                     if summary and 'CARE INSTRUCTIONS' in summary.get_text(strip=True).upper():
                         p_tag = tag.find('p')
                         if p_tag:
-                            for br in p_tag.find_all('br'):
-                                br.replace_with('\n')
-                            product_care_text = p_tag.get_text(strip=True).replace('\xa0', ' ').strip()
+                            product_care_text = node_text(p_tag, separator='')
                         break
 
                 # Raw Data
@@ -247,7 +213,7 @@ class ImageScraper(BaseScraper):
 
             try:
                 # Variants
-                variants = []
+                variants = VariantMatrix(('size', 'color'))
                 color_labels = soup.find_all('label', class_='product-form_custom_label Color--label')
                 colors = []
                 for label in color_labels:
@@ -268,13 +234,9 @@ class ImageScraper(BaseScraper):
                         size_label = label.get_text(strip=True).replace("Variant sold out or unavailable", "").strip() if label else size_value
 
                         for color in colors:
-                            variants.append({
-                                'size': size_label,
-                                'color': color,
-                                'availability': available
-                            })
+                            variants.add({'size': size_label, 'color': color}, available)
 
-                product_data['variants'] = variants if variants else None
+                product_data['variants'] = variants.to_list() if variants else None
             except Exception as e:
                 self.log_debug(f"Exception occurred while scraping variants: {e}")
                 product_data['variants'] = None
@@ -293,7 +255,7 @@ class ImageScraper(BaseScraper):
             self.log_info(f"Scraping product links from: {page_url}")
 
             response = await self.async_make_request(page_url)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
 
             product_links = []
             tags = soup.select('a.card__link-product[href^="/products/"]')
@@ -314,35 +276,3 @@ class ImageScraper(BaseScraper):
         except Exception as e:
             self.log_error(f"Error scraping product links: {str(e)}")
             return []
-
-
-
-    async def scrape_category(self, url):
-            all_products = []
-            all_products_links = await self.scrape_products_links(url)
-            for product_link in all_products_links:
-                pdp_data = await self.scrape_pdp(product_link)
-                if pdp_data is not None:
-                    all_products.append(pdp_data)
-            
-            return all_products
-        
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)  
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
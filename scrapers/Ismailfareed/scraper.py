@@ -1,16 +1,10 @@
 import os
-import re
-import json
-import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import ISMAILFAREED_LOGGER
+from utils.patterns import regex
 from urllib.parse import urljoin
-import time
+
+CURRENCY_PREFIX_RE = regex(r'^([^\d]+)')
 
 
 class ismailfareedscaper(BaseScraper):
@@ -23,7 +17,6 @@ class ismailfareedscaper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "ismailfareed"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -37,11 +30,9 @@ class ismailfareedscaper(BaseScraper):
             return list(set(line.strip() for line in file if line.strip()))
 
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
 
-        self.all_product_links_.append(product_link)
-
         product_data = {
             'product_name': None,
             'store_name': 'Ismail fareed',
@@ -65,7 +56,7 @@ class ismailfareedscaper(BaseScraper):
 
         try:
             response = await self.async_make_request(product_link)
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text)
 
             try:
                 # Product Name
@@ -91,8 +82,7 @@ class ismailfareedscaper(BaseScraper):
                     product_data['original_price'] = full_price_text
 
                     # Extract currency using regex (captures non-digit prefix, e.g., Rs., $, £)
-                    import re
-                    match = re.match(r'^([^\d]+)', full_price_text)
+                    match = CURRENCY_PREFIX_RE.match(full_price_text)
                     if match:
                         product_data['currency'] = match.group(1).strip()
                     else:
@@ -208,7 +198,7 @@ class ismailfareedscaper(BaseScraper):
                     self.log_info(f"Scraping page {page_number}: {current_url}")
                     response = await self.async_make_request(current_url)
                 
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    soup = self.parse_html(response.text)
 
                     product_links = soup.select(
                         'a.card-media.card-media--adapt.media--hover-effect.media--loading-effect[href^="/products/"]'
@@ -239,35 +229,3 @@ class ismailfareedscaper(BaseScraper):
 
             self.log_info(f"Collected {len(all_product_links)} product links.")
             return all_product_links
-
-    
-
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)  # ✅ FIXED
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
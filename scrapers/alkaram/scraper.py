@@ -1,19 +1,72 @@
 import os
-import re
-import json
-import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import ALKARAM_LOGGER
+from utils.html_parser import parse_html
+from utils.parse_pool import register_parser
+from utils.extraction import ExtractionSpec, Field, Items
+from utils.text import text_lines
+from utils.listing import listing_records
+from utils.patterns import regex
 from urllib.parse import urljoin
-import time
+import logging
+
+CURRENCY_PREFIX_RE = regex(r'^([^\d\s]+)')
+AMOUNT_RE = regex(r'\d[\d,]*')
+
+logger = logging.getLogger(ALKARAM_LOGGER)
+
+
+def price_currency(text):
+    # The currency symbol is whatever precedes the first amount.
+    match = CURRENCY_PREFIX_RE.match(text)
+    return match.group(1) if match else None
+
+
+def price_amounts(text):
+    return [amount.replace(',', '') for amount in AMOUNT_RE.findall(text)] or None
+
+
+def detail_pairs(lines):
+    # "Key: value" lines, with following lines appended to the last value.
+    details = {}
+    current_key = None
+    for line in lines:
+        if ':' in line:
+            key, value = line.split(':', 1)
+            current_key = key.strip()
+            details[current_key] = value.strip()
+        elif current_key:
+            details[current_key] += f" {line}"
+        else:
+            details[line] = None
+    return details
 
 
 class AlkaramScraper(BaseScraper):
+    listing_regions = [
+        {'name': 'div', 'class_': 't4s-product'},
+    ]
+    pdp_spec = ExtractionSpec(
+        title=Field('h1.t4s-product__title'),
+        sku=Field('div.t4s-sku-wrapper span.t4s-sku-value'),
+        currency=Field('div.t4s-product-price', post=price_currency),
+        prices=Field('div.t4s-product-price', post=price_amounts),
+        data_price=Field('div.t4s-product-price', attr='data-price', post=lambda cents: str(int(cents) // 100)),
+        images=Field('img[data-master]', attr='data-master', many=True, unique=True),
+        category=Field('nav.t4s-pr-breadcrumb a span', many=True,
+                       post=lambda spans: spans[1] if len(spans) >= 2 else None),
+        availability=Field('span.product-availabibility', node=True),
+        variants=Items(
+            'div[data-swatch-item=""]', within='div.t4s-swatch__list', default=[],
+            size=Field(),
+            availability=Field(attr='class', post=lambda classes: 'is--soldout' not in classes, default=True),
+        ),
+        details=Field('div.t4s-rte.t4s-tab-content.t4s-active', node=True, default={},
+                      post=lambda node: detail_pairs(text_lines(node, skip_classes=('tab--disclaimer',)))),
+        disclaimer=Field('div.tab--disclaimer', separator=' '),
+        breadcrumbs=Field('div.t4s-row.t4s-align-items-center nav.t4s-pr-breadcrumb :is(a, span)', many=True),
+    )
+
     def __init__(self, proxies=None, request_delay=1):
         super().__init__(
             base_url="https://www.alkaramstudio.com/",
@@ -23,7 +76,6 @@ class AlkaramScraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "alkaramstudio"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -37,199 +89,19 @@ class AlkaramScraper(BaseScraper):
             return list(set(line.strip() for line in file if line.strip()))
 
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-
-        self.all_product_links_.append(product_link)
-        product_data = {
-            'store_name': self.store_name,
-            'title': None,
-            'sku': None,
-            'description': None,
-            'currency': None,
-            'original_price': None,
-            'sale_price': None,
-            'images': [],
-            'brand': None,
-            'availability': None,
-            'category': None,
-            'product_url': product_link,
-            'variants': [],
-            "attributes": {},
-            'raw_data': {},
-        }
-
         try:
             response = await self.async_make_request(product_link)
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            try:
-                # Title
-                title_tag = soup.select_one('h1.t4s-product__title')
-                if title_tag:
-                    product_data['title'] = title_tag.get_text(strip=True)
-            except Exception as e:
-                return {'error': f'Exception occurred while extracting title: {str(e)}', 'product_link': product_link}
-
-            try:
-                # SKU
-                sku_element = soup.select_one('div.t4s-sku-wrapper span.t4s-sku-value')
-                if sku_element:
-                    product_data['sku'] = sku_element.get_text(strip=True)
-            except Exception as e:
-                return {'error': f'Exception occurred while extracting SKU: {str(e)}', 'product_link': product_link}
-
-            try:
-                # Pricing
-                price_div = soup.find('div', class_='t4s-product-price')
-                original_price = sale_price = currency = None
-
-                if price_div:
-                    price_text = price_div.get_text(strip=True)
-
-                    # Extract currency symbol (assuming it's at the start of the price)
-                    currency_match = re.match(r'^([^\d\s]+)', price_text)
-                    if currency_match:
-                        currency = currency_match.group(1)
-
-                    # Extract price numbers from the visible price text
-                    price_numbers = re.findall(r'\d[\d,]*', price_text)
-                    price_numbers = [p.replace(',', '') for p in price_numbers]
-
-                    if len(price_numbers) >= 1:
-                        original_price = price_numbers[0]
-                    if len(price_numbers) >= 2:
-                        sale_price = price_numbers[1]
-
-                    # Fallback: if original price not found, try data-price
-                    data_price = price_div.get('data-price')
-                    if data_price and not original_price:
-                        original_price = str(int(data_price) // 100)
-
-                product_data['original_price'] = original_price
-                product_data['sale_price'] = sale_price
-                product_data['currency'] = currency  # Store the currency separately
-            except Exception as e:
-                return {'error': f'Exception occurred while extracting pricing: {str(e)}', 'product_link': product_link}
-
-            try:
-                # Images
-                image_elements = soup.select('img[data-master]')
-                for img in image_elements:
-                    src = img.get('data-master')
-                    if src and src not in product_data['images']:
-                        full_url = urljoin(self.base_url, src)
-                        product_data['images'].append(full_url)
-            except Exception as e:
-                return {'error': f'Exception occurred while extracting images: {str(e)}', 'product_link': product_link}
-
-            try:
-                # Extract breadcrumb <span> tags inside <a> within the breadcrumb navigation
-                breadcrumb_spans = soup.select('nav.t4s-pr-breadcrumb a span')
-                if len(breadcrumb_spans) >= 2:
-                    product_data['category'] = breadcrumb_spans[1].get_text(strip=True)
-            except Exception as e:
-                return {'error': f'Exception occurred while extracting category from breadcrumb: {str(e)}', 'product_link': product_link}
-
-            try:
-                # Availability as boolean
-                availability_span = soup.find('span', class_='product-availabibility')
-                product_data['availability'] = availability_span is not None
-            except Exception as e:
-                return {'error': f'Exception occurred while extracting availability: {str(e)}', 'product_link': product_link}
-
-            try:
-                # Variants (Sizes)
-                size_container = soup.find('div', {'class': 't4s-swatch__list'})
-                if size_container:
-                    size_elements = size_container.find_all('div', {'data-swatch-item': ''})
-                    for size_element in size_elements:
-                        size_value = size_element.get_text(strip=True)
-
-                        # Determine availability - True if available, False if sold out
-                        is_available = 'is--soldout' not in size_element.get('class', [])
-
-                        variant_data = {
-                            'size': size_value,
-                            'availability': is_available  # Simple True/False for availability
-                        }
-
-                        product_data['variants'].append(variant_data)
-            except Exception as e:
-                return {'error': f'Exception occurred while extracting variants/sizes: {str(e)}', 'product_link': product_link}
-
-            try:
-                # Details
-                details_div = soup.select_one('div.t4s-rte.t4s-tab-content.t4s-active')
-                if details_div:
-                    disclaimer = details_div.select_one('div.tab--disclaimer')
-                    if disclaimer:
-                        disclaimer.decompose()
-
-                    for br in details_div.find_all('br'):
-                        br.replace_with('\n')
-
-                    raw_text = details_div.get_text(separator='\n').strip()
-                    lines = [line.strip().replace('\xa0', ' ') for line in raw_text.split('\n') if line.strip()]
-
-                    # Existing untouched details extraction logic
-                    details = {}
-                    current_key = None
-
-                    for line in lines:
-                        if ':' in line:
-                            key, value = line.split(':', 1)
-                            key = key.strip()
-                            value = value.strip()
-                            details[key] = value
-                            current_key = key
-                        elif current_key:
-                            details[current_key] += f" {line}"
-                        else:
-                            details[line] = None
-
-                    product_data['attributes'].update(details)
-            except Exception as e:
-                return {'error': f'Exception occurred while extracting details: {str(e)}', 'product_link': product_link}
-
-            try:
-                raw_data = {}
-                disclaimer_div = soup.find('div', class_='tab--disclaimer')
-                if disclaimer_div:
-                    disclaimer_text = disclaimer_div.get_text(separator=' ', strip=True)
-                    raw_data['disclaimer'] = disclaimer_text
-            except Exception as e:
-                return {'error': f'Exception occurred while extracting disclaimer: {str(e)}', 'product_link': product_link}
-
-            try:
-                # NEW: Breadcrumb extraction from custom HTML structure
-                breadcrumb_nav = soup.select_one('div.t4s-row.t4s-align-items-center nav.t4s-pr-breadcrumb')
-                breadcrumbs = []
-
-                if breadcrumb_nav:
-                    for element in breadcrumb_nav.find_all(['a', 'span']):
-                        text = element.get_text(strip=True)
-                        if text:
-                            breadcrumbs.append(text)
-
-                # Save breadcrumbs as part of attributes
-                if breadcrumbs:
-                    details["Breadcrumbs"] = " > ".join(breadcrumbs)
-
-                # Final assignment
-                product_data['attributes'] = details
-            except Exception as e:
-                return {'error': f'Exception occurred while extracting custom breadcrumbs: {str(e)}', 'product_link': product_link}
-
-            return product_data
-
         except Exception as e:
             self.log_error(f"Error scraping PDP {product_link}: {str(e)}")
+            return parse_pdp(None, product_link, self.store_name, self.base_url)
+        return await self.parse_response(
+            parse_pdp, response,
+            product_link=product_link, store_name=self.store_name, base_url=self.base_url,
+            parser_backend=self.parser_backend
+        )
 
-        return product_data
-
-
-    
     async def scrape_products_links(self, url):
         all_product_links = []
         page_number = 1
@@ -239,18 +111,14 @@ class AlkaramScraper(BaseScraper):
             try:
                 self.log_info(f"Scraping page {page_number}: {current_url}")
                 response = await self.async_make_request(current_url)
-                soup = BeautifulSoup(response.text, 'html.parser')
-                product_links = soup.select('a.t4s-full-width-link')
+                soup = self.parse_html(response.text, self.listing_regions)
+                products = listing_records(soup, self.store_name, self.base_url)
 
-                if not product_links:
+                if not products:
                     self.log_info(f"No products found on page {page_number}. Stopping.")
                     break
 
-                for link_tag in product_links:
-                    href = link_tag.get('href')
-                    if href:
-                        product_url = f"{self.base_url}{href}"
-                        all_product_links.append(product_url)
+                all_product_links.extend(products)
 
                 page_number += 1
                 current_url = f"{url}?page={page_number}" if "?" not in url else f"{url}&page={page_number}"
@@ -262,33 +130,59 @@ class AlkaramScraper(BaseScraper):
         # Debug: Print the collected links
         self.log_info(f"Collected {len(all_product_links)} product links.")
         return all_product_links
-        
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)  # ✅ FIXED
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
+
+
+@register_parser("alkaram.pdp")
+def parse_pdp(markup, product_link, store_name, base_url, parser_backend="html.parser"):
+    product_data = {
+        'store_name': store_name,
+        'title': None,
+        'sku': None,
+        'description': None,
+        'currency': None,
+        'original_price': None,
+        'sale_price': None,
+        'images': [],
+        'brand': None,
+        'availability': None,
+        'category': None,
+        'product_url': product_link,
+        'variants': [],
+        "attributes": {},
+        'raw_data': {},
+    }
+    if not markup:
+        return product_data
+
+    try:
+        soup = parse_html(markup, parser_backend)
+        fields = AlkaramScraper.pdp_spec.extract(soup, store_name)
+
+        product_data['title'] = fields['title']
+        product_data['sku'] = fields['sku']
+
+        # The first amount shown is the original price and a second one the sale price;
+        # without any, data-price holds the price in paisa.
+        prices = fields['prices'] or []
+        product_data['original_price'] = prices[0] if prices else fields['data_price']
+        product_data['sale_price'] = prices[1] if len(prices) >= 2 else None
+        product_data['currency'] = fields['currency']
+
+        product_data['images'] = [urljoin(base_url, src) for src in fields['images'] or []]
+        product_data['category'] = fields['category']
+        product_data['availability'] = fields['availability'] is not None
+        product_data['variants'] = list(fields['variants'])
+
+        details = dict(fields['details'])
+        if fields['breadcrumbs']:
+            details["Breadcrumbs"] = " > ".join(fields['breadcrumbs'])
+        product_data['attributes'] = details
+        if fields['disclaimer']:
+            product_data['raw_data']['disclaimer'] = fields['disclaimer']
+
+        return product_data
+
+    except Exception as e:
+        logger.error(f"Error scraping PDP {product_link}: {str(e)}", exc_info=True)
+
+    return product_data
@@ -1,17 +1,12 @@
 import os
-import re
-import json
-import asyncio
-import re
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import almirah_logger
+from utils.text import paragraphs
+from utils.patterns import regex
 from urllib.parse import urljoin
-import time
+
+NON_DIGIT_COMMA_RE = regex(r'[^\d,]')
+CURRENCY_PREFIX_RE = regex(r'^(\D+)')
 
 
 class almirahscraper(BaseScraper):
@@ -24,7 +19,6 @@ class almirahscraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "almirah"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -39,10 +33,8 @@ class almirahscraper(BaseScraper):
 
 
     async def scrape_pdp(self, product_link):        
-            if product_link in self.all_product_links_:
+            if not self.frontier.add(product_link):
                 return None
-
-            self.all_product_links_.append(product_link)
             product_data = {
                 'store_name': self.store_name,
                 'title': None,
@@ -67,7 +59,7 @@ class almirahscraper(BaseScraper):
 
             try:
                 response = await self.async_make_request(product_link)
-                soup = BeautifulSoup(response.text, "html.parser")
+                soup = self.parse_html(response.text)
 
                 try:
                     # Product Name
@@ -109,7 +101,7 @@ class almirahscraper(BaseScraper):
                         if not price_str:
                             return None
                         # Extract digits and commas, remove commas, and convert to float
-                        cleaned = re.sub(r'[^\d,]', '', price_str)
+                        cleaned = NON_DIGIT_COMMA_RE.sub('', price_str)
                         numeric_str = cleaned.replace(',', '')
                         return float(numeric_str)
 
@@ -120,7 +112,7 @@ class almirahscraper(BaseScraper):
                     # Extract currency from price string (assumes symbol is at the start)
                     sample_price = original_price_str or sale_price_str
                     if sample_price:
-                        match = re.match(r'^(\D+)', sample_price)
+                        match = CURRENCY_PREFIX_RE.match(sample_price)
                         currency_symbol = match.group(1).strip() if match else None
                         product_data['currency'] = currency_symbol
                     else:
@@ -203,8 +195,7 @@ class almirahscraper(BaseScraper):
                     # Short Description
                     short_desc_div = soup.select_one('div.new-product-short-description .metafield-rich_text_field')
                     if short_desc_div:
-                        paragraphs = [p.get_text(strip=True).replace('\xa0', ' ') for p in short_desc_div.find_all('p')]
-                        product_data['attributes'] = ' '.join(paragraphs)
+                        product_data['attributes'] = ' '.join(paragraphs(short_desc_div, separator=''))
                 except Exception as e:
                     self.log_debug(f"Exception occurred while scraping short description: {e}")
                     product_data['attributes'] = ""
@@ -213,10 +204,7 @@ class almirahscraper(BaseScraper):
                     # Description
                     description_div = soup.select_one('div.accordion__content.rte')
                     if description_div:
-                        for br in description_div.find_all('br'):
-                            br.replace_with('\n')
-                        paragraphs = [p.get_text(separator='\n', strip=True).replace('\xa0', ' ') for p in description_div.find_all('p')]
-                        product_data['description'] = '\n\n'.join(paragraphs)
+                        product_data['description'] = '\n\n'.join(paragraphs(description_div))
                 except Exception as e:
                     self.log_debug(f"Exception occurred while scraping product description: {e}")
                     product_data['description'] = ""
@@ -272,7 +260,7 @@ class almirahscraper(BaseScraper):
                         response = await self.async_make_request(current_url)
                     
 
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = self.parse_html(response.text)
 
                         # Look for <a class="custom-product-link-wrap" href="/products/...">
                         product_links = soup.select('a.custom-product-link-wrap[href^="/products/"]')
@@ -297,34 +285,3 @@ class almirahscraper(BaseScraper):
 
                 self.log_info(f"Collected {len(all_product_links)} unique product links.")
                 return all_product_links
-        
-    
-    async def scrape_category(self, url):
-            all_products = []
-            all_products_links = await self.scrape_products_links(url)
-            for product_link in all_products_links:
-                pdp_data = await self.scrape_pdp(product_link)
-                if pdp_data is not None:
-                    all_products.append(pdp_data)
-            
-            return all_products
-        
-    async def scrape_data(self):
-            final_data = []
-            try:
-                category_urls = await self.get_unique_urls_from_file(
-                    os.path.join(self.module_dir, "categories.txt")
-                )
-                for url in category_urls:
-                    products = await self.scrape_category(url)
-                    final_data.extend(products)
-                if final_data:
-                    saved_path = await self.save_data(final_data)  # ✅ FIXED
-                    if saved_path:
-                        self.log_info(f"Total {len(category_urls)} categories")
-                        self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                        self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-                else:
-                    self.log_error("No data scraped")
-            except Exception as e:
-                self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
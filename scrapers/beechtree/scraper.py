@@ -1,18 +1,14 @@
 import os
-import re
-import json
-import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import BEECHTREE_LOGGER
+from utils.text import paragraphs
+from utils.patterns import regex
 from urllib.parse import urljoin
-from urllib.parse import urlsplit, urlunsplit, urljoin
+from urllib.parse import urlsplit, urlunsplit
 
-import time
+
+NON_PRICE_RE = regex(r'[^\d.,]')
+CURRENCY_SYMBOL_RE = regex(r'(PKR|Rs|₹|\$|€|£)')
 
 
 class Beechtree_Scrapper(BaseScraper):
@@ -25,7 +21,6 @@ class Beechtree_Scrapper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "beechtree"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -40,9 +35,8 @@ class Beechtree_Scrapper(BaseScraper):
 
 
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        self.all_product_links_.append(product_link)
 
         product_data = {
             'store_name': self.store_name,
@@ -64,7 +58,7 @@ class Beechtree_Scrapper(BaseScraper):
 
         try:
             response = await self.async_make_request(product_link)
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text)
 
             product_title_wrapper = soup.find('div', class_="product__title")
             if product_title_wrapper:
@@ -99,7 +93,7 @@ class Beechtree_Scrapper(BaseScraper):
 
                     if original_price_tag:
                         original_price_str = original_price_tag.get_text(strip=True)
-                        product_data['original_price'] = re.sub(r'[^\d.,]', '', original_price_str).lstrip('.')
+                        product_data['original_price'] = NON_PRICE_RE.sub('', original_price_str).lstrip('.')
                     else:
                         product_data['original_price'] = None
 
@@ -107,13 +101,13 @@ class Beechtree_Scrapper(BaseScraper):
                     sale_price_tag = price_wrapper.select_one('.price__sale .price-item--sale .money')
                     if sale_price_tag:
                         sale_price_str = sale_price_tag.get_text(strip=True)
-                        product_data['sale_price'] = re.sub(r'[^\d.,]', '', sale_price_str).lstrip('.')
+                        product_data['sale_price'] = NON_PRICE_RE.sub('', sale_price_str).lstrip('.')
                     else:
                         product_data['sale_price'] = None
 
                     # Extract currency from either price
                     currency_source = original_price_str or sale_price_str or ''
-                    currency_match = re.search(r'(PKR|Rs|₹|\$|€|£)', currency_source)
+                    currency_match = CURRENCY_SYMBOL_RE.search(currency_source)
                     product_data['currency'] = currency_match.group(1) if currency_match else None
             except Exception as e:
                 self.log_debug(f"Exception occurred while scraping prices: {e}")
@@ -141,16 +135,12 @@ class Beechtree_Scrapper(BaseScraper):
                 # Product Description
                 description_div = soup.select_one('div.product__description.rte.quick-add-hidden.desktop')
                 if description_div:
-                    # Convert <br> tags to newline
-                    for br in description_div.find_all('br'):
-                        br.replace_with('\n')
-
                     # Extract list items and paragraphs
-                    list_items = [li.get_text(strip=True) for li in description_div.find_all('li')]
-                    paragraphs = [p.get_text(separator='\n', strip=True).replace('\xa0', ' ') for p in description_div.find_all('p')]
+                    list_items = paragraphs(description_div, tags='li', separator='')
+                    description_paragraphs = paragraphs(description_div)
 
                     # Combine all text parts
-                    description_parts = list_items + paragraphs
+                    description_parts = list_items + description_paragraphs
                     product_data['description'] = '\n'.join(description_parts)
             except Exception as e:
                 self.log_debug(f"Exception occurred while scraping product description: {e}")
@@ -209,7 +199,7 @@ class Beechtree_Scrapper(BaseScraper):
                     response = await self.async_make_request(current_url)
                     
 
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    soup = self.parse_html(response.text)
 
                     # Select anchors linking to products via div.card_carousel
                     product_anchors = soup.select('a[href^="/products/"] > div.card_carousel')
@@ -233,35 +223,3 @@ class Beechtree_Scrapper(BaseScraper):
 
             self.log_info(f"Collected total {len(all_product_links)} product link(s).")
             return all_product_links
-
-
-
-    async def scrape_category(self, url):
-            all_products = []
-            all_products_links = await self.scrape_products_links(url)
-            for product_link in all_products_links:
-                pdp_data = await self.scrape_pdp(product_link)
-                if pdp_data is not None:
-                    all_products.append(pdp_data)
-            
-            return all_products
-        
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)  # ✅ FIXED
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
@@ -1,15 +1,21 @@
 import os
 import json
-import requests
-import re
-from bs4 import BeautifulSoup
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import CAMBRIDGESHOP_LOGGER
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+from utils.listing import listing_records
+from utils.patterns import regex
+
+PRICE_NOISE_RE = regex(r'(Rs\.?|,|\s)')
 
 class CambridgeShopScraper(BaseScraper):
+    listing_regions = [
+        {'name': 'div', 'class_': 't4s-main-collection-page'},
+    ]
+    pdp_regions = [
+        {'name': 'div', 'class_': 't4s-product__info-wrapper'},
+        {'name': 'div', 'class_': 't4s-product__media-wrapper'},
+    ]
+
     def __init__(self, proxies=None, request_delay=3):
         super().__init__(
             base_url="https://thecambridgeshop.com",
@@ -19,7 +25,6 @@ class CambridgeShopScraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "cambridgeshop"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -34,14 +39,12 @@ class CambridgeShopScraper(BaseScraper):
     async def clean_price_string(self, price_str):
         if not price_str:
             return None
-        cleaned = re.sub(r'(Rs\.?|,|\s)', '', price_str)
+        cleaned = PRICE_NOISE_RE.sub('', price_str)
         return cleaned
         
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -65,7 +68,7 @@ class CambridgeShopScraper(BaseScraper):
                 product_link
             )
             
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text, self.pdp_regions)
             product_info_main = soup.find('div', class_="t4s-product__info-wrapper")
             if product_info_main:
                 try:
@@ -152,7 +155,7 @@ class CambridgeShopScraper(BaseScraper):
         return product_data
     
     async def scrape_products_links(self, url):
-        all_product_links = set()
+        all_products = {}
         page_number = 1
         current_url = url
         while True:
@@ -163,20 +166,19 @@ class CambridgeShopScraper(BaseScraper):
                     current_url
                 )
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self.parse_html(response.text, self.listing_regions)
                 
                 main_div = soup.find('div', class_='t4s-main-collection-page')
 
                 if main_div:
 
-                    product_links = main_div.find_all('a', class_='t4s-full-width-link')
-                    self.log_info(f"{len(product_links)} products on page {page_number}") 
-                    if not product_links:
+                    products = listing_records(main_div, self.store_name, self.base_url)
+                    self.log_info(f"{len(products)} products on page {page_number}") 
+                    if not products:
                         self.log_info(f"No products found on page {page_number}. Stopping.")
                         break
-                    for link in product_links:
-                        href = self.base_url + link['href']
-                        all_product_links.add(href)
+                    for product in products:
+                        all_products.setdefault(product['product_url'], product)
                 else:
                     self.log_info(f"No products found on page {page_number}. Stopping.")
                     break
@@ -188,34 +190,4 @@ class CambridgeShopScraper(BaseScraper):
                 self.log_error(f"Error scraping page {page_number}: {e}")
                 break
         
-        return list(all_product_links)
-
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
+        return list(all_products.values())
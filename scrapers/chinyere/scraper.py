@@ -1,16 +1,6 @@
 import os
-import re
-import json
-import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import CHINYERE_LOGGER
-from urllib.parse import urljoin
-import time
 
 
 class chinyerescraper(BaseScraper):
@@ -23,7 +13,6 @@ class chinyerescraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "chinyere"
-        self.all_product_links_ = []
 
 
     async def clean_price_string(self, price_str):
@@ -46,10 +35,8 @@ class chinyerescraper(BaseScraper):
 
 
     async def scrape_pdp(self, product_link):   
-            if product_link in self.all_product_links_:
+            if not self.frontier.add(product_link):
                 return None
-            
-            self.all_product_links_.append(product_link)
 
             product_data = {
             'store_name': self.store_name,
@@ -71,7 +58,7 @@ class chinyerescraper(BaseScraper):
 
             try:
                 response = await self.async_make_request(product_link)
-                soup = BeautifulSoup(response.text, "html.parser")
+                soup = self.parse_html(response.text)
 
                 # Title
                 try:
@@ -219,7 +206,7 @@ class chinyerescraper(BaseScraper):
             try:
                 self.log_info(f"Scraping page {page_number}: {current_url}")
                 response = await self.async_make_request(current_url)
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self.parse_html(response.text)
 
                 # Get all product links on the current page
                 link_tags = soup.select('a.card-link[href^="/products/"]')
@@ -245,34 +232,3 @@ class chinyerescraper(BaseScraper):
 
         self.log_info(f"Collected {len(all_product_links)} product link(s).")
         return list(all_product_links)
-
-
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)  # ✅ FIXED
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
@@ -1,17 +1,11 @@
 import os
-import re
-import json
-import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import Diner_Logger
+from utils.patterns import regex
 from urllib.parse import urlsplit, urlunsplit, urljoin
-from urllib.parse import urljoin
-import time
+
+CURRENCY_PREFIX_RE = regex(r'^(\D+)')
+NON_DECIMAL_RE = regex(r'[^\d.]')
 
 
 
@@ -25,7 +19,6 @@ class DinnerScraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "diners"
-        self.all_product_links_ = []
     
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -39,10 +32,8 @@ class DinnerScraper(BaseScraper):
             return list(set(line.strip() for line in file if line.strip()))
 
     async def scrape_pdp(self, product_link):        
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -63,7 +54,7 @@ class DinnerScraper(BaseScraper):
 
         try:
             response = await self.async_make_request(product_link)
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text)
 
             # Product title
             try:
@@ -133,9 +124,9 @@ class DinnerScraper(BaseScraper):
 
                     def extract_price(text):
                         text = text.replace("From", "").strip()
-                        currency_match = re.match(r'^(\D+)', text)
+                        currency_match = CURRENCY_PREFIX_RE.match(text)
                         currency = currency_match.group(1).strip() if currency_match else None
-                        price = re.sub(r'[^\d.]', '', text)
+                        price = NON_DECIMAL_RE.sub('', text)
                         return price, currency
 
                     if original_price_tag and sale_price_tag:
@@ -191,7 +182,7 @@ class DinnerScraper(BaseScraper):
                 description_container = soup.select_one('div#tab-product-detail-mobile.toggle-content.show-mobile.is-active')
                 if description_container:
                     raw_html = description_container.decode_contents()
-                    soup_inner = BeautifulSoup(raw_html, 'html.parser')
+                    soup_inner = self.parse_html(raw_html)
 
                     lines = []
 
@@ -260,7 +251,7 @@ class DinnerScraper(BaseScraper):
                 self.log_info(f"Scraping page 1: {url}")
                 response = await self.async_make_request(url)
 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self.parse_html(response.text)
 
                 # Match anchor tags with class 'card-link' and href starting with /products/
                 product_anchors = soup.select('a.card-link[href^="/products/"]')
@@ -281,33 +272,3 @@ class DinnerScraper(BaseScraper):
 
             self.log_info(f"Collected {len(all_product_links)} product link(s).")
             return all_product_links
-      
-    async def scrape_category(self, url):
-            all_products = []
-            all_products_links = await self.scrape_products_links(url)
-            for product_link in all_products_links:
-                pdp_data = await self.scrape_pdp(product_link)
-                if pdp_data is not None:
-                    all_products.append(pdp_data)
-            
-            return all_products
-        
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)  # ✅ FIXED
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
@@ -1,17 +1,14 @@
 import os
-import re
-import json
-import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import ETHINIC_LOGGER
 from urllib.parse import urljoin
-from urllib.parse import urljoin, urlparse, urlunparse, parse_qs
-import time
+from utils.images import ImageSet
+from utils.url_utils import canonicalize_url
+from utils.text import paragraphs
+from utils.patterns import regex
+
+CURRENCY_PREFIX_RE = regex(r'([^\d\s.,]+)')
+NON_DIGIT_RE = regex(r'[^\d]')
 
 
 class EthinicScraper(BaseScraper):
@@ -24,7 +21,6 @@ class EthinicScraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "ethinic"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -38,11 +34,22 @@ class EthinicScraper(BaseScraper):
             return list(set(line.strip() for line in file if line.strip()))
 
 
+    def extract_color_page(self, soup):
+        sizes = []
+        size_section = soup.find("div", class_="new-option-single")
+        if size_section:
+            for option in size_section.find_all("div", class_="option-single-value"):
+                label = option.find("label")
+                size = label.text.strip() if label else "Unknown"
+                sizes.append((size, "false" if "sold_out" in option.get("class", []) else "true"))
+        return {
+            'images': [img.get("src") or img.get("data-src") for img in soup.select("div.swiper.thumbswiper img")],
+            'sizes': sizes,
+        }
+
     async def scrape_pdp(self, product_link):        
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -65,7 +72,7 @@ class EthinicScraper(BaseScraper):
 
         try:
             response = await self.async_make_request(product_link)
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text)
 
             try:
                 product_title_tag = soup.find('h1', class_="title")
@@ -89,11 +96,11 @@ class EthinicScraper(BaseScraper):
                     currency = None
 
                     def extract_currency(price_text):
-                        match = re.match(r'([^\d\s.,]+)', price_text)
+                        match = CURRENCY_PREFIX_RE.match(price_text)
                         return match.group(1) if match else None
 
                     def clean_price(price_text):
-                        return re.sub(r'[^\d]', '', price_text)
+                        return NON_DIGIT_RE.sub('', price_text)
 
                     # Discounted (original) price
                     off_price_div = price_div.find('div', class_='off-price')
@@ -131,49 +138,49 @@ class EthinicScraper(BaseScraper):
                 product_data['currency'] = "PKR"
 
             try:
-                visited_urls = set()
-                visited_urls.add(product_link)
-                base_url = self.base_url if hasattr(self, 'base_url') else product_link
-                product_data["images"] = []
+                # === Images and color variants ===
+                variant_links = [
+                    a["href"] for a in soup.select("div.new-option-single.color-option a.option-single-value[href]")
+                ]
+                color_section = soup.find("div", class_="new-option-single color-option")
+                colors = []
 
-                def extract_images_from_soup(soup_obj):
-                    image_elements = soup_obj.select("div.swiper.thumbswiper img")
-                    for img in image_elements:
-                        src = img.get("src") or img.get("data-src")
-                        if src:
-                            if src.startswith("//"):
-                                src = "https:" + src
-                            else:
-                                src = urljoin(base_url, src)
-
-                            parsed_url = urlparse(src)
-                            query_params = parse_qs(parsed_url.query)
-                            query_params.pop("width", None)
-                            clean_query = "&".join(f"{k}={v[0]}" for k, v in query_params.items())
-                            final_url = urlunparse(parsed_url._replace(query=clean_query))
-
-                            if final_url not in product_data["images"]:
-                                product_data["images"].append(final_url)
-
-                # Extract main product images
-                extract_images_from_soup(soup)
-
-                # Get variant links
-                variant_links = []
-                variant_anchors = soup.select("div.new-option-single.color-option a.option-single-value[href]")
-                for a in variant_anchors:
-                    href = a["href"]
-                    full_url = urljoin(base_url, href)
-                    if full_url not in visited_urls:
-                        variant_links.append(full_url)
-
-                # Extract images from variants
-                for variant_url in variant_links:
-                    visited_urls.add(variant_url)
-                    variant_resp = await self.async_make_request(variant_url)
-                    variant_soup = BeautifulSoup(variant_resp.text, "html.parser")
-                    extract_images_from_soup(variant_soup)
+                if color_section:
+                    # Handle colors without hrefs
+                    for div in color_section.find_all("div", class_="option-single-value"):
+                        input_tag = div.find("input")
+                        if input_tag:
+                            color = input_tag.get("value", "Unknown")
+                            colors.append((color, None))
 
+                    # Handle colors with hrefs (different PDP links)
+                    for link in color_section.find_all("a", class_="option-single-value"):
+                        input_tag = link.find("input")
+                        if input_tag:
+                            color = input_tag.get("value", "Unknown")
+                            colors.append((color, urljoin(self.base_url, link.get("href"))))
+
+                color_pages = await self.expand_variants(
+                    product_link, soup, variant_links + [link for _, link in colors if link], self.extract_color_page
+                )
+
+                images = ImageSet(self.base_url)
+                for page in color_pages.values():
+                    for image in page["images"]:
+                        images.add(image)
+                product_data["images"] = images.to_list()
+
+                current_page = color_pages[canonicalize_url(product_link, self.base_url)]
+                for color, link in colors:
+                    page = color_pages.get(canonicalize_url(link, self.base_url)) if link else current_page
+                    if page is None:
+                        continue
+                    for size, availability in page["sizes"]:
+                        product_data['variants'].append({
+                            'color': color,
+                            'size': size,
+                            'availability': availability
+                        })
             except Exception as e:
                 self.log_debug(f"Exception occurred while extracting product images and variants: {e}")
                 product_data["images"] = []
@@ -182,8 +189,7 @@ class EthinicScraper(BaseScraper):
                 # Short Description
                 short_desc_div = soup.select_one('div.new-product-short-description .metafield-rich_text_field')
                 if short_desc_div:
-                    paragraphs = [p.get_text(strip=True).replace('\xa0', ' ') for p in short_desc_div.find_all('p')]
-                    product_data['attributes'] = ' '.join(paragraphs)
+                    product_data['attributes'] = ' '.join(paragraphs(short_desc_div, separator=''))
             except Exception as e:
                 self.log_debug(f"Exception occurred while scraping short description: {e}")
                 product_data['attributes'] = ""
@@ -191,10 +197,7 @@ class EthinicScraper(BaseScraper):
             # Product Description
             description_div = soup.select_one('div.draw-content')
             if description_div:
-                for br in description_div.find_all('br'):
-                    br.replace_with('\n')
-                paragraphs = [p.get_text(separator='\n', strip=True).replace('\xa0', ' ') for p in description_div.find_all('p')]
-                product_data['description'] = '\n\n'.join(paragraphs)
+                product_data['description'] = '\n\n'.join(paragraphs(description_div))
 
             # Ensure raw_data key exists
             if 'raw_data' not in product_data:
@@ -218,54 +221,6 @@ class EthinicScraper(BaseScraper):
                 self.log_debug(f"Exception occurred while scraping care instructions: {e}")
                 product_data['raw_data']['care_instructions'] = None
 
-            try:
-                # === Color Variants ===
-                color_section = soup.find("div", class_="new-option-single color-option")
-                colors = []
-
-                if color_section:
-                    # Handle colors without hrefs
-                    for div in color_section.find_all("div", class_="option-single-value"):
-                        input_tag = div.find("input")
-                        if input_tag:
-                            color = input_tag.get("value", "Unknown")
-                            colors.append((color, None))
-
-                    # Handle colors with hrefs (different PDP links)
-                    for link in color_section.find_all("a", class_="option-single-value"):
-                        input_tag = link.find("input")
-                        if input_tag:
-                            color = input_tag.get("value", "Unknown")
-                            href = link.get("href")
-                            full_link = urljoin(self.base_url, href)
-                            colors.append((color, full_link))
-
-                # Loop through colors and extract size variants
-                for color, link in colors:
-                    if link:
-                        color_response = requests.get(link, headers=self.headers)
-                        color_response.raise_for_status()
-                        color_soup = BeautifulSoup(color_response.text, 'html.parser')
-                    else:
-                        color_soup = soup  # Use current soup if no link
-
-                    size_section = color_soup.find("div", class_="new-option-single")
-                    if size_section:
-                        size_options = size_section.find_all("div", class_="option-single-value")
-                        for option in size_options:
-                            label = option.find("label")
-                            size = label.text.strip() if label else "Unknown"
-                            availability = "false" if "sold_out" in option.get("class", []) else "true"
-
-                            product_data['variants'].append({
-                                'color': color,
-                                'size': size,
-                                'availability': availability
-                            })
-
-            except Exception as e:
-                self.log_debug(f"Exception occurred while scraping color/size variants: {e}")
-
         except Exception as e:
             self.log_error(f"Error scraping PDP {product_link}: {str(e)}")
             return {'error': str(e), 'product_link': product_link}
@@ -283,7 +238,7 @@ class EthinicScraper(BaseScraper):
                 try:
                     self.log_info(f"Scraping page {page_number}: {current_url}")
                     response = await self.async_make_request(current_url)
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    soup = self.parse_html(response.text)
 
                     product_items = soup.select('li.product__item')
 
@@ -317,35 +272,3 @@ class EthinicScraper(BaseScraper):
 
             self.log_info(f"Collected {len(all_product_links)} unique product links.")
             return list(all_product_links)
-
-        
-    async def scrape_category(self, url):
-            all_products = []
-            all_products_links = await self.scrape_products_links(url)
-            for product_link in all_products_links:
-                pdp_data = await self.scrape_pdp(product_link)
-                if pdp_data is not None:
-                    all_products.append(pdp_data)
-            
-            return all_products
-    
-    async def scrape_data(self):
-            final_data = []
-            try:
-                category_urls = await self.get_unique_urls_from_file(
-                    os.path.join(self.module_dir, "categories.txt")
-                )
-                for url in category_urls:
-                    products = await self.scrape_category(url)
-                    final_data.extend(products)
-                if final_data:
-                    saved_path = await self.save_data(final_data)  # ✅ FIXED
-                    if saved_path:
-                        self.log_info(f"Total {len(category_urls)} categories")
-                        self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                        self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-                else:
-                    self.log_error("No data scraped")
-            except Exception as e:
-                self.log_error(f"Scraping failed: {str(e)}")
-
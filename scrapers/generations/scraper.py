@@ -1,19 +1,11 @@
 import os
-import re
-import json
-import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3 import Retry
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import GENERATION_LOGGER
+from utils.patterns import regex
 from urllib.parse import urljoin
-import time
+
+NON_DIGIT_RE = regex(r'[^\d]')
+CURRENCY_PREFIX_RE = regex(r'([^\d\s]+)')
 
 
 class GenerationScraper(BaseScraper):
@@ -26,7 +18,6 @@ class GenerationScraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "generations"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -41,10 +32,8 @@ class GenerationScraper(BaseScraper):
 
 
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -67,7 +56,7 @@ class GenerationScraper(BaseScraper):
 
         try:
             response = await self.async_make_request(product_link)
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text)
 
             try:
                 product_title_tag = soup.find('h1', class_="ProductMeta__Title Heading u-h2")
@@ -97,19 +86,19 @@ class GenerationScraper(BaseScraper):
                         # Both sale and original prices are present
                         sale_price_str = sale_price_tag.get_text(strip=True)
                         original_price_str = original_price_tag.get_text(strip=True)
-                        product_data['sale_price'] = re.sub(r'[^\d]', '', sale_price_str)
-                        product_data['original_price'] = re.sub(r'[^\d]', '', original_price_str)
+                        product_data['sale_price'] = NON_DIGIT_RE.sub('', sale_price_str)
+                        product_data['original_price'] = NON_DIGIT_RE.sub('', original_price_str)
                     elif sale_price_tag and not original_price_tag:
                         # Sale price but no original price
                         sale_price_str = sale_price_tag.get_text(strip=True)
-                        product_data['sale_price'] = re.sub(r'[^\d]', '', sale_price_str)
+                        product_data['sale_price'] = NON_DIGIT_RE.sub('', sale_price_str)
                         product_data['original_price'] = None
                     else:
                         # Look for a single price (regular price)
                         single_price_tag = price_wrapper.find('span', class_='Price') or price_wrapper.find('span', class_='Price--regular')
                         if single_price_tag:
                             price_str = single_price_tag.get_text(strip=True)
-                            product_data['original_price'] = re.sub(r'[^\d]', '', price_str)
+                            product_data['original_price'] = NON_DIGIT_RE.sub('', price_str)
                             product_data['sale_price'] = None
                         else:
                             product_data['original_price'] = None
@@ -125,7 +114,7 @@ class GenerationScraper(BaseScraper):
                         price_text = single_price_tag.get_text(strip=True)
 
                     if price_text:
-                        match = re.match(r'([^\d\s]+)', price_text)
+                        match = CURRENCY_PREFIX_RE.match(price_text)
                         if match:
                             currency = match.group(1)
                     product_data['currency'] = currency
@@ -249,7 +238,7 @@ class GenerationScraper(BaseScraper):
                         response = await self.async_make_request(current_url)
                   
 
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = self.parse_html(response.text)
 
                         product_links = soup.select('a.ProductItem__ImageWrapper.desktop-img[href^="/collections/"]')
 
@@ -273,34 +262,3 @@ class GenerationScraper(BaseScraper):
 
                 self.log_info(f"Collected {len(all_product_links)} unique product links.")
                 return all_product_links
-
-
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)  # ✅ FIXED
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
@@ -1,16 +1,11 @@
 import os
-import re
-import json
-import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import INSIGMA_LOGGER
+from utils.prices import normalize_prices
+from utils.images import ImageSet
+from utils.variants import VariantMatrix
+from utils.url_utils import canonicalize_url
 from urllib.parse import urljoin
-import time
 
 
 class insigma_scraper(BaseScraper):
@@ -23,7 +18,6 @@ class insigma_scraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "Ingsigma"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -40,12 +34,38 @@ class insigma_scraper(BaseScraper):
  
 
 
+    def collect_images(self, soup, images):
+        for img in soup.find_all('img', attrs={'data-original-src': True}):
+            images.add(img['data-original-src'])
+        for media_div in soup.find_all('div', class_='product__media'):
+            img_tag = media_div.find('img')
+            if img_tag:
+                images.add_tag(img_tag, attrs=('src',))
+
+    def extract_color_page(self, soup):
+        images = ImageSet(self.base_url)
+        self.collect_images(soup, images)
+
+        color_element = soup.select_one('.option_color strong.active__value')
+        add_to_cart = soup.select_one('.product-form__submit')
+        base_available = bool(add_to_cart and 'Add to cart' in add_to_cart.text.strip())
+
+        size_inputs = soup.select('fieldset.option_size input[type="radio"]')
+        sizes = [(None, base_available)] if not size_inputs else [
+            (size_input['value'], bool('disabled' not in size_input.get('class', []) and base_available))
+            for size_input in size_inputs
+            if size_input.get('value')
+        ]
+        return {
+            'color': color_element.text.strip() if color_element else "N/A",
+            'images': images.to_list(),
+            'sizes': sizes,
+        }
+
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
 
-        self.all_product_links_.append(product_link)
-
         # Initialize product data with all fields
         product_data = {
             'store_name': self.store_name,
@@ -69,7 +89,7 @@ class insigma_scraper(BaseScraper):
 
         try:
             response = await self.async_make_request(product_link)
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text)
 
             try:
                 h1_tag = soup.select_one('h1')
@@ -118,43 +138,21 @@ class insigma_scraper(BaseScraper):
                 sale_price_tag = soup.find('span', class_='price-item--sale')
                 sale_percent_tag = soup.find('p', class_='save-percentage price__badge-sale')
 
-                currency = None
-
-                def clean_price(price_str):
-                    cleaned = re.sub(r'(PKR|Rs|₨|\$|€|£|¥|USD|EUR|GBP|JPY|₹)', '', price_str)
-                    return cleaned.replace('\xa0', ' ').strip()
-
+                original_text = sale_text = None
                 if original_price_tag:
                     original_text = original_price_tag.get_text()
-                    product_data['original_price'] = clean_price(original_text)
-                    self.log_debug(f"Original price extracted: {product_data['original_price']}")
-
-                    currency_match = re.search(r'[₹Rs₨$€£¥]+|PKR|USD|EUR|GBP|JPY', original_text)
-                    if currency_match:
-                        currency = currency_match.group(0)
-                        self.log_debug(f"Currency extracted from original price: {currency}")
-
                     if sale_price_tag:
                         sale_text = sale_price_tag.get_text()
-                        product_data['sale_price'] = clean_price(sale_text)
-                        self.log_debug(f"Sale price extracted: {product_data['sale_price']}")
-
-                        if not currency:
-                            currency_match = re.search(r'[₹Rs₨$€£¥]+|PKR|USD|EUR|GBP|JPY', sale_text)
-                            if currency_match:
-                                currency = currency_match.group(0)
-                                self.log_debug(f"Currency extracted from sale price: {currency}")
                 else:
                     regular_price_tag = soup.find('span', class_='price-item--regular')
                     if regular_price_tag:
-                        regular_text = regular_price_tag.get_text()
-                        product_data['original_price'] = clean_price(regular_text)
-                        self.log_debug(f"Regular price extracted (no <s> tag): {product_data['original_price']}")
+                        original_text = regular_price_tag.get_text()
 
-                        currency_match = re.search(r'[₹Rs₨$€£¥]+|PKR|USD|EUR|GBP|JPY', regular_text)
-                        if currency_match:
-                            currency = currency_match.group(0)
-                            self.log_debug(f"Currency extracted from regular price: {currency}")
+                prices = normalize_prices(original_text, sale_text, self.default_currency)
+                product_data['original_price'] = prices['original_price']
+                product_data['sale_price'] = prices['sale_price']
+                currency = prices['currency'] if original_text else None
+                self.log_debug(f"Prices extracted: {prices}")
 
                 if sale_percent_tag:
                     product_data['sale_percentage'] = sale_percent_tag.get_text(strip=True)
@@ -205,162 +203,31 @@ class insigma_scraper(BaseScraper):
                 product_data['description'] = None
 
             try:
-                product_images = set()
-
-                def add_image_url(url):
-                    if url:
-                        if url.startswith('//'):
-                            url = 'https:' + url
-                        product_images.add(url)
-
-                try:
-                    for img in soup.find_all('img', attrs={'data-original-src': True}):
-                        add_image_url(img['data-original-src'])
-
-                    for media_div in soup.find_all('div', class_='product__media'):
-                        img_tag = media_div.find('img')
-                        if img_tag:
-                            srcset = img_tag.get('srcset', '')
-                            largest_url = ''
-                            largest_width = 0
-                            if srcset:
-                                for entry in srcset.split(','):
-                                    parts = entry.strip().split(' ')
-                                    if len(parts) >= 2:
-                                        url, width_str = parts[0], parts[1].replace('w', '')
-                                        try:
-                                            width = int(width_str)
-                                            if width > largest_width:
-                                                largest_width = width
-                                                largest_url = url
-                                        except ValueError:
-                                            continue
-                                add_image_url(largest_url)
-                            else:
-                                add_image_url(img_tag.get('src'))
-                    self.log_debug("Main product images extracted successfully.")
-                except Exception as e:
-                    self.log_debug(f"Error extracting main product images: {e}")
-
-                base_url = "https://insignia.com.pk"
                 color_links = soup.select('fieldset.option_color a[href]')
-                for a in color_links:
-                    color_href = a['href']
-                    color_url = base_url + color_href
-                    try:
-                        response = await self.async_make_request(color_url)
-                        color_html = response.text
-                        color_soup = BeautifulSoup(color_html, 'html.parser')
-
-                        for img in color_soup.find_all('img', attrs={'data-original-src': True}):
-                            add_image_url(img['data-original-src'])
-
-                        for media_div in color_soup.find_all('div', class_='product__media'):
-                            img_tag = media_div.find('img')
-                            if img_tag:
-                                srcset = img_tag.get('srcset', '')
-                                largest_url = ''
-                                largest_width = 0
-                                if srcset:
-                                    for entry in srcset.split(','):
-                                        parts = entry.strip().split(' ')
-                                        if len(parts) >= 2:
-                                            url, width_str = parts[0], parts[1].replace('w', '')
-                                            try:
-                                                width = int(width_str)
-                                                if width > largest_width:
-                                                    largest_width = width
-                                                    largest_url = url
-                                            except ValueError:
-                                                continue
-                                    add_image_url(largest_url)
-                                else:
-                                    add_image_url(img_tag.get('src'))
-                        self.log_debug(f"Images extracted from color variant: {color_url}")
-                    except Exception as e:
-                        self.log_debug(f"Error loading images for color variant: {color_url} -> {str(e)}")
-
-                product_data['images'] = list(product_images)
+                color_names = {
+                    canonicalize_url(link['href'], self.base_url): link.get('data-color', '').strip()
+                    for link in color_links
+                }
+                color_pages = await self.expand_variants(
+                    product_link, soup, [link['href'] for link in color_links], self.extract_color_page
+                )
+
+                product_images = ImageSet(self.base_url)
+                variants = VariantMatrix(('color', 'size'))
+                for key, page in color_pages.items():
+                    for image in page['images']:
+                        product_images.add(image)
+                    color = color_names.get(key) or page['color']
+                    for size, availability in page['sizes']:
+                        variants.add({'color': color, 'size': size}, availability)
+                    self.log_debug(f"Images and variants extracted for color '{color}'.")
+
+                product_data['variants'] = variants.to_list()
+                product_data['images'] = product_images.to_list()
                 self.log_debug(f"Total images collected: {len(product_data['images'])}")
             except Exception as e:
-                self.log_debug(f"General exception in image extraction: {e}")
+                self.log_debug(f"General exception in image and variant extraction: {e}")
                 product_data['images'] = []
-
-            try:
-                product_data['variants'] = []
-
-                current_color_element = soup.select_one('.option_color strong.active__value')
-                current_color = current_color_element.text.strip() if current_color_element else "N/A"
-
-                is_available = soup.select_one('.product-form__submit')
-                base_available = bool(is_available and 'Add to cart' in is_available.text.strip())
-
-                all_size_elements = soup.select('fieldset.option_size input[type="radio"]')
-
-                if all_size_elements:
-                    for size_input in all_size_elements:
-                        size_value = size_input.get('value')
-                        if not size_value:
-                            continue
-                        is_disabled = 'disabled' in size_input.get('class', [])
-                        availability = bool(not is_disabled and base_available)
-                        product_data['variants'].append({
-                            'color': current_color,
-                            'size': size_value,
-                            'availability': availability
-                        })
-                else:
-                    product_data['variants'].append({
-                        'color': current_color,
-                        'size': None,
-                        'availability': base_available
-                    })
-
-                self.log_debug(f"Variants for current color '{current_color}' extracted successfully.")
-
-                other_color_links = soup.select('fieldset.option_color a[data-color][href]')
-                other_colors = {
-                    link.get('data-color').strip(): link.get('href')
-                    for link in other_color_links
-                    if link.get('data-color') and link.get('href') and link.get('data-color').strip() != current_color
-                }
-
-                for color_name, color_url in other_colors.items():
-                    try:
-                        full_url = 'https://insignia.com.pk' + color_url if not color_url.startswith('http') else color_url
-                        response = await self.async_make_request(full_url)
-                        color_html = response.text
-                        color_soup = BeautifulSoup(color_html, 'html.parser')
-
-                        color_available = color_soup.select_one('.product-form__submit')
-                        color_base_available = bool(color_available and 'Add to cart' in color_available.text.strip())
-
-                        size_inputs = color_soup.select('fieldset.option_size input[type="radio"]')
-                        if size_inputs:
-                            for size_input in size_inputs:
-                                size_value = size_input.get('value')
-                                if not size_value:
-                                    continue
-                                is_disabled = 'disabled' in size_input.get('class', [])
-                                availability = bool(not is_disabled and color_base_available)
-                                product_data['variants'].append({
-                                    'color': color_name,
-                                    'size': size_value,
-                                    'availability': availability
-                                })
-                        else:
-                            product_data['variants'].append({
-                                'color': color_name,
-                                'size': None,
-                                'availability': color_base_available
-                            })
-
-                        self.log_debug(f"Variants for color '{color_name}' extracted successfully.")
-                    except Exception as e:
-                        self.log_debug(f"Error loading color variant {color_url}: {str(e)}")
-                        continue
-            except Exception as e:
-                self.log_debug(f"General exception in variant extraction: {e}")
                 product_data['variants'] = []
 
 
@@ -380,7 +247,7 @@ class insigma_scraper(BaseScraper):
                 self.log_info(f"Scraping page {page_number}: {current_url}")
                 response = await self.async_make_request(current_url)
 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self.parse_html(response.text)
 
                 # Select all <a> tags with class 'full-unstyled-link' and href containing '/products/'
                 product_links = soup.select('a.full-unstyled-link[href*="/products/"]')
@@ -409,35 +276,3 @@ class insigma_scraper(BaseScraper):
 
         self.log_info(f"Collected {len(all_product_links)} unique product links.")
         return all_product_links
-
-
-
-    async def scrape_category(self, url):
-            all_products = []
-            all_products_links = await self.scrape_products_links(url)
-            for product_link in all_products_links:
-                pdp_data = await self.scrape_pdp(product_link)
-                if pdp_data is not None:
-                    all_products.append(pdp_data)
-            
-            return all_products
-        
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)  # ✅ FIXED
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
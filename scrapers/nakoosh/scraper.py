@@ -1,17 +1,10 @@
 import os
-import re
-import json
-import asyncio
-from statistics import variance
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import NAKOOSH_LOGGER
+from utils.patterns import regex
 from urllib.parse import urljoin
-import time
+
+PRICE_PARTS_RE = regex(r'^([^\d]+)?([\d,\.]+)')
 
 
 class nakoosh_Scrapper(BaseScraper):
@@ -24,7 +17,6 @@ class nakoosh_Scrapper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "nakoosh"
-        self.all_product_links_ = []
 
 
     async def get_unique_urls_from_file(self, filename):
@@ -41,11 +33,9 @@ class nakoosh_Scrapper(BaseScraper):
 
 
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
 
-        self.all_product_links_.append(product_link)
-
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -66,7 +56,7 @@ class nakoosh_Scrapper(BaseScraper):
 
         try:
             response = await self.async_make_request(product_link)
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text)
 
             # ----- Title -----
             try:
@@ -106,7 +96,7 @@ class nakoosh_Scrapper(BaseScraper):
                     def extract_price_and_currency(money_span):
                         text = money_span.get_text(strip=True)
                         # Use regex to split currency and number
-                        match = re.match(r'^([^\d]+)?([\d,\.]+)', text)
+                        match = PRICE_PARTS_RE.match(text)
                         if match:
                             currency = match.group(1).strip() if match.group(1) else None
                             amount = match.group(2).replace(',', '')
@@ -220,7 +210,7 @@ class nakoosh_Scrapper(BaseScraper):
                 self.log_info(f"Scraping page {page_number}: {current_url}")
                 response = await self.async_make_request(current_url)
         
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self.parse_html(response.text)
 
                 # Find all <a> tags with specific class and href pattern
                 link_tags = soup.select('a.product-grid-image[href*="/products/"]')
@@ -261,34 +251,3 @@ class nakoosh_Scrapper(BaseScraper):
             print(link)
         
         return list(all_product_links)
-
-
-    async def scrape_category(self, url):
-            all_products = []
-            all_products_links = await self.scrape_products_links(url)
-            for product_link in all_products_links:
-                pdp_data = await self.scrape_pdp(product_link)
-                if pdp_data is not None:
-                    all_products.append(pdp_data)
-            
-            return all_products
-        
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)  # ✅ FIXED
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
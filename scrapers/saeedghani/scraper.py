@@ -1,26 +1,29 @@
 import os
-import json
-import requests
-import re
-from bs4 import BeautifulSoup
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import SAEEDGHANI_LOGGER
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
-from bs4.element import NavigableString
+from utils.patterns import regex
+
+PRICE_NOISE_RE = regex(r'(Rs\.?|,|\s)')
 
 class SaeedGhaniScraper(BaseScraper):
+    listing_regions = [
+        {'name': 'div', 'class_': 'product-collection'},
+    ]
+    pdp_regions = [
+        {'name': 'div', 'class_': 'product-default'},
+        {'name': 'div', 'class_': 'product-photos'},
+    ]
+
     def __init__(self, proxies=None, request_delay=3):
         super().__init__(
             base_url="https://saeedghani.pk",
             logger_name=SAEEDGHANI_LOGGER,
             proxies=proxies,
-            request_delay=request_delay
+            request_delay=request_delay,
+            parser_backend="lxml"
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "saeedghani"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -35,15 +38,13 @@ class SaeedGhaniScraper(BaseScraper):
     async def clean_price_string(self, price_str):
         if not price_str:
             return None
-        cleaned = re.sub(r'(Rs\.?|,|\s)', '', price_str)
+        cleaned = PRICE_NOISE_RE.sub('', price_str)
         return cleaned
         
     async def scrape_pdp(self, product_link):        
                 
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -66,7 +67,7 @@ class SaeedGhaniScraper(BaseScraper):
             response = await self.async_make_request(
                 product_link
             )
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text, self.pdp_regions)
 
             product_info_main = soup.find('div', class_="product-default")
             if product_info_main:
@@ -146,7 +147,7 @@ class SaeedGhaniScraper(BaseScraper):
                     current_url
                 )
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self.parse_html(response.text, self.listing_regions)
                 
                 main_div = soup.find('div', class_='product-collection')
 
@@ -177,33 +178,3 @@ class SaeedGhaniScraper(BaseScraper):
                 break
         
         return list(all_product_links)
-
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
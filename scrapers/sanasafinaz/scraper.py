@@ -1,26 +1,31 @@
 import os
 import json
-import requests
-import re
-from bs4 import BeautifulSoup
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import SANASAFINAZ_LOGGER
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
-from bs4.element import NavigableString
+from utils.patterns import regex
+
+SWATCH_OPTIONS_RE = regex(r"\[data-role=swatch-options\]")
 
 class SanaSafinazScraper(BaseScraper):
+    listing_regions = [
+        {'name': 'ol', 'class_': 'product-items'},
+    ]
+    pdp_regions = [
+        {'name': 'div', 'class_': 'product-info-main'},
+        {'name': 'script', 'type': 'text/x-magento-init'},
+        {'name': 'div', 'class_': 'MagicToolboxContainer'},
+    ]
+
     def __init__(self, proxies=None, request_delay=0.1):
         super().__init__(
             base_url="https://www.sanasafinaz.com",
             logger_name=SANASAFINAZ_LOGGER,
             proxies=proxies,
-            request_delay=request_delay
+            request_delay=request_delay,
+            parser_backend="lxml"
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "sanasafinaz"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -41,10 +46,8 @@ class SanaSafinazScraper(BaseScraper):
         
     async def scrape_pdp(self, product_link):
                 
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -67,7 +70,7 @@ class SanaSafinazScraper(BaseScraper):
             response = await self.async_make_request(
                 product_link
             )
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text, self.pdp_regions)
 
             product_info_main = soup.find('div', class_="product-info-main")
             if product_info_main:
@@ -107,7 +110,7 @@ class SanaSafinazScraper(BaseScraper):
                 
                 try:
 
-                    script_tag = soup.find("script", type="text/x-magento-init", string=re.compile(r"\[data-role=swatch-options\]"))
+                    script_tag = soup.find("script", type="text/x-magento-init", string=SWATCH_OPTIONS_RE.regex)
                     if script_tag:
                         data = json.loads(script_tag.string)
 
@@ -180,7 +183,7 @@ class SanaSafinazScraper(BaseScraper):
                     current_url
                 )
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self.parse_html(response.text, self.listing_regions)
                 main_div = soup.find_all('ol', class_='product-items')
 
                 if main_div and len(main_div) >= 2:
@@ -207,33 +210,3 @@ class SanaSafinazScraper(BaseScraper):
                 break
         
         return list(all_product_links)
-
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
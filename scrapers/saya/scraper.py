@@ -1,15 +1,14 @@
 import os
-import json
-import requests
-import re
-from bs4 import BeautifulSoup
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import SAYA_LOGGER
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+from utils.embedded_json import EmbeddedJSON
+from utils.variants import VariantMatrix
+from utils.prices import clean_price
+from utils.patterns import regex
 from bs4.element import NavigableString
 
+VENDOR_RE = regex(r'"vendor"\s*:\s*"([^"]+)"')
+
 class SayaScraper(BaseScraper):
     def __init__(self, proxies=None, request_delay=3):
         super().__init__(
@@ -20,7 +19,6 @@ class SayaScraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "saya"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -32,18 +30,10 @@ class SayaScraper(BaseScraper):
         with open(filename, 'r') as file:
             return list(set(line.strip() for line in file if line.strip()))
         
-    async def clean_price_string(self, price_str):
-        if not price_str:
-            return None
-        cleaned = re.sub(r'(Rs\.?|,|\s)', '', price_str)
-        return cleaned
-        
     async def scrape_pdp(self, product_link):
                 
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -66,31 +56,22 @@ class SayaScraper(BaseScraper):
             response = await self.async_make_request(
                 product_link
             )
-            soup = BeautifulSoup(response.text, "html.parser")
+            embedded = EmbeddedJSON(response.text)
+            soup = self.parse_html(response.text)
             
             try:
-                options_tag = soup.find('script', class_='pr_options_json')
-                options_json_data = options_tag.string.strip()
-                options_data = json.loads(options_json_data)
-
-                variants_tag = soup.find('script', class_='pr_variants_json')
-                variants_json_data = variants_tag.string.strip()
-                variants_data = json.loads(variants_json_data)
+                options_data = embedded.by_class('pr_options_json')
+                variants_data = embedded.by_class('pr_variants_json')
                 
-                variants_availability = []
+                variants = VariantMatrix(j['name'] for j in options_data)
                 for i in variants_data:
-                    variants = {}
+                    options = {}
                     for j in options_data:
-                        option_name = j['name']
-                        option_position = j['position']
-                        option_values = j['values']
-
-                        variant_option = i['option'+str(option_position)]
-                        if variant_option in option_values:
-                            variants[option_name] = variant_option
-                    variants['availability'] = i['available']
-                    variants_availability.append(variants)
-                product_data['variants'] = variants_availability
+                        variant_option = i['option'+str(j['position'])]
+                        if variant_option in j['values']:
+                            options[j['name']] = variant_option
+                    variants.add(options, i['available'])
+                product_data['variants'] = variants.to_list()
             
             except Exception as e:
                 self.log_debug(f"Exception occured while scraping product's available variants : {e}")
@@ -110,13 +91,13 @@ class SayaScraper(BaseScraper):
                     if del_tag:
                         compare_span = del_tag.find("span", class_="money")
                         if compare_span:
-                            product_data["original_price"] = await self.clean_price_string(compare_span.get_text(strip=True))
+                            product_data["original_price"] = clean_price(compare_span.get_text(strip=True), self.default_currency)
 
                     ins_tag = price_review.find("ins")
                     if ins_tag:
                         price_span = ins_tag.find("span", class_="money")
                         if price_span:
-                            product_data["sale_price"] = await self.clean_price_string(price_span.get_text(strip=True))
+                            product_data["sale_price"] = clean_price(price_span.get_text(strip=True), self.default_currency)
             except Exception as e:
                 self.log_debug(f"Exception occured while scraping product's price : {e}")
             
@@ -132,14 +113,11 @@ class SayaScraper(BaseScraper):
                 self.log_debug(f"Exception occured while scraping product's sku : {e}")
 
             try:    
-                script_tags = soup.find_all("script")
-                for st in script_tags:
-                    content = st.string or ""
-                    if "var product =" in content:
-                        match = re.search(r'"vendor"\s*:\s*"([^"]+)"', content)
-                        if match:
-                            product_data["category"] = match.group(1)
-                        break
+                content = embedded.script_containing("var product =")
+                if content:
+                    match = VENDOR_RE.search(content)
+                    if match:
+                        product_data["category"] = match.group(1)
             except Exception as e:
                 self.log_debug(f"Exception occured while scraping product's category : {e}")
             
@@ -205,7 +183,7 @@ class SayaScraper(BaseScraper):
                     current_url
                 )
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self.parse_html(response.text)
 
                 main_div = soup.find('div', class_='t4s-products')
 
@@ -232,33 +210,3 @@ class SayaScraper(BaseScraper):
                 break
         
         return all_product_links
-
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
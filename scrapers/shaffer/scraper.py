@@ -1,13 +1,7 @@
 import os
-import json
-import requests
-import re
-from bs4 import BeautifulSoup
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import SHAFFER_LOGGER
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+from utils.jsonld import JsonLD, in_stock
 
 class ShafferScraper(BaseScraper):
     def __init__(self, proxies=None, request_delay=3):
@@ -15,11 +9,11 @@ class ShafferScraper(BaseScraper):
             base_url="https://shaffer.store",
             logger_name=SHAFFER_LOGGER,
             proxies=proxies,
-            request_delay=request_delay
+            request_delay=request_delay,
+            parser_backend="lxml"
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "shaffer"
-        self.all_product_links_ = []
         
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -33,10 +27,8 @@ class ShafferScraper(BaseScraper):
         
     async def scrape_pdp(self, product_link):
 
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -59,7 +51,7 @@ class ShafferScraper(BaseScraper):
             response = await self.async_make_request(
                 product_link
             )
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = self.parse_html(response.text)
 
             try:
                 h1_tag = soup.find("h1", class_="main-product__title")
@@ -122,13 +114,9 @@ class ShafferScraper(BaseScraper):
 
       
             try:
-                ld_json_tag = soup.find("script", type="application/ld+json", text=lambda t: '"availability"' in t if t else False)
-                if ld_json_tag:
-                    text_json = ld_json_tag.string.strip()
-                    if '"availability" : "http://schema.org/InStock"' in text_json:
-                        product_data["availability"] = True
-                    else:
-                        product_data["availability"] = False
+                offers = [offer for offer in JsonLD(response.text).offers() if offer.get("availability")]
+                if offers:
+                    product_data["availability"] = any(in_stock(offer["availability"]) for offer in offers)
             except Exception as e:
                 self.log_debug(f"Exception occured while scraping product's availability : {e}")
 
@@ -152,7 +140,7 @@ class ShafferScraper(BaseScraper):
                     current_url
                 )
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self.parse_html(response.text)
                 main_div = soup.find('ul', class_='product-grid')
 
                 if main_div:
@@ -176,33 +164,3 @@ class ShafferScraper(BaseScraper):
                 break
         
         return all_product_links
-
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
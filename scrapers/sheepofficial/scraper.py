@@ -1,15 +1,33 @@
 import os
-import json
 import requests
-import re
-from bs4 import BeautifulSoup
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import SHEEPOFFICIAL_LOGGER
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+from utils.extraction import ExtractionSpec, Field
+from utils.embedded_json import EmbeddedJSON
+from utils.variants import VariantMatrix
+from utils.jsonld import JsonLD
+
+def format_price(raw_price):
+    return raw_price.replace("Rs.", "").replace(",", "").strip() or None
+
 
 class SheepOfficialScraper(BaseScraper):
+    pdp_spec = ExtractionSpec(
+        title=Field('title'),
+        description=Field('.t4s-product__description .t4s-rte', separator=" "),
+        images=Field('.t4s-product__media-item img', attr=('data-master', 'src'), many=True, unique=True,
+                     post=lambda urls: list(dict.fromkeys("https:" + url for url in urls))),
+        sku=Field('[data-product__sku-number]'),
+        product_tags=Field('.product-tags a', '.tags a', many=True),
+        product_rating=Field('.r--stars-icon, .jdgm-stars', attr='data-average-rating'),
+        product_reviews_count=Field('.reviews-count, .jdgm-rating-summary__count'),
+        # Prices of the product itself, not of the recommendations further down the page.
+        original_price=Field('del .money', within='.t4s-product-price', post=format_price),
+        sale_price=Field('ins .money', within='.t4s-product-price', post=format_price),
+        price=Field('.money', within='.t4s-product-price'),
+        currency=Field('meta[itemprop="priceCurrency"]', attr='content'),
+    )
+
     def __init__(self, proxies=None, request_delay=3):
         super().__init__(
             base_url="https://sheepofficial.com",
@@ -19,7 +37,6 @@ class SheepOfficialScraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "sheepofficial"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -32,20 +49,9 @@ class SheepOfficialScraper(BaseScraper):
             return list(set(line.strip() for line in file if line.strip()))
         
 
-    def format_price(self, raw_price: str) -> str:
-        cleaned = raw_price.strip()
-
-        cleaned = cleaned.replace("Rs.", "")
-        cleaned = cleaned.replace(",", "")
-        cleaned = cleaned.strip()
-
-        return cleaned
-        
     async def scrape_pdp(self, product_link: str) -> dict:
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -73,146 +79,60 @@ class SheepOfficialScraper(BaseScraper):
             self.log_debug(f"Error fetching {product_link}: {e}")
             return product_data  
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = self.parse_html(response.text)
 
         try:
             
-            title_tag = soup.find("title")
-            if title_tag:
-                product_data["title"] = title_tag.get_text(strip=True)
-            
-            variants_script = soup.find('script', class_='pr_variants_json')
-            if variants_script:
-                variants_data = json.loads(variants_script.string)
-            else:
-                variants_data = []
+            fields = self.pdp_spec.extract(soup, self.store_name)
+            product_data["title"] = fields["title"]
 
-            
-            options_script = soup.find('script', class_='pr_options_json')
-            if options_script:
-                options_data = json.loads(options_script.string)
-            else:
-                options_data = []
+            embedded = EmbeddedJSON(response.text)
+            variants_data = embedded.by_class('pr_variants_json', [])
+            options_data = embedded.by_class('pr_options_json', [])
 
             option_map = [{opt["position"]: opt["name"].lower()} for opt in options_data]
 
 
 
-            variants = []
+            variants = VariantMatrix(value for i in option_map for value in i.values())
             for variant in variants_data:
                 variant_data = {}
                 for i in option_map:
                     for key, value in i.items():
                         variant_data[value] = variant.get('option' + str(key), '')
 
-                variant_data['availability'] = variant.get('available', False)
-                
-                variants.append(variant_data)
+                variants.add(variant_data, variant.get('available', False))
 
-            product_data['variants'] = variants
+            product_data['variants'] = variants.to_list()
 
-         
-            price_wrap = soup.select_one(".t4s-product-price")
-            if price_wrap:
-                del_tag = price_wrap.select_one("del .money")
-                if del_tag:
-                    product_data["original_price"] = self.format_price(del_tag.get_text(strip=True))
-                ins_tag = price_wrap.select_one("ins .money")
-                if ins_tag:
-                    product_data["sale_price"] = self.format_price(ins_tag.get_text(strip=True))
-                else:
-                
-                    if not del_tag:
-                        money_tag = price_wrap.select_one(".money")
-                        if money_tag:
-                            product_data["original_price"] = money_tag.get_text(strip=True)
 
-            desc_wrap = soup.select_one(".t4s-product__description .t4s-rte")
-            if desc_wrap:
-                product_data["description"] = desc_wrap.get_text(" ", strip=True)
+            # A single price without <del>/<ins> is the regular price, kept as shown.
+            product_data["original_price"] = fields["original_price"] or (None if fields["sale_price"] else fields["price"])
+            product_data["sale_price"] = fields["sale_price"]
 
-            img_tags = soup.select('.t4s-product__media-item img')
-            if img_tags:
-                product_data["images"] = []
-                for tag in img_tags:
-             
-                    src_master = tag.get("data-master")
-                    if src_master and src_master.strip():
-                        product_data["images"].append("https:" + src_master.strip())
-                    else:
-                        src_url = tag.get("src") or ""
-                        if src_url.strip():
-                            product_data["images"].append("https:" + src_url.strip())
-
-                product_data["images"] = list(dict.fromkeys(product_data["images"]))
-
-          
-            sku_tag = soup.select_one('[data-product__sku-number]')
-            if sku_tag:
-                sku_value = sku_tag.get_text(strip=True)
-                if sku_value:
-                    product_data["sku"] = sku_value
+            product_data["description"] = fields["description"]
+            product_data["images"] = fields["images"] or []
+            product_data["sku"] = fields["sku"]
 
            
-            ld_json_scripts = soup.find_all("script", {"type": "application/ld+json"})
-            for script_tag in ld_json_scripts:
-                try:
-                    data_json = json.loads(script_tag.string or "")
-                   
-                    if isinstance(data_json, dict):
-                        brand_info = data_json.get("brand") or {}
-                        if isinstance(brand_info, dict):
-                            brand_name = brand_info.get("name")
-                            if brand_name:
-                                product_data["brand"] = brand_name
-                      
-                        if data_json.get("category"):
-                            product_data["category"] = data_json["category"]
-                    elif isinstance(data_json, list):
-                        for item in data_json:
-                            if isinstance(item, dict):
-                                if item.get("brand"):
-                                    brand_info = item["brand"]
-                                    if isinstance(brand_info, dict):
-                                        brand_name = brand_info.get("name")
-                                        if brand_name and not product_data['brand'] and  product_data['brand'] == "":
-                                            product_data["brand"] = brand_name
-                                if item.get("category") and not product_data['category'] and  product_data['category'] == "":
-                                    product_data["category"] = item["category"]
-                except Exception as e:
-                    self.log_debug(f"Exception occured while scraping product's ld script : {e}")
+            ld_json = JsonLD(embedded)
+            for product in ld_json.products():
+                brand_info = product.get("brand")
+                brand_name = brand_info.get("name") if isinstance(brand_info, dict) else brand_info
+                if brand_name:
+                    product_data["brand"] = brand_name
+                if product.get("category"):
+                    product_data["category"] = product["category"]
 
             
-            tags_holder = soup.select(".product-tags a") or soup.select(".tags a")
-            if tags_holder:
-                product_data['attributes']["product_tags"] = [t.get_text(strip=True) for t in tags_holder]
-
-       
-            rating_tag = soup.select_one(".r--stars-icon, .jdgm-stars")
-            if rating_tag and rating_tag.get("data-average-rating"):
-                product_data['attributes']["product_rating"] = rating_tag["data-average-rating"]
+            for key in ("product_tags", "product_rating", "product_reviews_count"):
+                if fields[key] is not None:
+                    product_data['attributes'][key] = fields[key]
 
-            reviews_count_tag = soup.select_one(".reviews-count, .jdgm-rating-summary__count")
-            if reviews_count_tag:
-                product_data['attributes']["product_reviews_count"] = reviews_count_tag.get_text(strip=True)
 
-           
-            currency_meta = soup.find("meta", {"itemprop": "priceCurrency"})
-            if currency_meta and currency_meta.get("content"):
-                product_data["currency"] = currency_meta["content"].strip()
-            else:
-                for script_tag in ld_json_scripts:
-                    try:
-                        data_json = json.loads(script_tag.string or "")
-                        if isinstance(data_json, dict):
-                            if data_json.get("@type") == "ProductGroup" and data_json.get("hasVariant"):
-                                for variant in data_json["hasVariant"]:
-                                    offers = variant.get("offers", {})
-                                    if offers and offers.get("priceCurrency") and not product_data['currency'] and product_data['currency'] == "":
-                                        product_data["currency"] = offers["priceCurrency"]
-                                        break
-                    except Exception as e:
-                        self.log_debug(f"Exception occured while scraping product's currency : {e}")
+            product_data["currency"] = fields["currency"] or next(
+                (offer["priceCurrency"] for offer in ld_json.offers() if offer.get("priceCurrency")), None
+            )
 
         except Exception as e:
             self.log_error(f"Error scraping {product_link}: {e}")
@@ -231,7 +151,7 @@ class SheepOfficialScraper(BaseScraper):
                     current_url
                 )
                 
-                soup = BeautifulSoup(response.text, 'html.parser')   
+                soup = self.parse_html(response.text)   
 
 
                 main_div = soup.find('div', class_='t4s-product-wrapper')
@@ -258,33 +178,3 @@ class SheepOfficialScraper(BaseScraper):
                 break
         
         return all_product_links
-
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url) 
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
@@ -1,13 +1,11 @@
 import os
-import json
-import requests
-import re
-from bs4 import BeautifulSoup
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import SPEEDSPORTS_LOGGER
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+from utils.url_utils import canonicalize_url
+from utils.embedded_json import EmbeddedJSON
+from utils.jsonld import JsonLD
+from utils.prices import format_amount
+
 
 class SpeedSportsScraper(BaseScraper):
     def __init__(self, proxies=None, request_delay=3):
@@ -15,11 +13,11 @@ class SpeedSportsScraper(BaseScraper):
             base_url="https://speedsports.pk",
             logger_name=SPEEDSPORTS_LOGGER,
             proxies=proxies,
-            request_delay=request_delay
+            request_delay=request_delay,
+            parser_backend="selectolax"
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "speedsports"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -32,10 +30,8 @@ class SpeedSportsScraper(BaseScraper):
             return list(set(line.strip() for line in file if line.strip()))
         
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -57,111 +53,126 @@ class SpeedSportsScraper(BaseScraper):
             response = await self.async_make_request(
                 product_link
             )
-            soup = BeautifulSoup(response.text, 'html.parser')
-        
-
-            title_el = soup.select_one('h1.t4s-product__title')
-            product_data['title'] = title_el.get_text(strip=True) if title_el else None
-
-            price_container = soup.select_one('div.t4s-product-price')
-            if price_container:
-                del_el = price_container.find('del')
-                ins_el = price_container.find('ins')
-                badge_el = price_container.find('span', class_='t4s-badge-price')
-
-                def clean_price(text):
-                    return text.replace('Rs.', '').replace(',', '').strip()
-
-                if del_el and ins_el:
-                    product_data['original_price'] = clean_price(del_el.get_text())
-                    product_data['sale_price'] = clean_price(ins_el.get_text())
-                else:
-                    product_data['original_price'] = clean_price(price_container.get_text())
-
+            embedded = EmbeddedJSON(response.text)
 
-            sku_el = soup.select_one('[data-product__sku-number]')
-            product_data['sku'] = sku_el.get_text(strip=True) if sku_el else None
-
-            product_ld_json = soup.find('script', type='application/ld+json', text=re.compile('"@type": "Product"'))
+            product_ld_json = JsonLD(embedded).product()
             brand = None
             description = None
 
             if product_ld_json:
-                try:
-                    json_str = product_ld_json.string.strip()
-                    
-                    json_str = re.sub(r'"sku":\s*"(.*?)"",', lambda m: f'"sku": "{m.group(1)}",', json_str)
-                    
-                    json_str = (json_str
-                                .replace('\\u0026quot;', '"')
-                                .replace('\\u0026#39;', "'")
-                                .replace('&quot;', '"')
-                                .replace('&#39;', "'"))
-                    
-                    ld_data = json.JSONDecoder().decode(json_str)
-                    
-                    brand = ld_data.get('brand', {}).get('name')
-                    description = ld_data.get('description', '')
-                    
-                    description = description.replace('\n', ' ').strip()
-                    
-                except Exception as e:
-                    self.log_debug(f"Error parsing variants JSON: {e}")
+                brand = product_ld_json.get('brand')
+                brand = brand.get('name') if isinstance(brand, dict) else brand
+                description = (product_ld_json.get('description') or '').replace('\n', ' ').strip()
             product_data['brand'] = brand
             product_data['description'] = description
-                
 
-            images = []
-            main_slides = soup.select('[data-product-single-media-group] [data-main-slide]')
-            for slide in main_slides:
-                img_el = slide.select_one('img[data-master]')
-                if img_el:
-                    master_url = img_el.get('data-master')
-                    if master_url:
-                        images.append("https:" + master_url)
-            product_data['images'] = images
-
-        
-            variants_data = []
-            variants_json_el = soup.find('script', class_='pr_variants_json', type='application/json')
-            if variants_json_el and variants_json_el.string:
-                try:
-                    variants_list = json.loads(variants_json_el.string)
-                    
-                    options_json_el = soup.find('script', class_='pr_options_json', type='application/json')
-                    option_names = []
-                    if options_json_el and options_json_el.string:
-                        options_data = json.loads(options_json_el.string)
-                        sorted_options = sorted(options_data, key=lambda x: x['position'])
-                        option_names = [opt['name'] for opt in sorted_options]
-                    
-
-                    for var_obj in variants_list:
-                        variant_options = {}
-                        options = var_obj.get('options', [])
-                        for idx, value in enumerate(options):
-                            if idx < len(option_names):
-                                key = option_names[idx]
-                                variant_options[key] = value
-                        
-                        v_data = {
-                            'title': var_obj.get('title'),
-                            'price': var_obj.get('price') / 100, 
-                            'sku': var_obj.get('sku'),
-                            'availability': var_obj.get('available'),
-                            **variant_options
-                        }
-                        variants_data.append(v_data)
-                except Exception as e:
-                    self.log_debug(f"Error parsing variants JSON: {e}")
-
-            product_data['variants'] = variants_data
+            # Pages embedding the theme's product JSON need no DOM at all.
+            if not self.fill_from_product_json(product_data, embedded.variable('product')):
+                self.fill_from_dom(product_data, self.parse_html(response.text), embedded)
 
         except Exception as e:
             self.log_error(f"Error scraping product data from {product_link}: {e}")
 
         return product_data
 
+    def fill_from_product_json(self, product_data, product):
+        """Fill title, sku, prices, images and variants from Shopify's product JSON.
+
+        Returns False, leaving ``product_data`` untouched, when the JSON lacks any of them.
+        """
+        if not isinstance(product, dict) or not product.get('title') or not product.get('images'):
+            return False
+        variants_list = [variant for variant in product.get('variants') or [] if isinstance(variant, dict)]
+        if not variants_list:
+            return False
+
+        # The page shows the first available variant, like Shopify's selected_or_first_available_variant.
+        selected = next((variant for variant in variants_list if variant.get('available')), variants_list[0])
+        price, compare_at_price = selected.get('price'), selected.get('compare_at_price')
+        if not isinstance(price, int):
+            return False
+        option_names = [option.get('name') if isinstance(option, dict) else option for option in product.get('options') or []]
+        try:
+            variants = self.variant_rows(variants_list, option_names)
+        except (TypeError, AttributeError):
+            return False
+
+        product_data['title'] = product['title']
+        product_data['sku'] = selected.get('sku') or None
+        if isinstance(compare_at_price, int) and compare_at_price > price:
+            product_data['original_price'] = format_amount(compare_at_price, self.default_currency)
+            product_data['sale_price'] = format_amount(price, self.default_currency)
+        else:
+            product_data['original_price'] = format_amount(price, self.default_currency)
+        product_data['images'] = ["https:" + image if image.startswith('//') else image
+                                  for image in product['images'] if isinstance(image, str)]
+        product_data['variants'] = variants
+        return True
+
+    def fill_from_dom(self, product_data, soup, embedded):
+        title_el = soup.select_one('h1.t4s-product__title')
+        product_data['title'] = title_el.get_text(strip=True) if title_el else None
+
+        price_container = soup.select_one('div.t4s-product-price')
+        if price_container:
+            del_el = price_container.find('del')
+            ins_el = price_container.find('ins')
+
+            def clean_price(text):
+                return text.replace('Rs.', '').replace(',', '').strip()
+
+            if del_el and ins_el:
+                product_data['original_price'] = clean_price(del_el.get_text())
+                product_data['sale_price'] = clean_price(ins_el.get_text())
+            else:
+                product_data['original_price'] = clean_price(price_container.get_text())
+
+        sku_el = soup.select_one('[data-product__sku-number]')
+        product_data['sku'] = sku_el.get_text(strip=True) if sku_el else None
+
+        images = []
+        main_slides = soup.select('[data-product-single-media-group] [data-main-slide]')
+        for slide in main_slides:
+            img_el = slide.select_one('img[data-master]')
+            if img_el:
+                master_url = img_el.get('data-master')
+                if master_url:
+                    images.append("https:" + master_url)
+        product_data['images'] = images
+
+        variants_list = embedded.by_class('pr_variants_json')
+        if variants_list:
+            try:
+                options_data = embedded.by_class('pr_options_json')
+                option_names = []
+                if options_data:
+                    sorted_options = sorted(options_data, key=lambda x: x['position'])
+                    option_names = [opt['name'] for opt in sorted_options]
+                product_data['variants'] = self.variant_rows(variants_list, option_names)
+            except Exception as e:
+                self.log_debug(f"Error parsing variants JSON: {e}")
+
+    @staticmethod
+    def variant_rows(variants_list, option_names):
+        variants_data = []
+        for var_obj in variants_list:
+            variant_options = {}
+            options = var_obj.get('options', [])
+            for idx, value in enumerate(options):
+                if idx < len(option_names):
+                    key = option_names[idx]
+                    variant_options[key] = value
+
+            v_data = {
+                'title': var_obj.get('title'),
+                'price': var_obj.get('price') / 100, 
+                'sku': var_obj.get('sku'),
+                'availability': var_obj.get('available'),
+                **variant_options
+            }
+            variants_data.append(v_data)
+        return variants_data
+
     async def scrape_products_links(self, url):
         all_product_links = []
         page_number = 1
@@ -173,13 +184,11 @@ class SpeedSportsScraper(BaseScraper):
                     current_url
                 )
                 
-                soup = BeautifulSoup(response.text, 'html.parser')   
+                soup = self.parse_html(response.text)   
 
                 main_div = soup.find('div', class_='t4s-main-collection-page')
 
                 if main_div:
-                    collection_url = main_div.get('data-collection-url')
-
                     product_links = main_div.find_all('a', class_='t4s-full-width-link')
                     if not product_links:
                         self.log_info(f"No products found on page {page_number}. Stopping.")
@@ -187,7 +196,7 @@ class SpeedSportsScraper(BaseScraper):
                     
                     for link in product_links:
                         href = link.get('href')
-                        all_product_links.append(self.base_url + collection_url + href)
+                        all_product_links.append(canonicalize_url(href, self.base_url))
                 else:
                     self.log_info(f"No products found on page {page_number}. Stopping.")
                     break
@@ -200,33 +209,3 @@ class SpeedSportsScraper(BaseScraper):
                 break
         
         return all_product_links
-
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
@@ -1,13 +1,8 @@
 import os
 import json
-import requests
-import re
-from bs4 import BeautifulSoup
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import SPUTNIK_LOGGER
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+from utils.variants import VariantMatrix
 
 class SputnikFootWearScraper(BaseScraper):
     def __init__(self, proxies=None, request_delay=3):
@@ -19,7 +14,6 @@ class SputnikFootWearScraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "sputnikfootwear"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -32,10 +26,8 @@ class SputnikFootWearScraper(BaseScraper):
             return list(set(line.strip() for line in file if line.strip()))
         
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -58,7 +50,7 @@ class SputnikFootWearScraper(BaseScraper):
                 product_link
             )
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
 
             product_json_script = soup.find('script', id=lambda x: x and x.startswith("ProductJson"))
             if not product_json_script:
@@ -89,18 +81,20 @@ class SputnikFootWearScraper(BaseScraper):
             ]
             variants_list = product_json.get('variants', [])
             product_options = product_json.get('options', [])
-            for v in variants_list:
+            variants = VariantMatrix(product_options, fields=('price', 'original_price'))
+            for v in variants_list if product_options else []:
                 variant_info = {}
                 count = 1
                 for i in product_options:
                     variant_info[i] = v.get('option'+str(count))
                     count = count + 1
-                    variant_info['availability'] = v.get('available', False)
-                    variant_info['price'] = v['price'] / 100.0 if v.get('price') else None
-                    variant_info['original_price'] = (v['compare_at_price'] / 100.0 
-                                                        if v.get('compare_at_price') else None)
-                    
-                    product_data['variants'].append(variant_info)
+                variants.add(
+                    variant_info,
+                    v.get('available', False),
+                    price=v['price'] / 100.0 if v.get('price') else None,
+                    original_price=v['compare_at_price'] / 100.0 if v.get('compare_at_price') else None,
+                )
+            product_data['variants'] = variants.to_list()
 
         except Exception as e:
             self.log_error(f"Error scraping product data from {product_link}: {e}")
@@ -112,7 +106,7 @@ class SputnikFootWearScraper(BaseScraper):
                 page_url
             )
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = self.parse_html(response.text)
 
         product_links = []
         for link_tag in soup.select(".grid-view-item__link"):
@@ -150,33 +144,3 @@ class SputnikFootWearScraper(BaseScraper):
             
                     
         return all_product_links
-
-    async def scrape_category(self, url):
-        all_products = []
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
@@ -1,11 +1,10 @@
 import os
-import json
-import requests
-import re
-from bs4 import BeautifulSoup
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import SULFAH_LOGGER
+from utils.jsonld import JsonLD, in_stock
+from utils.patterns import regex
+
+NON_DECIMAL_RE = regex(r'[^0-9.]')
 
 class SulafahScraper(BaseScraper):
     def __init__(self, proxies=None, request_delay=3):
@@ -17,7 +16,6 @@ class SulafahScraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "sulafah"
-        self.all_product_links_ = []
 
 
     async def get_unique_urls_from_file(self, filename):
@@ -31,10 +29,8 @@ class SulafahScraper(BaseScraper):
             return list(set(line.strip() for line in file if line.strip()))
         
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -57,18 +53,18 @@ class SulafahScraper(BaseScraper):
                 product_link
             )
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
 
             title_tag = soup.select_one('.product-info__block-item[data-block-type="title"] .product-title')
             title = title_tag.get_text(strip=True) if title_tag else None
             product_data['title'] = title
 
             sale_price_tag = soup.select_one('.price-list--product sale-price .money')
-            sale_price = re.sub(r'[^0-9.]', '', sale_price_tag.get_text(strip=True))[1:] if sale_price_tag else None
+            sale_price = NON_DECIMAL_RE.sub('', sale_price_tag.get_text(strip=True))[1:] if sale_price_tag else None
             product_data['sale_price'] = sale_price
 
             compare_price_tag = soup.select_one('.price-list--product compare-at-price:not([hidden]) .money')
-            compare_price = re.sub(r'[^0-9.]', '', compare_price_tag.get_text(strip=True))[1:] if compare_price_tag else None
+            compare_price = NON_DECIMAL_RE.sub('', compare_price_tag.get_text(strip=True))[1:] if compare_price_tag else None
             product_data['original_price'] = compare_price
 
 
@@ -85,26 +81,14 @@ class SulafahScraper(BaseScraper):
                     images.append(photo_url)
             product_data['images'] = images
 
-            scripts = soup.find_all('script', type='application/ld+json')
-
             sizes = []
-
-            for script in scripts:
-                try:
-                    data = json.loads(script.string)
-
-                    if isinstance(data, dict) and data.get('@type') == 'Product' and 'offers' in data:
-                        for offer in data['offers']:
-                            size_str = offer.get('name')
-                            availability_url = offer.get('availability')
-                            
-                            if size_str and size_str.isdigit():
-                                size = int(size_str)
-                                availability = 'InStock' in availability_url
-                                sizes.append({'size': size, 'availability': availability})
-                    product_data['variants'] = sizes
-                except (json.JSONDecodeError, TypeError):
-                    continue
+            for product in JsonLD(response.text).products():
+                offers = product.get('offers') or []
+                for offer in [offers] if isinstance(offers, dict) else offers:
+                    size_str = offer.get('name') if isinstance(offer, dict) else None
+                    if size_str and size_str.isdigit():
+                        sizes.append({'size': int(size_str), 'availability': in_stock(offer.get('availability'))})
+            product_data['variants'] = sizes
         except Exception as e:
             self.log_error(f"Error scraping product data from {product_link}: {e}")   
         
@@ -121,7 +105,7 @@ class SulafahScraper(BaseScraper):
                     current_url
                 )
                     
-                soup = BeautifulSoup(response.text, 'html.parser')    
+                soup = self.parse_html(response.text)    
                 product_divs = soup.find_all("product-card", class_="product-card")   
                 
                 if not product_divs: 
@@ -143,34 +127,3 @@ class SulafahScraper(BaseScraper):
                 break
         
         return all_product_links
-
-    async def scrape_category(self, url):
-        all_products = []
-
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
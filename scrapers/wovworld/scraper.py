@@ -1,11 +1,9 @@
 import os
-import re
-import json
-import requests
-from bs4 import BeautifulSoup
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import WOVWORLD_LOGGER
+from utils.patterns import regex
+
+NON_DECIMAL_RE = regex(r'[^0-9.]')
 
 class WovWorldScraper(BaseScraper):
     def __init__(self, proxies=None, request_delay=3):
@@ -17,7 +15,6 @@ class WovWorldScraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "wovworld"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -31,10 +28,8 @@ class WovWorldScraper(BaseScraper):
         
     async def scrape_pdp(self, product_link):
 
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -57,7 +52,7 @@ class WovWorldScraper(BaseScraper):
                 product_link
             )
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
 
             product_container = soup.find('div', {'class': 'page-content page-content--product'})
             if not product_container:
@@ -79,7 +74,7 @@ class WovWorldScraper(BaseScraper):
                 price_span = price_span_container.find('span', {'class': 'money'})
                 if price_span:
                     raw_price_text = price_span.get_text(strip=True)
-                    numeric_text = re.sub(r'[^0-9.]', '', raw_price_text)
+                    numeric_text = NON_DECIMAL_RE.sub('', raw_price_text)
                     product_data['original_price'] = numeric_text[1:] if numeric_text else None
 
 
@@ -133,7 +128,7 @@ class WovWorldScraper(BaseScraper):
                     current_url
                 )
                 
-                soup = BeautifulSoup(response.text, 'html.parser')                
+                soup = self.parse_html(response.text)                
                 product_divs = soup.find_all('div', class_='grid-product__content') 
                 
                 if not product_divs: 
@@ -155,34 +150,3 @@ class WovWorldScraper(BaseScraper):
                 break
         
         return all_product_links
-
-    async def scrape_category(self, url):
-        all_products = []
-
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
-    async def scrape_data(self):
-        final_data = []
-        try:
-            category_urls = await self.get_unique_urls_from_file(
-                os.path.join(self.module_dir, "categories.txt")
-            )
-            for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
-            if final_data:
-                saved_path = await self.save_data(final_data)
-                if saved_path:
-                    self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
-            else:
-                self.log_error("No data scraped")
-        except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
@@ -1,13 +1,6 @@
 import os
-import re
 import json
-import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
 from interfaces.base_scraper import BaseScraper
-from datetime import datetime
 from utils.LoggerConstants import ZEENWOMAN_LOGGER
 
 class ZeeWomanScraper(BaseScraper):
@@ -20,7 +13,6 @@ class ZeeWomanScraper(BaseScraper):
         )
         self.module_dir = os.path.dirname(os.path.abspath(__file__))
         self.store_name = "zeenwoman"
-        self.all_product_links_ = []
 
     async def get_unique_urls_from_file(self, filename):
         if not isinstance(filename, str) or not filename.strip():
@@ -33,10 +25,8 @@ class ZeeWomanScraper(BaseScraper):
             return list(set(line.strip() for line in file if line.strip()))
         
     async def scrape_pdp(self, product_link):
-        if product_link in self.all_product_links_:
+        if not self.frontier.add(product_link):
             return None
-        
-        self.all_product_links_.append(product_link)
         product_data = {
             'store_name': self.store_name,
             'title': None,
@@ -59,7 +49,7 @@ class ZeeWomanScraper(BaseScraper):
                 product_link
             )
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
 
             product_container = soup.find('div', {'class': 't4s-product__info-container'})
             if not product_container:
@@ -232,7 +222,7 @@ class ZeeWomanScraper(BaseScraper):
                     current_url
                 )
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = self.parse_html(response.text)
                 product_divs = soup.find_all('div', class_='t4s-product')
                 
                 if not product_divs: 
@@ -255,34 +245,27 @@ class ZeeWomanScraper(BaseScraper):
         
         return all_product_links
 
-    async def scrape_category(self, url):
-        all_products = []
-
-        all_products_links = await self.scrape_products_links(url)
-        for product_link in all_products_links:
-            pdp_data = await self.scrape_pdp(product_link)
-            if pdp_data is not None:
-                all_products.append(pdp_data)
-        
-        return all_products
-    
     async def scrape_data(self):
-        final_data = []
+        self.products_by_url = {}
         try:
             category_urls = await self.get_unique_urls_from_file(
                 os.path.join(self.module_dir, "categories.txt")
             )
+            self.snapshot_writer = self.open_snapshot()
             for url in category_urls:
-                products = await self.scrape_category(url)
-                final_data.extend(products)
+                await self.scrape_category(url)
                 break
-            if final_data:
-                saved_path = await self.save_data(final_data)
+            if self.snapshot_writer.count:
+                saved_path = self.publish_snapshot(self.snapshot_writer)
                 if saved_path:
                     self.log_info(f"Total {len(category_urls)} categories")
-                    self.log_info(f"Saved {len(final_data)} products to {saved_path}")
-                    self.log_info(f"Product Sample Data: {json.dumps(final_data[0], separators=(',', ':'))}")
+                    self.log_info(f"Saved {self.snapshot_writer.count} products to {saved_path}")
+                    self.log_info(f"Product Sample Data: {self.snapshot_writer.sample}")
             else:
                 self.log_error("No data scraped")
         except Exception as e:
-            self.log_error(f"Scraping failed: {str(e)}")
\ No newline at end of file
+            self.log_error(f"Scraping failed: {str(e)}")
+        finally:
+            if self.snapshot_writer is not None:
+                self.snapshot_writer.close()
+                self.snapshot_writer = None
\ No newline at end of file
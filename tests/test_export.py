@@ -0,0 +1,52 @@
+import json
+import os
+from datetime import date
+import pytest
+
+pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+import export  # noqa: E402
+from utils.snapshots import SnapshotWriter  # noqa: E402
+
+
+def write_snapshot(path, records):
+    writer = SnapshotWriter(str(path))
+    for record in records:
+        writer.write(record)
+    writer.publish()
+
+
+def test_partition_round_trips_products_and_text_variant_prices(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, 'EXPORT_DIR', str(tmp_path / "parquet"))
+    path = tmp_path / "store.jsonl"
+    write_snapshot(path, [{
+        'product_url': 'https://x.pk/a', 'title': 'Lawn Suit', 'original_price': 'PKR 4,990',
+        'sale_price': 'Rs. 3,990', 'images': ['https://x.pk/a.jpg'],
+        'variants': [
+            {'size': 'S', 'availability': True, 'price': 'PKR 4,990'},
+            {'size': 'M', 'availability': False, 'price': 3990.5, 'original_price': None},
+        ],
+    }])
+
+    saved, count = export.write_partition(export.iter_records(str(path)), 'store', date(2026, 10, 18), 100)
+    rows = pq.read_table(saved).to_pylist()
+
+    assert count == 1 and saved.endswith(os.path.join("store=store", "date=2026-10-18", "part-0.parquet"))
+    row = rows[0]
+    assert (row['title'], row['currency'], row['original_price_minor'], row['sale_price_minor']) == \
+        ('Lawn Suit', 'PKR', 499000, 399000)
+    assert row['images'] == ['https://x.pk/a.jpg'] and row['variants_available'] == 1
+    small, medium = row['variants']
+    assert small['options'] == [('size', 'S')]
+    assert (small['price'], small['price_minor']) == (4990.0, 499000)
+    assert (medium['price'], medium['price_minor'], medium['original_price']) == (3990.5, 399050, None)
+
+
+def test_current_snapshots_reads_one_file_per_store(tmp_path):
+    write_snapshot(tmp_path / "store.jsonl", [{'product_url': 'https://x.pk/a'}])
+    (tmp_path / "store.json").write_text(json.dumps([{'product_url': 'https://x.pk/old'}]))
+    (tmp_path / "other.json").write_text(json.dumps([]))
+
+    found = [(store, os.path.basename(path)) for store, _, path in export.current_snapshots(str(tmp_path))]
+
+    assert found == [('other', 'other.json'), ('store', 'store.jsonl')]
@@ -0,0 +1,82 @@
+from scrapers.alkaram.scraper import parse_pdp as parse_alkaram
+from scrapers.hushpuppies.scraper import parse_pdp as parse_hushpuppies
+from scrapers.sheepofficial.scraper import SheepOfficialScraper
+from utils.extraction import ExtractionSpec, Field, Items
+from utils.html_parser import parse_html
+
+ALKARAM_PDP = """
+<h1 class="t4s-product__title">Printed Lawn Suit</h1>
+<div class="t4s-product-price" data-price="499000">Rs.4,990 Rs.3,990</div>
+<div class="t4s-swatch__list">
+  <div data-swatch-item="" class="t4s-swatch__item">S</div>
+  <div data-swatch-item="" class="t4s-swatch__item is--soldout">M</div>
+</div>
+<div class="t4s-swatch__list"><div data-swatch-item="">Red</div></div>
+<div class="t4s-rte t4s-tab-content t4s-active">
+  <p>Fabric: Lawn</p><p>Pure cotton</p><p>Color: Blue</p>
+  <div class="tab--disclaimer">Colours may vary.</div>
+</div>
+"""
+
+HUSHPUPPIES_PDP = """
+<price-list class="price-list--product">
+  <sale-price>Rs 7,999</sale-price><compare-at-price>Rs 9,999</compare-at-price>
+</price-list>
+<div class="variant-picker__option-values">
+  <input type="radio" value="1"><label><span class="sr-only">Black</span></label>
+</div>
+<fieldset class="variant-picker__option"><legend>Size</legend>
+  <input type="radio" id="s40"><label for="s40">40</label>
+  <input type="radio" id="s41"><label for="s41" class="is-disabled">41</label>
+</fieldset>
+<details class="accordion__disclosure"><summary>Description</summary>
+  <div class="accordion__content prose"><p>Leather upper.</p><p>Rubber sole.</p></div>
+</details>
+"""
+
+
+def test_items_read_each_match_within_the_first_container():
+    spec = ExtractionSpec(items=Items('li', within='ul', default=[], name=Field(), kind=Field(attr='data-kind')))
+    soup = parse_html('<ul><li data-kind="a">One</li><li>Two</li></ul><ul><li>Three</li></ul>')
+
+    assert spec.extract(soup)['items'] == [{'name': 'One', 'kind': 'a'}, {'name': 'Two', 'kind': None}]
+    assert spec.extract(parse_html('<p>none</p>'))['items'] == []
+
+
+def test_alkaram_prices_variants_and_details_come_from_the_spec():
+    record = parse_alkaram(ALKARAM_PDP, "https://www.alkaramstudio.com/products/a", "alkaram", "https://www.alkaramstudio.com")
+
+    assert (record['currency'], record['original_price'], record['sale_price']) == ('Rs.', '4990', '3990')
+    assert record['variants'] == [{'size': 'S', 'availability': True}, {'size': 'M', 'availability': False}]
+    assert record['attributes'] == {'Fabric': 'Lawn Pure cotton', 'Color': 'Blue'}
+    assert record['raw_data'] == {'disclaimer': 'Colours may vary.'}
+
+
+def test_alkaram_falls_back_to_data_price():
+    markup = '<div class="t4s-product-price" data-price="499000"></div>'
+    record = parse_alkaram(markup, "https://www.alkaramstudio.com/products/a", "alkaram", "https://www.alkaramstudio.com")
+
+    assert (record['original_price'], record['sale_price'], record['variants']) == ('4990', None, [])
+
+
+def test_hushpuppies_prices_variants_and_description_come_from_the_spec():
+    record = parse_hushpuppies(HUSHPUPPIES_PDP, "https://hushpuppies.com.pk/products/a", "hushpuppies",
+                               "https://hushpuppies.com.pk")
+
+    assert (record['currency'], record['original_price'], record['sale_price']) == ('Rs', '9,999', '7,999')
+    assert record['variants'] == [
+        {'color': 'Black', 'size': '40', 'availability': 'true'},
+        {'color': 'Black', 'size': '41', 'availability': 'false'},
+    ]
+    assert record['description'] == 'Leather upper.\n\nRubber sole.'
+
+
+def test_sheepofficial_reads_only_the_product_price():
+    markup = """
+    <meta itemprop="priceCurrency" content="PKR">
+    <div class="t4s-product-price"><del><span class="money">Rs.5,500</span></del><ins><span class="money">Rs.4,400</span></ins></div>
+    <div class="t4s-product-price"><span class="money">Rs.999</span></div>
+    """
+    fields = SheepOfficialScraper.pdp_spec.extract(parse_html(markup))
+
+    assert (fields['original_price'], fields['sale_price'], fields['currency']) == ('5500', '4400', 'PKR')
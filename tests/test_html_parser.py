@@ -0,0 +1,41 @@
+import pytest
+from utils.html_parser import HAS_LXML, HAS_SELECTOLAX, parse_html
+
+BACKENDS = ["html.parser"] + (["lxml"] if HAS_LXML else []) + (["selectolax"] if HAS_SELECTOLAX else [])
+
+LISTING = """
+<html><body>
+  <header class="page-header"><a href="/cart">Cart</a></header>
+  <ol class="products list items product-items">
+    <li class="item product product-item"><a class="product-item-link" href="/a.html">A</a></li>
+    <li class="item product product-item"><a class="product-item-link" href="/b.html">B</a></li>
+  </ol>
+  <div class="MagicToolboxContainer selectorsLeft minWidth"><img src="/c.jpg"></div>
+  <div class="footer">Footer</div>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_regions_match_elements_with_several_classes(backend):
+    regions = [
+        {'name': 'ol', 'class_': 'product-items'},
+        {'name': 'div', 'class_': 'MagicToolboxContainer'},
+    ]
+    soup = parse_html(LISTING, backend, regions=regions)
+    full = parse_html(LISTING, backend)
+    for name, class_ in [('ol', 'product-items'), ('div', 'MagicToolboxContainer')]:
+        assert len(soup.find_all(name, class_=class_)) == len(full.find_all(name, class_=class_)) == 1
+    assert [a['href'] for a in soup.find_all('a', class_='product-item-link')] == ['/a.html', '/b.html']
+    assert soup.find('div', class_='footer') is None
+    assert soup.find('header') is None
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_region_class_lists_and_several_classes(backend):
+    soup = parse_html(LISTING, backend, regions=[{'name': 'div', 'class_': ['footer', 'selectorsLeft']}])
+    assert len(soup.find_all('div')) == 2
+    soup = parse_html(LISTING, backend, regions=[{'name': 'div', 'class_': 'minWidth MagicToolboxContainer'}])
+    assert [div['class'][0] for div in soup.find_all('div')] == ['MagicToolboxContainer']
+    soup = parse_html(LISTING, backend, regions=[{'name': 'div', 'class_': 'minWidth footer'}])
+    assert soup.find_all('div') == []
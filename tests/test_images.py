@@ -0,0 +1,35 @@
+from utils.images import ImageSet, image_key, normalize_image_url
+
+CDN = "https://store.example.com/cdn/shop/files/"
+
+
+def test_size_like_file_names_are_kept():
+    for name in ("TOTE_BAG_LARGE.jpg", "kurta_small.jpg", "IMG_1200x1600.jpg"):
+        assert normalize_image_url("//store.example.com/cdn/shop/files/" + name + "?v=123") == CDN + name
+
+
+def test_sized_copies_share_a_key():
+    assert image_key(CDN + "kurta_600x.jpg?v=1") == image_key(CDN + "kurta.jpg") == CDN + "kurta.jpg"
+    assert normalize_image_url(CDN + "kurta_600x.jpg?width=600") == CDN + "kurta_600x.jpg"
+
+
+def test_image_set_keeps_a_real_url_per_image():
+    images = ImageSet()
+    assert images.add(CDN + "TOTE_BAG_LARGE.jpg?v=1")
+    assert images.add(CDN + "kurta_300x.jpg")
+    assert not images.add(CDN + "kurta.jpg?v=2")
+    assert not images.add(CDN + "kurta_1200x.jpg")
+    assert images.to_list() == [CDN + "TOTE_BAG_LARGE.jpg", CDN + "kurta.jpg"]
+
+
+def test_image_set_keeps_the_largest_sized_copy():
+    images = ImageSet()
+    assert images.add(CDN + "kurta_300x.jpg")
+    assert not images.add(CDN + "kurta_1200x.jpg?width=1200")
+    assert not images.add(CDN + "kurta_600x800_crop_center.jpg")
+    assert not images.add(CDN + "kurta_grande.jpg")
+    assert images.to_list() == [CDN + "kurta_1200x.jpg"]
+    assert not images.add(CDN + "kurta_800x@2x.jpg")
+    assert images.to_list() == [CDN + "kurta_800x@2x.jpg"]
+    assert not images.add(CDN + "kurta.jpg")
+    assert images.to_list() == [CDN + "kurta.jpg"]
@@ -0,0 +1,32 @@
+from scrapers.alkaram.scraper import AlkaramScraper
+from utils.html_parser import parse_html
+from utils.listing import listing_records
+
+# Trimmed from a T4S (Kalles) collection page: every card carries several classes.
+COLLECTION = """
+<html><body>
+  <div class="t4s-section-inner t4s_nt_se_template">
+    <div class="t4s-product t4s-pr-grid t4s-pr-style1 t4s-col-item">
+      <a class="t4s-full-width-link" href="/products/printed-lawn-suit?variant=1"></a>
+      <div class="t4s-product-img"><img class="t4s-product-main-img" src="//cdn.example.com/suit.jpg"></div>
+      <h3 class="t4s-product-title"><a href="/products/printed-lawn-suit">Printed Lawn Suit</a></h3>
+      <div class="t4s-product-price"><del>Rs.5,990</del><ins>Rs.4,490</ins></div>
+    </div>
+    <div class="t4s-product t4s-pr-grid t4s-pr-style1 t4s-col-item">
+      <a class="t4s-full-width-link" href="/products/plain-shirt"></a>
+      <h3 class="t4s-product-title"><a href="/products/plain-shirt">Plain Shirt</a></h3>
+      <div class="t4s-product-price">Rs.2,990</div>
+      <div class="t4s-product-badge"><span class="t4s-badge-item t4s-badge-soldout">Sold out</span></div>
+    </div>
+  </div>
+</body></html>
+"""
+
+
+def test_alkaram_listing_regions_keep_t4s_cards():
+    soup = parse_html(COLLECTION, regions=AlkaramScraper.listing_regions)
+    records = listing_records(soup, "alkaram", "https://www.alkaramstudio.com")
+    assert [record['title'] for record in records] == ["Printed Lawn Suit", "Plain Shirt"]
+    assert records[0]['product_url'].startswith("https://www.alkaramstudio.com/products/printed-lawn-suit")
+    assert [record['availability'] for record in records] == [True, False]
+    assert records == listing_records(parse_html(COLLECTION), "alkaram", "https://www.alkaramstudio.com")
@@ -0,0 +1,69 @@
+import asyncio
+import time
+import pytest
+import requests
+from interfaces.base_scraper import BaseScraper, DeadlineReached
+from utils.scheduler import StoreScheduler
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(str(self.status_code))
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+
+    def request(self, method, url, **kwargs):
+        return FakeResponse(self.statuses.pop(0))
+
+
+class Store(BaseScraper):
+    store_name = "store"
+
+    def __init__(self, statuses):
+        super().__init__("https://x.pk", "store", request_delay=0, max_retries=3)
+        self.session = FakeSession(statuses)
+
+    async def scrape_pdp(self, product_link):
+        return None
+
+    async def scrape_products_links(self, url):
+        return []
+
+
+def test_backoff_does_not_hold_a_scheduler_slot(monkeypatch):
+    scheduler = StoreScheduler(max_concurrency=1)
+    slots_in_use = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay):
+        slots_in_use.append((delay, scheduler.limiter.in_use))
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    scraper = Store([500, 200])
+    scraper.scheduler = scheduler
+    try:
+        response = asyncio.run(scraper.async_make_request("https://x.pk/a"))
+    finally:
+        scheduler.executor.shutdown()
+
+    assert response.status_code == 200
+    assert (2, 0) in slots_in_use
+    assert all(in_use == 0 for _, in_use in slots_in_use)
+
+
+def test_requests_stop_once_the_deadline_has_passed():
+    scraper = Store([200])
+    scraper.deadline = time.monotonic() - 1
+
+    with pytest.raises(DeadlineReached):
+        asyncio.run(scraper.async_make_request("https://x.pk/a"))
+    assert scraper.session.statuses == [200]
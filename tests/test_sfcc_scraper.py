@@ -0,0 +1,107 @@
+import os
+import json
+import asyncio
+from scrapers.sapphireonline.scraper import SapphireScraper
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "sfcc")
+BASE = "https://pk.sapphireonline.pk"
+CONTROLLER = "/on/demandware.store/Sites-Sapphire-Site/en_PK/"
+
+CATEGORY_PAGE = f"""
+<ol class="breadcrumb"><li class="breadcrumb-item"><a href="/">Home</a></li>
+<li class="breadcrumb-item"><a href="/women">Women</a></li>
+<li class="breadcrumb-item"><a href="/women/unstitched">Unstitched</a></li></ol>
+<div class="grid-footer" data-url="{CONTROLLER}Search-UpdateGrid?cgid=unstitched&amp;start=0&amp;sz=48"></div>
+"""
+
+
+def tile(pid):
+    return f'<div class="product" data-pid="{pid}"><a class="link" href="/women/unstitched/{pid}.html">{pid}</a></div>'
+
+
+class Response:
+    def __init__(self, text="", data=None):
+        self.text = text
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+def variation():
+    with open(os.path.join(FIXTURES, "product_variation.json")) as f:
+        return json.load(f)
+
+
+def scraper_with(pages):
+    scraper = SapphireScraper(request_delay=0)
+    scraper.requests_made = []
+
+    async def fake_request(url, *args, **kwargs):
+        scraper.requests_made.append(url)
+        for marker, response in pages.items():
+            if marker in url:
+                return response
+        raise AssertionError(f"unexpected request {url}")
+
+    scraper.async_make_request = fake_request
+    return scraper
+
+
+def test_parse_variation_product_from_saved_response():
+    scraper = SapphireScraper(request_delay=0)
+    product = {'images': [], 'attributes': {}, 'category': None}
+    scraper.parse_variation_product(variation()['product'], product)
+
+    assert product['title'] == "2 Piece - Printed Lawn Suit"
+    assert product['sku'] == "U2PE24V21-1-BLU"
+    assert (product['original_price'], product['sale_price'], product['currency']) == ("PKR 6,990", "PKR 4,990", "PKR")
+    assert product['save_percent'] == "29"
+    assert product['images'] == [
+        BASE + "/dw/image/v2/BKSB_PRD/on/demandware.static/-/Sites-masterCatalog/default/U2PE24V21-1-BLU_1.jpg?sw=800",
+        BASE + "/dw/image/v2/BKSB_PRD/on/demandware.static/-/Sites-masterCatalog/default/U2PE24V21-1-BLU_2.jpg?sw=800",
+    ]
+    assert product['variants'] == [
+        {'size': 'S', 'availability': True},
+        {'size': 'M', 'availability': True},
+        {'size': 'L', 'availability': False},
+    ]
+    assert product['availability'] is True
+    assert product['attributes']['color'] == "Blue"
+    assert product['attributes']['fabric'] == "Lawn"
+    assert product['attributes']['Main Attributes'] == {'Fabric': 'Lawn', 'Pieces': '2 Piece'}
+    assert product['attributes']['details_text'].startswith("Colour: Blue\nFabric: Lawn")
+    assert product['raw_data'] == {'pid': "U2PE24V21-1-BLU", 'master_id': "U2PE24V21-1"}
+
+
+def test_grid_paging_and_product_hydration():
+    scraper = scraper_with({
+        "Product-Variation": Response(data=variation()),
+        "start=0": Response(tile("U2PE24V21-1-BLU") + tile("U2PE24V21-2-RED")),
+        "start=48": Response(tile("U2PE24V21-2-RED") + tile("U2PE24V21-3-GRN")),
+        "start=96": Response(""),
+        "/women/unstitched": Response(CATEGORY_PAGE),
+    })
+
+    async def run():
+        links = await scraper.scrape_products_links(BASE + "/women/unstitched")
+        return links, await scraper.scrape_pdp(links[0])
+
+    links, product = asyncio.run(run())
+    assert links == [BASE + f"/women/unstitched/{pid}.html" for pid in ("U2PE24V21-1-BLU", "U2PE24V21-2-RED", "U2PE24V21-3-GRN")]
+    assert scraper.controller_base == BASE + CONTROLLER
+    # The controller came from the category page: no product page was fetched to find it.
+    assert not any(url.endswith(".html") for url in scraper.requests_made)
+    assert scraper.requests_made[-1] == BASE + CONTROLLER + "Product-Variation?pid=U2PE24V21-1-BLU&quantity=1"
+
+    assert product['title'] == "2 Piece - Printed Lawn Suit"
+    assert product['category'] == "Unstitched"
+    assert product['attributes']['breadcrumb'] == ["Home", "Women", "Unstitched"]
+    assert product['product_url'] == links[0]
+
+
+def test_unresolved_products_are_skipped():
+    scraper = scraper_with({"Product-Variation": Response(data={'product': None})})
+    scraper.controller_base = BASE + CONTROLLER
+    assert asyncio.run(scraper.scrape_pdp(BASE + "/women/no-product-id")) is None
+    assert asyncio.run(scraper.scrape_pdp(BASE + "/women/unstitched/GONE.html")) is None
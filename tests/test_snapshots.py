@@ -0,0 +1,33 @@
+import json
+from utils.snapshots import SnapshotWriter, iter_records
+from utils.variants import VariantMatrix
+
+
+def sized_variants():
+    matrix = VariantMatrix(fields=('price',))
+    for colour in ('Red', 'Blue'):
+        for size in ('S', 'M', 'L'):
+            matrix.add({'colour': colour, 'size': size}, size != 'L', price=1500.0)
+    return matrix.to_list()
+
+
+def test_snapshot_stores_compact_variants_and_reads_them_back(tmp_path):
+    records = [
+        {'product_url': 'https://x.pk/a', 'variants': sized_variants(), 'title': 'A'},
+        # 1500 would come back as 1500.0, so these stay as they are.
+        {'product_url': 'https://x.pk/b', 'variants': [{'size': 'S', 'availability': True, 'price': 1500}] * 4},
+    ]
+    path = str(tmp_path / "store.jsonl")
+    writer = SnapshotWriter(path)
+    for record in records:
+        # write() normalizes prices in place; the copies read back must match that.
+        writer.write(record)
+    writer.publish()
+
+    lines = [json.loads(line) for line in open(path)]
+    assert 'variants_compact' in lines[0] and 'variants' not in lines[0]
+    assert 'variants' in lines[1] and 'variants_compact' not in lines[1]
+    read = list(iter_records(path))
+    assert [list(record) for record in read] == [list(record) for record in records]
+    assert read == records
+    assert isinstance(read[1]['variants'][0]['price'], int)
@@ -0,0 +1,62 @@
+import json
+import asyncio
+from scrapers.speedsports.scraper import SpeedSportsScraper
+
+PRODUCT = {
+    "title": "Running Shoe",
+    "options": ["Size", "Color"],
+    "images": ["//cdn.shopify.com/s/files/shoe-1.jpg", "//cdn.shopify.com/s/files/shoe-2.jpg"],
+    "variants": [
+        {"title": "40 / Black", "options": ["40", "Black"], "sku": "RS-40", "price": 799900,
+         "compare_at_price": 999900, "available": False},
+        {"title": "41 / Black", "options": ["41", "Black"], "sku": "RS-41", "price": 799900,
+         "compare_at_price": 999900, "available": True},
+    ],
+}
+LD_JSON = {"@type": "Product", "name": "Running Shoe", "brand": {"name": "Speed"}, "description": "Light\nshoe"}
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+
+def scrape(page, parse_html=None):
+    scraper = SpeedSportsScraper(request_delay=0)
+
+    async def fake_request(url, *args, **kwargs):
+        return Response(page)
+
+    scraper.async_make_request = fake_request
+    if parse_html is not None:
+        scraper.parse_html = parse_html
+    return asyncio.run(scraper.scrape_pdp("https://speedsports.pk/products/running-shoe"))
+
+
+def test_product_json_pages_skip_the_dom():
+    page = (f'<script type="application/ld+json">{json.dumps(LD_JSON)}</script>'
+            f'<script>var product = {json.dumps(PRODUCT)};</script>')
+
+    def no_dom(*args, **kwargs):
+        raise AssertionError("the DOM was built")
+
+    record = scrape(page, no_dom)
+
+    assert (record['title'], record['sku'], record['brand'], record['description']) == \
+        ('Running Shoe', 'RS-41', 'Speed', 'Light shoe')
+    assert (record['original_price'], record['sale_price']) == ('9999', '7999')
+    assert record['images'] == ["https://cdn.shopify.com/s/files/shoe-1.jpg", "https://cdn.shopify.com/s/files/shoe-2.jpg"]
+    assert record['variants'][1] == {'title': '41 / Black', 'price': 7999.0, 'sku': 'RS-41', 'availability': True,
+                                     'Size': '41', 'Color': 'Black'}
+
+
+def test_pages_without_product_json_fall_back_to_the_dom():
+    page = """
+    <h1 class="t4s-product__title">Running Shoe</h1>
+    <div class="t4s-product-price">Rs.7,999</div>
+    <div data-product-single-media-group><div data-main-slide><img data-master="//cdn.shopify.com/a.jpg"></div></div>
+    """
+    record = scrape(page)
+
+    assert (record['title'], record['original_price'], record['sale_price']) == ('Running Shoe', '7999', None)
+    assert record['images'] == ["https://cdn.shopify.com/a.jpg"]
@@ -0,0 +1,71 @@
+import time
+import pytest
+from utils.work_queue import LocalWorkQueue, SQLiteWorkQueue
+
+TIMEOUT = 0.2
+
+
+@pytest.fixture(params=["local", "sqlite"])
+def queue(request, tmp_path):
+    if request.param == "local":
+        queue = LocalWorkQueue(visibility_timeout=TIMEOUT)
+    else:
+        queue = SQLiteWorkQueue(str(tmp_path / "queue.db"), visibility_timeout=TIMEOUT)
+    yield queue
+    queue.close()
+
+
+def test_lease_ack(queue):
+    task_id = queue.enqueue({'url': 'a'}, dedupe_key='a')
+    assert queue.enqueue({'url': 'a'}, dedupe_key='a') is None
+    assert queue.lease('w1') == (task_id, {'url': 'a'})
+    assert queue.lease('w2') is None
+    assert queue.ack(task_id, 'w1')
+    assert queue.pending() == 0
+    assert queue.lease('w2') is None
+
+
+def test_expired_lease_is_leased_again_and_late_ack_is_ignored(queue):
+    task_id = queue.enqueue({'url': 'a'})
+    assert queue.lease('w1')[0] == task_id
+    time.sleep(TIMEOUT * 1.5)
+    assert queue.lease('w2')[0] == task_id
+
+    # w1's lease expired: its ack and extend must not touch w2's lease.
+    assert not queue.ack(task_id, 'w1')
+    queue.extend(task_id, 'w1')
+    assert queue.pending() == 1
+    assert queue.lease('w3') is None
+
+    assert queue.ack(task_id, 'w2')
+    assert queue.pending() == 0
+    time.sleep(TIMEOUT * 1.5)
+    assert queue.lease('w3') is None
+
+
+def test_extend_keeps_the_lease(queue):
+    task_id = queue.enqueue({'url': 'a'})
+    queue.lease('w1')
+    for _ in range(3):
+        time.sleep(TIMEOUT / 2)
+        queue.extend(task_id, 'w1')
+    assert queue.lease('w2') is None
+    assert queue.ack(task_id, 'w1')
+
+
+def test_release_and_reset(queue):
+    task_id = queue.enqueue({'url': 'a'}, dedupe_key='a')
+    queue.lease('w1')
+    queue.release(task_id, 'w2')
+    assert queue.lease('w2') is None
+    queue.release(task_id, 'w1')
+    assert queue.lease('w2')[0] == task_id
+
+    queue.put_result('store', 'a', {'title': 'A'})
+    queue.add_membership('store', 'a', 'c1')
+    queue.add_membership('store', 'a', 'c1')
+    queue.add_membership('store', 'a', 'c2')
+    assert queue.results('store') == [({'title': 'A'}, ['c1', 'c2'])]
+    queue.reset()
+    assert queue.results('store') == [] and queue.pending() == 0
+    assert queue.enqueue({'url': 'a'}, dedupe_key='a') is not None
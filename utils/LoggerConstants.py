@@ -28,6 +28,8 @@ HUSHPUPPIES_LOGGER = "hushpuppies"
 Ego_LOGGER = "ego"
 IMAGE_LOGGER = "image"
 GENERATION_LOGGER = "generation_logger"
+AMIR_ADNAN = "amiradnan"
+DISTRIBUTED_LOGGER = "distributed"
 
 
 
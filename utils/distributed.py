@@ -0,0 +1,143 @@
+import os
+import time
+import socket
+import asyncio
+import logging
+from utils.url_utils import ProductFrontier, canonicalize_url
+from utils.listing import listing_entry, fill_missing, mark_fetched
+from utils.LoggerConstants import DISTRIBUTED_LOGGER
+
+MAX_TASK_RETRIES = 3
+
+logger = logging.getLogger(DISTRIBUTED_LOGGER)
+
+
+def scraper_key(scraper):
+    return type(scraper).__name__
+
+
+async def enqueue_stores(queue, scrapers):
+    total = 0
+    for scraper in scrapers:
+        category_urls = await scraper.get_unique_urls_from_file(
+            os.path.join(scraper.module_dir, "categories.txt")
+        )
+        for url in category_urls:
+            task = {'kind': 'category', 'scraper': scraper_key(scraper), 'url': url}
+            if queue.enqueue(task, dedupe_key=f"category:{scraper_key(scraper)}:{url}"):
+                total += 1
+    logger.info(f"Enqueued {total} category tasks for {len(scrapers)} stores")
+    return total
+
+
+async def run_category_task(queue, scraper, task):
+    category_url = task['url']
+    policy = scraper.pdp_policy
+    if policy.path is None:
+        policy.load(scraper.snapshot_path(), scraper.base_url)
+    product_links = await scraper.scrape_products_links(category_url)
+    for entry in product_links:
+        product_link, partial = listing_entry(entry)
+        product_key = canonicalize_url(product_link, scraper.base_url)
+        queue.add_membership(scraper.store_name, product_key, category_url)
+        if not policy.needs_pdp(product_key, partial):
+            queue.put_result(scraper.store_name, product_key, policy.merge(product_key, partial))
+            continue
+        pdp_task = {'kind': 'pdp', 'scraper': task['scraper'], 'url': product_link, 'key': product_key}
+        if partial is not None:
+            pdp_task['partial'] = partial
+        queue.enqueue(pdp_task, dedupe_key=f"pdp:{task['scraper']}:{product_key}")
+
+
+async def run_pdp_task(queue, scraper, task):
+    # The queue already guarantees one PDP task per canonical product, so the
+    # scraper's own frontier must not swallow a re-leased task in this process.
+    scraper.frontier = ProductFrontier()
+    pdp_data = await scraper.scrape_pdp(task['url'])
+    if pdp_data is not None and 'error' not in pdp_data:
+        mark_fetched(pdp_data)
+        if task.get('partial'):
+            fill_missing(pdp_data, task['partial'])
+    if pdp_data is not None:
+        queue.put_result(scraper.store_name, task['key'], pdp_data)
+
+
+TASK_HANDLERS = {
+    'category': run_category_task,
+    'pdp': run_pdp_task,
+}
+
+
+async def _keep_lease(queue, task_id, worker_id):
+    interval = max(1, queue.visibility_timeout / 3)
+    while True:
+        await asyncio.sleep(interval)
+        queue.extend(task_id, worker_id)
+
+
+async def run_worker(queue, scrapers, worker_id=None, idle_timeout=60, poll_interval=2):
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    by_name = {scraper_key(scraper): scraper for scraper in scrapers}
+    idle_since = time.monotonic()
+    completed = 0
+
+    while True:
+        leased = queue.lease(worker_id)
+        if leased is None:
+            if queue.pending() == 0 and time.monotonic() - idle_since >= idle_timeout:
+                break
+            await asyncio.sleep(poll_interval)
+            continue
+
+        task_id, task = leased
+        scraper = by_name.get(task.get('scraper'))
+        handler = TASK_HANDLERS.get(task.get('kind'))
+        if scraper is None or handler is None:
+            logger.error(f"Worker {worker_id} cannot run task {task}")
+            queue.ack(task_id, worker_id)
+            continue
+
+        heartbeat = asyncio.create_task(_keep_lease(queue, task_id, worker_id))
+        try:
+            await handler(queue, scraper, task)
+        except Exception as e:
+            logger.error(f"Task {task_id} failed on {worker_id}: {e}", exc_info=True)
+            if task.get('retries', 0) < MAX_TASK_RETRIES:
+                queue.enqueue(dict(task, retries=task.get('retries', 0) + 1))
+        finally:
+            heartbeat.cancel()
+        if not queue.ack(task_id, worker_id):
+            logger.warning(f"Lease of task {task_id} expired before {worker_id} finished it")
+        completed += 1
+        idle_since = time.monotonic()
+
+    logger.info(f"Worker {worker_id} finished after {completed} tasks")
+    return completed
+
+
+async def merge_results(queue, scrapers):
+    saved = {}
+    for scraper in scrapers:
+        writer = scraper.open_snapshot()
+        try:
+            for record, categories in queue.results(scraper.store_name):
+                record['categories'] = categories
+                writer.write(record)
+        finally:
+            writer.close()
+        if writer.count:
+            saved[scraper.store_name] = scraper.publish_snapshot(writer)
+            scraper.log_info(f"Merged {writer.count} products from the work queue")
+        else:
+            os.remove(writer.partial_path)
+    return saved
+
+
+async def run_coordinator(queue, scrapers, poll_interval=10):
+    # Tasks, dedupe keys and results of the previous run would otherwise block this
+    # run's enqueues and be merged again as fresh data.
+    queue.reset()
+    await enqueue_stores(queue, scrapers)
+    while queue.pending():
+        await asyncio.sleep(poll_interval)
+    return await merge_results(queue, scrapers)
@@ -0,0 +1,82 @@
+import re
+import json
+import html
+import functools
+
+SCRIPT_RE = re.compile(r'<script\b([^>]*)>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+WHITESPACE_RE = re.compile(r'\s*')
+ATTR_RE = re.compile(r'([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+
+_decoder = json.JSONDecoder()
+
+
+class ScriptBlock:
+    __slots__ = ("attrs", "body")
+
+    def __init__(self, attrs, body):
+        self.attrs = attrs
+        self.body = body
+
+    @property
+    def classes(self):
+        return self.attrs.get("class", "").split()
+
+    @property
+    def type(self):
+        return self.attrs.get("type", "").lower()
+
+
+def _parse_attrs(raw):
+    attrs = {}
+    for match in ATTR_RE.finditer(raw):
+        value = next((group for group in match.groups()[1:] if group is not None), "")
+        attrs[match.group(1).lower()] = html.unescape(value)
+    return attrs
+
+
+class EmbeddedJSON:
+    """JSON blocks embedded in a page, found by one scan of the raw markup without building a DOM."""
+
+    def __init__(self, markup):
+        if isinstance(markup, bytes):
+            markup = markup.decode("utf-8", errors="replace")
+        self.scripts = [
+            ScriptBlock(_parse_attrs(match.group(1)), match.group(2))
+            for match in SCRIPT_RE.finditer(markup)
+        ]
+
+    def by_class(self, class_name, default=None):
+        for script in self.scripts:
+            if class_name in script.classes:
+                return self.decode(script.body, default)
+        return default
+
+    def script_containing(self, marker):
+        for script in self.scripts:
+            if marker in script.body:
+                return script.body
+        return None
+
+    def variable(self, name, default=None):
+        # raw_decode stops at the end of the literal, so trailing code is ignored.
+        pattern = _assignment_re(name)
+        for script in self.scripts:
+            if name not in script.body:
+                continue
+            match = pattern.search(script.body)
+            if match:
+                return self.decode(script.body, default, start=match.end())
+        return default
+
+    @staticmethod
+    def decode(text, default=None, start=0):
+        try:
+            return _decoder.raw_decode(text, WHITESPACE_RE.match(text, start).end())[0]
+        except (ValueError, TypeError, AttributeError):
+            return default
+
+
+@functools.lru_cache(maxsize=None)
+def _assignment_re(name):
+    # `var name = {...}`, `window.name = [...]` and friends.
+    return re.compile(r'(?:\bvar\s+|\blet\s+|\bconst\s+|\bwindow\.)' + re.escape(name) + r'\s*=\s*')
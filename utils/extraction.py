@@ -0,0 +1,109 @@
+import logging
+from utils.patterns import selector
+
+logger = logging.getLogger(__name__)
+
+
+class Field:
+    """One value of a product record, taken from the first selector that yields something.
+
+    ``attr`` may be a single attribute name or a tuple tried in order; without it the
+    node's text is used, and ``node=True`` returns the matched element itself. ``post``
+    runs on the extracted value (or list, with ``many=True``) and a missing value never
+    reaches it. ``within`` limits the search to the first element it matches, and a
+    field without selectors reads the root element itself, as ``Items`` fields do.
+    """
+
+    __slots__ = ("selectors", "compiled", "within", "attr", "node", "many", "unique", "post", "default",
+                 "separator", "strip")
+
+    def __init__(self, *selectors, within=None, attr=None, node=False, many=False, unique=False, post=None,
+                 default=None, separator="", strip=True):
+        self.selectors = selectors
+        self.compiled = [selector(source) for source in selectors]
+        self.within = selector(within) if within else None
+        self.attr = (attr,) if isinstance(attr, str) else attr
+        self.node = node
+        self.many = many
+        self.unique = unique
+        self.post = post
+        self.default = default
+        self.separator = separator
+        self.strip = strip
+
+    def _value(self, element):
+        if self.node:
+            return element
+        if self.attr:
+            for name in self.attr:
+                value = element.get(name)
+                if isinstance(value, str):
+                    value = value.strip()
+                if value:
+                    return value
+            return None
+        return element.get_text(self.separator, strip=self.strip) or None
+
+    def _select(self, root, index):
+        compiled = self.compiled[index]
+        return compiled.select(root) if self.many else compiled.select_one(root)
+
+    def extract(self, root):
+        if self.within is not None:
+            root = self.within.select_one(root)
+            if root is None:
+                return None
+        if not self.selectors:
+            value = self._value(root)
+            return [value] if self.many and value is not None else value
+        for index in range(len(self.selectors)):
+            found = self._select(root, index)
+            if self.many:
+                values = [value for value in map(self._value, found) if value is not None]
+                if self.unique:
+                    values = list(dict.fromkeys(values))
+                if values:
+                    return values
+            elif found is not None:
+                value = self._value(found)
+                if value is not None:
+                    return value
+        return None
+
+
+class Items(Field):
+    """Every element the selectors match, each read into a dict by ``fields`` relative to it."""
+
+    __slots__ = ("spec",)
+
+    def __init__(self, *selectors, within=None, post=None, default=None, **fields):
+        super().__init__(*selectors, within=within, many=True, post=post, default=default)
+        self.spec = ExtractionSpec(**fields)
+
+    def _value(self, element):
+        return self.spec.extract(element)
+
+
+class ExtractionSpec:
+    """Named fields compiled once, usually as a scraper class attribute.
+
+    Specs cover what a store reads from the DOM. Data a page embeds as JSON is read
+    with EmbeddedJSON and JsonLD instead, and combining fields into the record (price
+    fallbacks, option cross products) stays in the store's parser.
+    """
+
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def extract(self, root, name=None):
+        results = {}
+        for field_name, field in self.fields.items():
+            value = field.extract(root)
+            if value is not None and field.post is not None:
+                try:
+                    value = field.post(value)
+                except Exception as e:
+                    logger.debug(f"{name or 'spec'}: post-processing {field_name!r} failed: {e}")
+                    value = None
+            results[field_name] = field.default if value is None else value
+        return results
@@ -0,0 +1,164 @@
+import os
+import re
+import hashlib
+from datetime import datetime
+from utils.url_utils import canonicalize_url
+from utils.snapshots import COMPRESSIONS, HAS_ZSTD, dumps_line, iter_records, open_compressed, replace_durably
+
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+ENTRY_RE = re.compile(r'^(?P<timestamp>\d{8}_\d{6}(?:_\d+)?)\.(?P<kind>base|delta)\.jsonl(?:\.gz|\.zst)?$')
+# Full copies oldjsondata held before snapshots were kept as deltas: <store>_<timestamp>.json*
+LEGACY_RE = re.compile(r'^(?P<store>.+)_(?P<timestamp>\d{8}_\d{6})\.json(?:l(?:\.gz|\.zst)?)?$')
+
+
+def record_key(record):
+    """Identity of a record across runs: canonical product URL, else SKU, else its content."""
+    url = record.get('product_url') or record.get('product_link')
+    if url:
+        return canonicalize_url(url)
+    if record.get('sku'):
+        return f"sku:{record['sku']}"
+    return "hash:" + hashlib.blake2b(dumps_line(record), digest_size=16).hexdigest()
+
+
+def keyed_records(records):
+    # Two records with the same key in one snapshot (say, an error and a retry) both survive.
+    seen = {}
+    for record in records:
+        key = record_key(record)
+        seen[key] = seen.get(key, 0) + 1
+        yield (key if seen[key] == 1 else f"{key}#{seen[key]}"), record
+
+
+def run_order(timestamp):
+    # Runs within the same second get _2, _3, ... suffixes, which must not sort as text.
+    return timestamp[:15], int(timestamp[16:] or 1)
+
+
+def record_patch(old, new):
+    """``(set, unset)`` turning ``old`` into ``new`` field by field, or None when they are equal."""
+    changed = {field: value for field, value in new.items() if field not in old or old[field] != value}
+    removed = [field for field in old if field not in new]
+    if not changed and not removed:
+        return None
+    return changed, removed
+
+
+class SnapshotHistory:
+    """One store's snapshot history as full bases followed by per-run deltas.
+
+    ``oldjsondata/<store>/<timestamp>.base.jsonl.zst`` (``.gz`` without zstandard) holds every
+    record of a run and each later ``<timestamp>.delta.jsonl.zst`` only the records added,
+    removed or changed (as changed fields) since the run before, keyed by :func:`record_key`.
+    Every ``compact_every`` runs, or once the deltas outgrow their base, a run is stored as
+    a new base instead, so reconstructing any snapshot reads one base and a bounded chain.
+    """
+
+    def __init__(self, directory, compression=None, compact_every=30):
+        self.directory = directory
+        self.compression = compression or ("zstd" if HAS_ZSTD else "gzip")
+        self.compact_every = compact_every
+
+    def entries(self):
+        """``(timestamp, kind, path)`` of every stored run, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        found = []
+        for filename in os.listdir(self.directory):
+            match = ENTRY_RE.match(filename)
+            if match:
+                found.append((match['timestamp'], match['kind'], os.path.join(self.directory, filename)))
+        return sorted(found, key=lambda entry: run_order(entry[0]))
+
+    def _chain(self, at=None):
+        # The newest base at or before ``at`` and the deltas that follow it up to ``at``.
+        chain = []
+        for entry in self.entries():
+            if at is not None and entry[0][:15] > at:
+                break
+            chain = [entry] if entry[1] == 'base' else chain + [entry]
+        return chain
+
+    def state(self, at=None):
+        """``{key: record}`` of the snapshot stored at ``at`` (a timestamp), default the latest."""
+        records = {}
+        for _, kind, path in self._chain(at):
+            for entry in iter_records(path):
+                if kind == 'base':
+                    records[entry['key']] = entry['record']
+                elif entry['op'] == 'add':
+                    records[entry['key']] = entry['record']
+                elif entry['op'] == 'remove':
+                    records.pop(entry['key'], None)
+                else:
+                    record = records[entry['key']]
+                    record.update(entry['set'])
+                    for field in entry['unset']:
+                        record.pop(field, None)
+        return records
+
+    def reconstruct(self, at=None):
+        return list(self.state(at).values())
+
+    def _write(self, timestamp, kind, lines):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{timestamp}.{kind}.jsonl{COMPRESSIONS[self.compression]}")
+        temp_path = path + '.tmp'
+        with open_compressed(temp_path, 'w', self.compression) as f:
+            for line in lines:
+                f.write(dumps_line(line))
+        replace_durably(temp_path, path)
+        return path
+
+    def _timestamp(self, when):
+        timestamp = (when or datetime.now()).strftime(TIMESTAMP_FORMAT)
+        taken = {entry[0] for entry in self.entries()}
+        suffix, unique = 1, timestamp
+        while unique in taken:
+            suffix += 1
+            unique = f"{timestamp}_{suffix}"
+        return unique
+
+    def record(self, snapshot_path, when=None):
+        """Add the snapshot at ``snapshot_path`` as the run at ``when`` (default now).
+
+        A run older than stored ones may only go right before a base, where the chain
+        restarts anyway; anywhere else it would change what the next delta applies to.
+        Returns the file written.
+        """
+        timestamp = self._timestamp(when)
+        at = timestamp[:15]
+        later = [entry for entry in self.entries() if run_order(entry[0]) > run_order(timestamp)]
+        if later and later[0][1] != 'base':
+            raise ValueError(f"A run at {timestamp} would break the delta chain of {later[0][0]}")
+        chain = self._chain(at)
+        if not chain or len(chain) > self.compact_every or self._deltas_outgrew_base(chain):
+            return self._write(timestamp, 'base', (
+                {'key': key, 'record': record} for key, record in keyed_records(iter_records(snapshot_path))
+            ))
+
+        previous = self.state(at)
+        delta = []
+        for key, record in keyed_records(iter_records(snapshot_path)):
+            old = previous.pop(key, None)
+            if old is None:
+                delta.append({'op': 'add', 'key': key, 'record': record})
+                continue
+            patch = record_patch(old, record)
+            if patch is not None:
+                delta.append({'op': 'change', 'key': key, 'set': patch[0], 'unset': patch[1]})
+        delta.extend({'op': 'remove', 'key': key} for key in previous)
+        return self._write(timestamp, 'delta', delta)
+
+    def _deltas_outgrew_base(self, chain):
+        base_size = os.path.getsize(chain[0][2])
+        return sum(os.path.getsize(path) for _, _, path in chain[1:]) > base_size
+
+    def compact(self, when=None):
+        """Store the latest snapshot as a new base so it no longer depends on older files."""
+        records = self.state()
+        if not records:
+            return None
+        return self._write(self._timestamp(when), 'base', (
+            {'key': key, 'record': record} for key, record in records.items()
+        ))
@@ -0,0 +1,344 @@
+import re
+import logging
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.filter import ElementFilter
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+RAW_TEXT_TAGS = {"script", "style", "template", "textarea"}
+
+logger = logging.getLogger(__name__)
+_warned_backends = set()
+
+
+def resolve_backend(backend):
+    if backend == "selectolax" and not HAS_SELECTOLAX:
+        fallback = "lxml" if HAS_LXML else "html.parser"
+    elif backend == "lxml" and not HAS_LXML:
+        fallback = "html.parser"
+    elif backend not in PARSER_BACKENDS:
+        fallback = "html.parser"
+    else:
+        return backend
+    if backend not in _warned_backends:
+        _warned_backends.add(backend)
+        logger.warning(f"HTML parser backend {backend!r} is unavailable, falling back to {fallback!r}")
+    return fallback
+
+
+def class_rule(expected):
+    """Match ``class`` like find_all does, on any one of the element's classes.
+
+    While parsing, a SoupStrainer sees ``class`` as the raw attribute string, so a plain
+    ``class_='product-items'`` misses ``class="products list items product-items"``.
+    A string of several classes needs all of them; a list needs any of its entries.
+    """
+    if isinstance(expected, str):
+        wanted = expected.split()
+        return lambda value: bool(value) and all(name in value.split() for name in wanted)
+    if isinstance(expected, (list, tuple, set)):
+        rules = [class_rule(value) for value in expected]
+        return lambda value: any(rule(value) for rule in rules)
+    return expected
+
+
+class RegionFilter(ElementFilter):
+    """parse_only filter that keeps every subtree matching any of the regions."""
+
+    def __init__(self, regions):
+        super().__init__()
+        self.strainers = [SoupStrainer(**self._region(region)) for region in regions]
+
+    @staticmethod
+    def _region(region):
+        region = dict(region)
+        if 'class_' in region:
+            region['class_'] = class_rule(region['class_'])
+        if isinstance(region.get('attrs'), dict) and 'class' in region['attrs']:
+            region['attrs'] = dict(region['attrs'], **{'class': class_rule(region['attrs']['class'])})
+        return region
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+
+    def allow_string_creation(self, string):
+        return any(strainer.allow_string_creation(string) for strainer in self.strainers)
+
+    def match(self, element, _known_rules=False):
+        return any(strainer.match(element, _known_rules) for strainer in self.strainers)
+
+
+def slice_markup(markup, slices):
+    parts = []
+    for start_marker, end_marker in slices:
+        start = markup.find(start_marker)
+        if start < 0:
+            continue
+        end = markup.find(end_marker, start + len(start_marker)) if end_marker else -1
+        parts.append(markup[start:end + len(end_marker) if end >= 0 else len(markup)])
+    return "".join(parts) if parts else markup
+
+
+def parse_html(markup, backend="html.parser", regions=None, slices=None):
+    """Parse markup, optionally building only the subtrees a scraper reads.
+
+    ``regions`` are SoupStrainer keyword dicts, e.g. ``{"name": "div", "class_": "product-grid"}``.
+    ``slices`` are ``(start_marker, end_marker)`` pairs cut out of the raw markup before parsing.
+    """
+    backend = resolve_backend(backend)
+    if slices:
+        markup = slice_markup(markup, slices)
+    if backend == "selectolax":
+        return FastDocument(markup, regions)
+    if regions:
+        return BeautifulSoup(markup, backend, parse_only=RegionFilter(regions))
+    return BeautifulSoup(markup, backend)
+
+
+def _class_matches(node_classes, expected):
+    if isinstance(expected, (list, tuple, set)):
+        return any(_class_matches(node_classes, value) for value in expected)
+    if isinstance(expected, str):
+        return expected in node_classes or expected == " ".join(node_classes)
+    return _value_matches(" ".join(node_classes) if node_classes else None, expected)
+
+
+def _criteria(attrs, class_, kwargs):
+    # find_all()'s ways of naming attributes, as one attribute -> expected value dict.
+    criteria = dict(attrs) if isinstance(attrs, dict) else {}
+    if isinstance(attrs, str):
+        criteria["class"] = attrs
+    if class_ is not None:
+        criteria["class"] = class_
+    criteria.update({key.rstrip("_"): value for key, value in kwargs.items()})
+    return criteria
+
+
+def _value_matches(value, expected):
+    if expected is True:
+        return value is not None
+    if expected is None or expected is False:
+        return value is None
+    if value is None:
+        return False
+    if callable(expected):
+        return bool(expected(value))
+    if isinstance(expected, re.Pattern):
+        return expected.search(value) is not None
+    if isinstance(expected, (list, tuple, set)):
+        return value in expected
+    return value == expected
+
+
+class FastNode:
+    """BeautifulSoup-compatible view of a selectolax node for the subset our scrapers use."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def name(self):
+        return self._node.tag
+
+    @property
+    def attrs(self):
+        attrs = {}
+        for key, value in self._node.attributes.items():
+            attrs[key] = value.split() if key == "class" and value is not None else ("" if value is None else value)
+        return attrs
+
+    def get(self, key, default=None):
+        value = self._node.attributes.get(key, default)
+        if key == "class" and isinstance(value, str):
+            return value.split()
+        if value is None and key in self._node.attributes:
+            return ""
+        return value
+
+    def __getitem__(self, key):
+        if key not in self._node.attributes:
+            raise KeyError(key)
+        return self.get(key)
+
+    def has_attr(self, key):
+        return key in self._node.attributes
+
+    def __eq__(self, other):
+        return isinstance(other, FastNode) and self._node == other._node
+
+    def __hash__(self):
+        return hash(self._node.mem_id)
+
+    def __repr__(self):
+        return self._node.html or ""
+
+    @property
+    def parent(self):
+        parent = self._node.parent
+        return FastNode(parent) if parent is not None else None
+
+    @property
+    def children(self):
+        return [FastNode(child) for child in self._node.iter(include_text=False)]
+
+    def get_text(self, separator="", strip=False):
+        return self._node.text(deep=True, separator=separator, strip=strip)
+
+    @property
+    def text(self):
+        return self.get_text()
+
+    @property
+    def string(self):
+        if self._node.tag in RAW_TEXT_TAGS:
+            return self._node.text(deep=True)
+        children = list(self._node.iter(include_text=True))
+        if len(children) != 1:
+            return None
+        child = children[0]
+        if child.tag == "-text":
+            return child.text_content
+        return FastNode(child).string
+
+    @property
+    def stripped_strings(self):
+        for text_node in self._node.traverse(include_text=True):
+            if text_node.tag == "-text":
+                text = (text_node.text_content or "").strip()
+                if text:
+                    yield text
+
+    def select(self, selector):
+        return [FastNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector):
+        node = self._node.css_first(selector)
+        return FastNode(node) if node is not None else None
+
+    def _candidates(self, recursive):
+        if not recursive:
+            return self._node.iter(include_text=False)
+        nodes = self._node.traverse(include_text=False)
+        next(nodes, None)
+        return nodes
+
+    def _matches(self, node, name, attrs, string):
+        if name is not None and name is not True:
+            names = name if isinstance(name, (list, tuple, set)) else [name]
+            if node.tag not in names:
+                return False
+        node_attrs = node.attributes
+        for key, expected in attrs.items():
+            if key == "class":
+                classes = (node_attrs.get("class") or "").split() if "class" in node_attrs else []
+                if not _class_matches(classes, expected):
+                    return False
+            else:
+                value = node_attrs.get(key)
+                if value is None and key in node_attrs:
+                    value = ""
+                if not _value_matches(value, expected):
+                    return False
+        if string is not None and not _value_matches(FastNode(node).string, string):
+            return False
+        return True
+
+    def find_all(self, name=None, attrs=None, recursive=True, string=None, limit=None, class_=None, **kwargs):
+        if "text" in kwargs:
+            string = kwargs.pop("text")
+        criteria = _criteria(attrs, class_, kwargs)
+
+        found = []
+        for node in self._candidates(recursive):
+            if self._matches(node, name, criteria, string):
+                found.append(FastNode(node))
+                if limit and len(found) >= limit:
+                    break
+        return found
+
+    def find(self, name=None, attrs=None, recursive=True, string=None, **kwargs):
+        found = self.find_all(name, attrs, recursive, string, limit=1, **kwargs)
+        return found[0] if found else None
+
+    __call__ = find_all
+
+
+class FastDocument(FastNode):
+    """A parsed page; with ``regions`` only the outermost matching subtrees are searched,
+    as with the SoupStrainer the other backends parse with."""
+
+    __slots__ = ("tree", "roots")
+
+    def __init__(self, markup, regions=None):
+        self.tree = LexborHTMLParser(markup)
+        super().__init__(self.tree.root)
+        self.roots = self._region_roots(regions) if regions else None
+
+    def _region_roots(self, regions):
+        rules = []
+        for region in regions:
+            region = RegionFilter._region(region)
+            name, string = region.pop("name", None), region.pop("string", None)
+            rules.append((name, _criteria(region.pop("attrs", None), region.pop("class_", None), region), string))
+        roots = []
+        stack = [self.tree.root.iter(include_text=False)]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+            elif any(self._matches(node, name, criteria, string) for name, criteria, string in rules):
+                roots.append(node)
+            else:
+                stack.append(node.iter(include_text=False))
+        return roots
+
+    def _candidates(self, recursive):
+        # Unlike elements, the document itself includes <html> in its search.
+        if self.roots is not None:
+            if not recursive:
+                return iter(self.roots)
+            return (node for root in self.roots for node in root.traverse(include_text=False))
+        if not recursive:
+            return iter([self.tree.root])
+        return self.tree.root.traverse(include_text=False)
+
+    @property
+    def children(self):
+        if self.roots is not None:
+            return [FastNode(root) for root in self.roots]
+        return super().children
+
+    def get_text(self, separator="", strip=False):
+        if self.roots is not None:
+            return separator.join(root.text(deep=True, separator=separator, strip=strip) for root in self.roots)
+        return super().get_text(separator, strip)
+
+    @property
+    def stripped_strings(self):
+        for root in self.roots if self.roots is not None else [self.tree.root]:
+            yield from FastNode(root).stripped_strings
+
+    def select(self, selector):
+        if self.roots is not None:
+            return [FastNode(node) for root in self.roots for node in root.css(selector)]
+        return [FastNode(node) for node in self.tree.css(selector)]
+
+    def select_one(self, selector):
+        if self.roots is not None:
+            found = self.select(selector)
+            return found[0] if found else None
+        node = self.tree.css_first(selector)
+        return FastNode(node) if node is not None else None
@@ -0,0 +1,156 @@
+import re
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Shopify serves resized copies as name_600x.jpg, name_grande.jpg, name_300x300_crop_center@2x.jpg, ...
+SHOPIFY_SIZE_RE = re.compile(
+    r'_(?:(?P<width>\d+)x(?P<height>\d*)|x(?P<only_height>\d+)'
+    r'|(?P<name>pico|icon|thumb|small|compact|medium|large|grande|original|master))'
+    r'(?:_crop_[a-z]+)?(?:@(?P<scale>\d)x)?(?=\.[a-z0-9]+$)',
+    re.IGNORECASE
+)
+# Longest side of Shopify's named sizes; original and master are the uploaded file.
+SHOPIFY_NAMED_SIZES = {
+    'pico': 16, 'icon': 32, 'thumb': 50, 'small': 100, 'compact': 160,
+    'medium': 240, 'large': 480, 'grande': 600, 'original': float('inf'), 'master': float('inf'),
+}
+SHOPIFY_PATH_MARKERS = ('/cdn/shop/', '/s/files/')
+# Query parameters that only pick a size or bust caches.
+SIZE_PARAMS = {'v', 'width', 'height', 'w', 'h', 'crop', 'format', 'quality'}
+DESCRIPTOR_RE = re.compile(r'^(\d+(?:\.\d+)?)([wx])$', re.IGNORECASE)
+
+
+def absolute_url(src, base_url=None):
+    if not src:
+        return None
+    src = src.strip()
+    if src.startswith('//'):
+        return 'https:' + src
+    if base_url and not src.startswith(('http://', 'https://')):
+        return urljoin(base_url, src)
+    return src
+
+
+def parse_srcset(srcset):
+    """Return ``(url, size)`` pairs; ``size`` is the w/x descriptor value, 0 when absent."""
+    candidates = []
+    for entry in (srcset or '').split(','):
+        parts = entry.split()
+        if not parts:
+            continue
+        size = 0.0
+        if len(parts) > 1:
+            match = DESCRIPTOR_RE.match(parts[1])
+            if match:
+                size = float(match.group(1))
+        candidates.append((parts[0], size))
+    return candidates
+
+
+def best_from_srcset(srcset):
+    best_url, best_size = None, -1.0
+    for url, size in parse_srcset(srcset):
+        if size > best_size:
+            best_url, best_size = url, size
+    return best_url
+
+
+def normalize_image_url(url, base_url=None):
+    """Absolute URL without size-picking or cache-busting query params.
+
+    The path is kept as is: a suffix such as ``_large`` may be part of the real file name.
+    """
+    url = absolute_url(url, base_url)
+    if not url or url.startswith('data:'):
+        return None
+    if '?' not in url:
+        return url
+
+    scheme, netloc, path, query, _ = urlsplit(url)
+    query = urlencode([(key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+                       if key.lower() not in SIZE_PARAMS])
+    return urlunsplit((scheme.lower(), netloc.lower(), path, query, ''))
+
+
+def image_key(url, base_url=None):
+    """Dedupe key of an image: its normalized URL with Shopify's size suffix removed.
+
+    Only for comparing URLs; the stripped form may not exist on the server.
+    """
+    url = normalize_image_url(url, base_url)
+    if not url:
+        return None
+    scheme, netloc, path, query, _ = urlsplit(url)
+    if any(marker in path for marker in SHOPIFY_PATH_MARKERS) or netloc.lower() == 'cdn.shopify.com':
+        path = SHOPIFY_SIZE_RE.sub('', path)
+    return urlunsplit((scheme.lower(), netloc.lower(), path, query, ''))
+
+
+def image_size(url, key):
+    """How large a copy of the image ``key`` the URL serves; the unsized original is the largest."""
+    if url == key:
+        return float('inf')
+    match = SHOPIFY_SIZE_RE.search(urlsplit(url).path)
+    if not match:
+        return 0
+    if match.group('name'):
+        return SHOPIFY_NAMED_SIZES[match.group('name').lower()]
+    side = max(int(match.group('width') or 0), int(match.group('height') or 0), int(match.group('only_height') or 0))
+    return side * int(match.group('scale') or 1)
+
+
+def image_from_tag(tag, attrs=('data-master', 'data-original-src', 'data-zoom', 'data-src', 'src')):
+    """Best image URL an <img> tag offers: the widest srcset candidate, then ``attrs`` in order."""
+    srcset = tag.get('srcset') or tag.get('data-srcset')
+    if srcset and ' ' in srcset.strip():
+        best = best_from_srcset(srcset)
+        if best:
+            return best
+    for attr in attrs:
+        value = tag.get(attr)
+        if value and value.strip():
+            return value
+    return srcset or None
+
+
+class ImageSet:
+    """Ordered, de-duplicated product images keyed by :func:`image_key`.
+
+    The URL kept for an image is the largest copy seen: the unsized original (one
+    whose path is its key) if it turns up, otherwise the widest Shopify size suffix.
+    """
+
+    __slots__ = ('base_url', '_urls')
+
+    def __init__(self, base_url=None):
+        self.base_url = base_url
+        self._urls = {}
+
+    def add(self, url):
+        url = normalize_image_url(url, self.base_url)
+        key = image_key(url)
+        if key is None:
+            return False
+        if key in self._urls:
+            if image_size(url, key) > image_size(self._urls[key], key):
+                self._urls[key] = url
+            return False
+        self._urls[key] = url
+        return True
+
+    def add_tag(self, tag, attrs=None):
+        return self.add(image_from_tag(tag, attrs) if attrs else image_from_tag(tag))
+
+    def add_srcset(self, srcset):
+        return self.add(best_from_srcset(srcset))
+
+    def __contains__(self, url):
+        return image_key(url, self.base_url) in self._urls
+
+    def __iter__(self):
+        return iter(self._urls.values())
+
+    def __len__(self):
+        return len(self._urls)
+
+    def to_list(self):
+        return list(self._urls.values())
@@ -0,0 +1,173 @@
+import re
+import json
+import html
+import logging
+from utils.embedded_json import EmbeddedJSON
+
+PRODUCT_TYPES = ('Product', 'ProductGroup')
+OFFER_TYPES = ('Offer', 'AggregateOffer')
+BREADCRUMB_TYPES = ('BreadcrumbList',)
+LD_TYPES = PRODUCT_TYPES + OFFER_TYPES + BREADCRUMB_TYPES
+
+# Well-formed stretches outside strings, taken in one match: anything but quotes and
+# commas, strings that are valid and properly closed, and commas that are not trailing.
+CLEAN_RE = re.compile(
+    r'(?:[^",]++'
+    r'|"(?:[^"\\\x00-\x1f]++|\\["\\/bfnrtu])*+"(?=\s*(?:[,:}\]]|$))'
+    r'|,(?!\s*[}\]]))*+'
+)
+# Inside a broken string the scan stops at quotes, escapes and raw control characters.
+INSIDE_RE = re.compile(r'["\\\x00-\x1f]')
+WHITESPACE_RE = re.compile(r'\s*')
+STRING_END = frozenset(',:}]')
+VALID_ESCAPES = frozenset('"\\/bfnrtu')
+CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+logger = logging.getLogger(__name__)
+
+
+def _next_char(text, pos):
+    pos = WHITESPACE_RE.match(text, pos).end()
+    return pos, text[pos] if pos < len(text) else ''
+
+
+def repair_json(text):
+    """Fix the JSON mistakes store themes make, in one left-to-right scan.
+
+    Drops trailing commas, escapes raw newlines and other control characters in
+    strings, drops the extra quote of ``"X"",`` and escapes quotes that cannot end
+    the string they are in because no ``,``, ``:``, ``}`` or ``]`` follows them.
+    """
+    out = []
+    pos = 0
+    in_string = False
+    while pos < len(text):
+        if not in_string:
+            end = CLEAN_RE.match(text, pos).end()
+            out.append(text[pos:end])
+            if end < len(text):
+                # Either a string that needs fixing or a trailing comma, which is dropped.
+                if text[end] == '"':
+                    in_string = True
+                    out.append('"')
+                pos = end + 1
+            else:
+                pos = end
+            continue
+
+        match = INSIDE_RE.search(text, pos)
+        if match is None:
+            out.append(text[pos:])
+            break
+        i = match.start()
+        char = text[i]
+        out.append(text[pos:i])
+        pos = i + 1
+
+        if char == '\\':
+            escaped = text[pos:pos + 1]
+            out.append(char + escaped if escaped in VALID_ESCAPES else ("'" if escaped == "'" else '\\\\' + escaped))
+            pos += 1
+        elif char != '"':
+            out.append(CONTROL_ESCAPES.get(char) or f'\\u{ord(char):04x}')
+        else:
+            after, next_char = _next_char(text, pos)
+            if next_char == '"' and _next_char(text, after + 1)[1] in STRING_END:
+                pos = after + 1
+                next_char = ''
+            if next_char in STRING_END or not next_char:
+                in_string = False
+                out.append(char)
+            else:
+                out.append('\\"')
+    return ''.join(out)
+
+
+def loads(text, default=None):
+    """``json.loads`` that falls back to :func:`repair_json` only when the text is broken."""
+    if not text:
+        return default
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    try:
+        return json.loads(repair_json(text.strip()))
+    except ValueError as e:
+        logger.debug(f"Unrepairable JSON-LD ({e}): {text[:80]!r}")
+        return default
+
+
+def unescape_strings(value):
+    # Some themes HTML-escape inside JSON strings (&quot; decodes to &quot;).
+    if isinstance(value, str):
+        return html.unescape(value) if '&' in value else value
+    if isinstance(value, dict):
+        return {key: unescape_strings(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [unescape_strings(item) for item in value]
+    return value
+
+
+def node_types(node):
+    node_type = node.get('@type')
+    if isinstance(node_type, list):
+        return node_type
+    return [node_type] if node_type else []
+
+
+def iter_nodes(data, types=LD_TYPES):
+    """Every dict of one of ``types`` in ``data``, depth first, including ``@graph`` members."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, list):
+            stack.extend(reversed(value))
+        elif isinstance(value, dict):
+            if any(node_type in types for node_type in node_types(value)):
+                yield value
+            stack.extend(reversed([item for item in value.values() if isinstance(item, (dict, list))]))
+
+
+def in_stock(availability):
+    return bool(availability) and 'instock' in str(availability).replace('_', '').lower()
+
+
+class JsonLD:
+    """Product, Offer and BreadcrumbList nodes from every ld+json block of a page."""
+
+    def __init__(self, source):
+        embedded = source if isinstance(source, EmbeddedJSON) else EmbeddedJSON(source)
+        self.nodes = []
+        for script in embedded.scripts:
+            if script.type == 'application/ld+json':
+                data = loads(script.body)
+                if data is not None:
+                    self.nodes.extend(iter_nodes(unescape_strings(data)))
+
+    def of_type(self, types):
+        types = (types,) if isinstance(types, str) else types
+        return [node for node in self.nodes if any(node_type in types for node_type in node_types(node))]
+
+    def products(self):
+        return self.of_type(PRODUCT_TYPES)
+
+    def product(self):
+        products = self.products()
+        return products[0] if products else None
+
+    def offers(self):
+        return self.of_type(OFFER_TYPES)
+
+    def breadcrumbs(self):
+        names = []
+        for node in self.of_type(BREADCRUMB_TYPES):
+            items = [item for item in node.get('itemListElement') or [] if isinstance(item, dict)]
+            items.sort(key=lambda item: item.get('position') or 0)
+            for item in items:
+                name = item.get('name')
+                if not name and isinstance(item.get('item'), dict):
+                    name = item['item'].get('name')
+                if name:
+                    names.append(name)
+        return names
@@ -0,0 +1,136 @@
+import os
+import time
+from datetime import datetime, timezone
+from utils.url_utils import canonicalize_url
+from utils.extraction import ExtractionSpec, Field
+from utils.images import image_from_tag, normalize_image_url
+from utils.snapshots import iter_records
+
+PDP_FETCHED_AT = 'pdp_fetched_at'
+PDP_POLICIES = ('always', 'new', 'missing', 'stale')
+# Record fields only a product page fills in; 'missing' refetches records without them.
+PDP_ONLY_FIELDS = ('variants', 'description')
+
+# Product cards of the Shopify T4S (Kalles) theme.
+T4S_CARD_SELECTOR = 'div.t4s-product'
+T4S_CARD_SPEC = ExtractionSpec(
+    link=Field('a.t4s-full-width-link', 'h3.t4s-product-title a', attr='href'),
+    title=Field('h3.t4s-product-title a', '.t4s-product-title'),
+    original_price=Field('.t4s-product-price del', '.t4s-product-price'),
+    sale_price=Field('.t4s-product-price ins'),
+    image=Field('img.t4s-product-main-img', '.t4s-product-img img', node=True, post=image_from_tag),
+    badges=Field('.t4s-product-badge .t4s-badge-item', many=True),
+    sold_out=Field('.t4s-badge-soldout', node=True),
+)
+
+
+def listing_entry(entry):
+    """Split a ``scrape_products_links`` item into ``(product_link, partial_record or None)``."""
+    if isinstance(entry, dict):
+        return entry['product_url'], entry
+    return entry, None
+
+
+def listing_records(root, store_name, base_url, card_selector=T4S_CARD_SELECTOR, spec=T4S_CARD_SPEC):
+    """Partial product records for every card in a collection grid."""
+    records = []
+    for card in root.select(card_selector):
+        fields = spec.extract(card, store_name)
+        if not fields['link']:
+            continue
+        image = normalize_image_url(fields['image'], base_url)
+        record = {
+            'store_name': store_name,
+            'product_url': canonicalize_url(fields['link'], base_url),
+            'title': fields['title'],
+            'original_price': fields['original_price'],
+            'sale_price': fields['sale_price'],
+            'images': [image] if image else [],
+            'availability': fields['sold_out'] is None,
+        }
+        if fields['badges']:
+            record['raw_data'] = {'badges': fields['badges']}
+        records.append(record)
+    return records
+
+
+def fill_missing(record, partial):
+    # The grid only knows a few fields; the PDP wins wherever it found something.
+    for key, value in partial.items():
+        if record.get(key) in (None, '', []) and value not in (None, '', []):
+            record[key] = value
+    return record
+
+
+def _fetched_at(record):
+    try:
+        return datetime.fromisoformat(record[PDP_FETCHED_AT]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def mark_fetched(record):
+    record[PDP_FETCHED_AT] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    return record
+
+
+class PdpPolicy:
+    """Decides per listed product whether its PDP must be fetched or the grid card is enough.
+
+    ``always`` fetches every PDP. The other modes refresh the previous snapshot's record
+    with the card's title, prices, image and stock instead, and fetch only for
+    ``new`` products, records ``missing`` PDP-only fields as well, or, with ``stale``,
+    also records whose PDP is older than ``max_age`` seconds. Stores that list plain
+    links have no card data, so their PDPs are always fetched.
+    """
+
+    def __init__(self, mode='always', max_age=7 * 24 * 3600):
+        if mode not in PDP_POLICIES:
+            raise ValueError(f"Unknown PDP policy {mode!r}, expected one of {PDP_POLICIES}")
+        self.mode = mode
+        self.max_age = max_age
+        self.previous = {}
+        self.skipped = 0
+        self.path = None
+
+    def load(self, path, base_url=None):
+        self.path = path
+        self.previous = {}
+        self.skipped = 0
+        if self.mode == 'always' or not os.path.exists(path):
+            return 0
+        for record in iter_records(path):
+            if isinstance(record, dict) and record.get('product_url') and 'error' not in record:
+                self.previous[canonicalize_url(record['product_url'], base_url)] = record
+        return len(self.previous)
+
+    def needs_pdp(self, product_key, partial):
+        if self.mode == 'always' or partial is None:
+            return True
+        previous = self.previous.get(product_key)
+        if previous is None:
+            return True
+        if self.mode == 'new':
+            return False
+        if any(not previous.get(field) for field in PDP_ONLY_FIELDS):
+            return True
+        if self.mode == 'stale':
+            fetched_at = _fetched_at(previous)
+            return fetched_at is None or time.time() - fetched_at > self.max_age
+        return False
+
+    def merge(self, product_key, partial):
+        record = dict(self.previous[product_key])
+        for key, value in partial.items():
+            if key == 'raw_data':
+                record['raw_data'] = {**(record.get('raw_data') or {}), **value}
+            elif key == 'images':
+                # Keep the PDP gallery unless the card's lead image is no longer part of it.
+                if value and value[0] not in (record.get('images') or []):
+                    record['images'] = value + (record.get('images') or [])
+            elif value is not None:
+                record[key] = value
+        if partial.get('sale_price') is None:
+            record['sale_price'] = None
+        self.skipped += 1
+        return record
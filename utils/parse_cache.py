@@ -0,0 +1,168 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import inspect
+import functools
+
+# Bits of a page that change on every request without changing the product.
+VOLATILE_PATTERNS = (
+    re.compile(rb'\snonce="[^"]*"'),
+    re.compile(rb'(name="(?:csrf[^"]*|authenticity_token|form_key|_token)"\s+value=")[^"]*'),
+    re.compile(rb'("(?:csrf_?token|csrfToken|form_key|formKey|requestId|request_id)"\s*:\s*")[^"]*', re.IGNORECASE),
+    re.compile(rb'(data-cart-count=")[^"]*'),
+    re.compile(rb'("(?:serverTime|server_time|timestamp|generated_at)"\s*:\s*)[\d.]+'),
+)
+
+
+def _compile(pattern):
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return re.compile(pattern.encode() if isinstance(pattern, str) else pattern)
+
+
+def _blank(match):
+    # Keep the prefix group (attribute name etc.) so only the volatile value is dropped.
+    return match.group(1) if match.re.groups else b''
+
+
+def content_hash(markup, context=None, volatile_patterns=()):
+    if isinstance(markup, str):
+        markup = markup.encode('utf-8')
+    for pattern in (*VOLATILE_PATTERNS, *map(_compile, volatile_patterns)):
+        markup = pattern.sub(_blank, markup)
+    digest = hashlib.blake2b(markup, digest_size=20)
+    if context:
+        digest.update(json.dumps(context, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+# Shared modules whose code can change what a parse function returns.
+SHARED_PREFIXES = ('utils.',)
+
+
+def _module_source(module):
+    try:
+        return inspect.getsource(module)
+    except (OSError, TypeError):
+        return ''
+
+
+def _shared_modules(module, found):
+    # Every utils module reachable through the globals of ``module``, directly or through
+    # another utils module (extraction -> patterns, text, ...).
+    for value in list(vars(module).values()):
+        if inspect.ismodule(value):
+            name = value.__name__
+        else:
+            name = getattr(value, '__module__', None)
+            if not isinstance(name, str):
+                continue
+        if name.startswith(SHARED_PREFIXES) and name not in found and name in sys.modules:
+            found.add(name)
+            _shared_modules(sys.modules[name], found)
+    return found
+
+
+@functools.lru_cache(maxsize=None)
+def parser_version(func):
+    """Hash of the parse function's module and of every shared utils module it reaches.
+
+    The whole defining module counts, since specs, regions and helpers live next to the
+    parse function; so do the utils modules it imports, which do most of the parsing.
+    """
+    module = inspect.getmodule(func)
+    if module is None:
+        return hashlib.blake2b(func.__code__.co_code, digest_size=8).hexdigest()
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update((_module_source(module) or func.__code__.co_code.hex()).encode('utf-8'))
+    for name in sorted(_shared_modules(module, set()) - {module.__name__}):
+        digest.update(name.encode('utf-8'))
+        digest.update(_module_source(sys.modules[name]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Parsed product records keyed by store and normalized page hash, in SQLite with LRU eviction."""
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._purged = set()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                store TEXT NOT NULL,
+                key TEXT NOT NULL,
+                version TEXT NOT NULL,
+                record TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (store, key)
+            );
+            CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used);
+        """)
+        self._bytes = self.total_bytes()
+
+    def get(self, store, key, version):
+        if (store, version) not in self._purged:
+            # Entries from an older parser version of this store can never hit again.
+            self._purged.add((store, version))
+            self.invalidate(store, version)
+        row = self.conn.execute(
+            "SELECT record, version FROM entries WHERE store = ? AND key = ?", (store, key)
+        ).fetchone()
+        if row is None or row[1] != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute(
+            "UPDATE entries SET last_used = ? WHERE store = ? AND key = ?", (time.time(), store, key)
+        )
+        return json.loads(row[0])
+
+    def put(self, store, key, version, record):
+        payload = json.dumps(record, ensure_ascii=False)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries (store, key, version, record, size, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+            (store, key, version, payload, len(payload), time.time())
+        )
+        self._bytes += len(payload)
+        if self._bytes > self.max_bytes:
+            self._evict()
+
+    def invalidate(self, store, version=None):
+        if version is None:
+            self.conn.execute("DELETE FROM entries WHERE store = ?", (store,))
+        else:
+            self.conn.execute("DELETE FROM entries WHERE store = ? AND version != ?", (store, version))
+
+    def total_bytes(self):
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _evict(self):
+        # Other processes may share the file, so re-read the real size before evicting.
+        self._bytes = self.total_bytes()
+        excess = self._bytes - self.max_bytes
+        if excess <= 0:
+            return
+        # Free a little extra so the next few inserts don't evict again.
+        excess += self.max_bytes // 20
+        doomed, freed = [], 0
+        for store, key, size in self.conn.execute("SELECT store, key, size FROM entries ORDER BY last_used"):
+            if freed >= excess:
+                break
+            doomed.append((store, key))
+            freed += size
+        self.conn.executemany("DELETE FROM entries WHERE store = ? AND key = ?", doomed)
+        self._bytes -= freed
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import importlib
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from utils.patterns import REGISTRY
+
+# name -> parse function; filled by @register_parser when a scraper module is imported.
+PARSERS = {}
+
+logger = logging.getLogger(__name__)
+
+
+def register_parser(name):
+    """Register a module-level ``func(markup, **context) -> dict`` under ``name``.
+
+    Only the name and the defining module travel to the worker processes, which
+    import that module themselves, so parse functions must not be closures or methods.
+    """
+    def decorator(func):
+        if '<locals>' in func.__qualname__ or '.' in func.__qualname__:
+            raise ValueError(f"Parser {name!r} must be a module-level function, got {func.__qualname__}")
+        existing = PARSERS.get(name)
+        if existing is not None and existing is not func:
+            raise ValueError(f"Parser {name!r} is already registered by {existing.__module__}")
+        PARSERS[name] = func
+        func.parser_name = name
+        return func
+    return decorator
+
+
+def _resolve(name, module):
+    func = PARSERS.get(name)
+    if func is None:
+        importlib.import_module(module)
+        func = PARSERS[name]
+    return func
+
+
+def decode_markup(markup, encoding=None):
+    if isinstance(markup, bytes):
+        return markup.decode(encoding or 'utf-8', errors='replace')
+    return markup
+
+
+def run_parser(name, module, markup, encoding, context, collect_stats=False):
+    record = _resolve(name, module)(decode_markup(markup, encoding), **context)
+    if collect_stats:
+        # The worker's regex/selector stats travel back with the record to be merged.
+        return record, REGISTRY.take()
+    return record
+
+
+def _init_worker(initializer, collect_stats):
+    if initializer is not None:
+        initializer()
+    REGISTRY.enable(collect_stats)
+
+
+class ParsePool:
+    """Runs registered parse functions in worker processes, off the event loop.
+
+    ``processes=0`` keeps parsing in this process on a worker thread, which is
+    what scrapers fall back to when no pool is configured. The processes are only
+    started by the first :meth:`parse`, so runs without a registered parser never pay for them.
+    With ``collect_stats`` the workers time their regexes and selectors and each result
+    brings those stats back into this process's registry.
+    """
+
+    def __init__(self, processes=None, initializer=None, max_tasks_per_child=None, collect_stats=False):
+        self.processes = processes
+        self.initializer = initializer
+        self.max_tasks_per_child = max_tasks_per_child
+        self.collect_stats = collect_stats
+        self.executor = None
+
+    def _executor(self):
+        if self.executor is None:
+            # spawn rather than fork: the scheduler has threads running by the time we parse.
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=functools.partial(_init_worker, self.initializer, self.collect_stats),
+                max_tasks_per_child=self.max_tasks_per_child
+            )
+        return self.executor
+
+    async def parse(self, func, markup, encoding=None, **context):
+        name = getattr(func, 'parser_name', None)
+        if name is None or PARSERS.get(name) is not func:
+            raise ValueError(f"{func!r} is not a registered parser")
+        if self.processes == 0:
+            return await asyncio.to_thread(run_parser, name, func.__module__, markup, encoding, context)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self._executor(), run_parser, name, func.__module__, markup, encoding, context, self.collect_stats
+        )
+        if not self.collect_stats:
+            return result
+        record, stats = result
+        REGISTRY.merge(stats)
+        return record
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
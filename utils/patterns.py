@@ -0,0 +1,166 @@
+import re
+import time
+import soupsieve
+from bs4.element import Tag
+
+
+class _Stats:
+    __slots__ = ('hits', 'seconds')
+
+    def __init__(self):
+        self.hits = 0
+        self.seconds = 0.0
+
+
+class Pattern:
+    """A regex compiled once; counts calls and their time while the registry's stats are enabled."""
+
+    __slots__ = ('source', 'flags', 'regex', 'stats', 'registry')
+
+    def __init__(self, source, flags=0, registry=None):
+        self.source = source
+        self.flags = flags
+        self.regex = re.compile(source, flags)
+        self.stats = _Stats()
+        self.registry = registry
+
+    def _timed(self, method, *args, **kwargs):
+        if self.registry is None or not self.registry.enabled:
+            return method(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self.stats.hits += 1
+            self.stats.seconds += time.perf_counter() - start
+
+    def search(self, string, *args):
+        return self._timed(self.regex.search, string, *args)
+
+    def match(self, string, *args):
+        return self._timed(self.regex.match, string, *args)
+
+    def fullmatch(self, string, *args):
+        return self._timed(self.regex.fullmatch, string, *args)
+
+    def findall(self, string, *args):
+        return self._timed(self.regex.findall, string, *args)
+
+    def finditer(self, string, *args):
+        if self.registry is None or not self.registry.enabled:
+            return self.regex.finditer(string, *args)
+        # Materialized so the time spent matching is actually measured.
+        return iter(self._timed(lambda: list(self.regex.finditer(string, *args))))
+
+    def sub(self, repl, string, count=0):
+        return self._timed(self.regex.sub, repl, string, count)
+
+    def split(self, string, maxsplit=0):
+        return self._timed(self.regex.split, string, maxsplit)
+
+    def __repr__(self):
+        return f"Pattern({self.source!r})"
+
+
+class Selector:
+    """A CSS selector tokenized once by soupsieve; selectolax trees get the raw string."""
+
+    __slots__ = ('source', 'compiled', 'stats', 'registry')
+
+    def __init__(self, source, registry=None):
+        self.source = source
+        self.compiled = soupsieve.compile(source)
+        self.stats = _Stats()
+        self.registry = registry
+
+    def _select(self, root, many):
+        if isinstance(root, Tag):
+            return self.compiled.select(root) if many else self.compiled.select_one(root)
+        # selectolax documents keep their own selector cache.
+        return root.select(self.source) if many else root.select_one(self.source)
+
+    def _timed(self, root, many):
+        if self.registry is None or not self.registry.enabled:
+            return self._select(root, many)
+        start = time.perf_counter()
+        try:
+            return self._select(root, many)
+        finally:
+            self.stats.hits += 1
+            self.stats.seconds += time.perf_counter() - start
+
+    def select(self, root):
+        return self._timed(root, True)
+
+    def select_one(self, root):
+        return self._timed(root, False)
+
+    def __repr__(self):
+        return f"Selector({self.source!r})"
+
+
+class PatternRegistry:
+    """Patterns and selectors by source; calls are only counted and timed after :meth:`enable`."""
+
+    def __init__(self):
+        self.patterns = {}
+        self.selectors = {}
+        self.enabled = False
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def regex(self, source, flags=0):
+        key = (source, flags)
+        pattern = self.patterns.get(key)
+        if pattern is None:
+            pattern = self.patterns[key] = Pattern(source, flags, registry=self)
+        return pattern
+
+    def selector(self, source):
+        selector = self.selectors.get(source)
+        if selector is None:
+            selector = self.selectors[source] = Selector(source, registry=self)
+        return selector
+
+    def take(self):
+        """Stats gathered since the last call as ``(kind, source, flags, hits, seconds)``, then reset.
+
+        Parse pool workers send these back with each result (see ``utils.parse_pool``).
+        """
+        rows = []
+        for pattern in self.patterns.values():
+            if pattern.stats.hits:
+                rows.append(('regex', pattern.source, pattern.flags, pattern.stats.hits, pattern.stats.seconds))
+                pattern.stats = _Stats()
+        for selector in self.selectors.values():
+            if selector.stats.hits:
+                rows.append(('css', selector.source, 0, selector.stats.hits, selector.stats.seconds))
+                selector.stats = _Stats()
+        return rows
+
+    def merge(self, rows):
+        for kind, source, flags, hits, seconds in rows:
+            item = self.regex(source, flags) if kind == 'regex' else self.selector(source)
+            item.stats.hits += hits
+            item.stats.seconds += seconds
+
+    def stats(self):
+        """``(kind, source, hits, seconds)`` for everything used so far, slowest first."""
+        rows = [('regex', p.source, p.stats.hits, p.stats.seconds) for p in self.patterns.values()]
+        rows += [('css', s.source, s.stats.hits, s.stats.seconds) for s in self.selectors.values()]
+        return sorted((row for row in rows if row[2]), key=lambda row: row[3], reverse=True)
+
+    def report(self, limit=20):
+        lines = [f"{seconds * 1000:10.1f} ms {hits:9d}x  {kind:5s} {source}"
+                 for kind, source, hits, seconds in self.stats()[:limit]]
+        return "\n".join(lines)
+
+    def reset(self):
+        for item in (*self.patterns.values(), *self.selectors.values()):
+            item.stats = _Stats()
+
+
+REGISTRY = PatternRegistry()
+regex = REGISTRY.regex
+selector = REGISTRY.selector
@@ -0,0 +1,128 @@
+import re
+from typing import NamedTuple
+from utils.patterns import regex
+
+# Symbols and codes seen on store pages, mapped to ISO 4217.
+CURRENCY_ALIASES = {
+    'pkr': 'PKR', 'rs': 'PKR', 'rs.': 'PKR', 'rupees': 'PKR', '₨': 'PKR',
+    'usd': 'USD', '$': 'USD', 'us$': 'USD',
+    'eur': 'EUR', '€': 'EUR',
+    'gbp': 'GBP', '£': 'GBP',
+    'jpy': 'JPY', '¥': 'JPY',
+    'inr': 'INR', '₹': 'INR',
+    'aed': 'AED', 'sar': 'SAR', 'cad': 'CAD', 'aud': 'AUD',
+}
+ZERO_DECIMAL_CURRENCIES = {'JPY'}
+
+CURRENCY_RE = regex(
+    r'(?<![a-z])(?:' + '|'.join(re.escape(alias) for alias in sorted(CURRENCY_ALIASES, key=len, reverse=True)) + r')(?![a-z])',
+    re.IGNORECASE
+)
+AMOUNT_RE = regex(r'\d[\d,.]*')
+
+
+class Price(NamedTuple):
+    amount: int
+    currency: str | None
+
+    def __str__(self):
+        return format_amount(self.amount, self.currency)
+
+
+def minor_digits(currency):
+    return 0 if currency in ZERO_DECIMAL_CURRENCIES else 2
+
+
+def parse_currency(text):
+    if not text or not isinstance(text, str):
+        return None
+    match = CURRENCY_RE.search(text)
+    return CURRENCY_ALIASES[match.group(0).lower()] if match else None
+
+
+def _to_minor(number, digits):
+    number = number.rstrip('.,')
+    if ',' in number and '.' in number:
+        # Whichever separator comes last is the decimal point.
+        thousands = ',' if number.rfind('.') > number.rfind(',') else '.'
+        number = number.replace(thousands, '').replace(',', '.')
+    elif ',' in number:
+        number = number.replace(',', '')
+    elif number.count('.') > 1 or ('.' in number and len(number) - number.rfind('.') == 4):
+        # "1.234" and "1.234.567" use dots for thousands.
+        number = number.replace('.', '')
+
+    whole, _, fraction = number.partition('.')
+    fraction = (fraction + '0' * digits)[:digits]
+    return int(whole or '0') * 10 ** digits + int(fraction or '0')
+
+
+def parse_amount(text, currency=None):
+    """Return the first amount in ``text`` as integer minor units, or None."""
+    if text is None:
+        return None
+    if isinstance(text, (int, float)):
+        return round(text * 10 ** minor_digits(currency))
+    match = AMOUNT_RE.search(text)
+    return _to_minor(match.group(0), minor_digits(currency)) if match else None
+
+
+def parse_price(text, default_currency=None):
+    if text is None:
+        return None
+    currency = parse_currency(text) or default_currency
+    amount = parse_amount(text, currency)
+    return Price(amount, currency) if amount is not None else None
+
+
+def clean_price(text, default_currency=None):
+    price = parse_price(text, default_currency)
+    return str(price) if price else None
+
+
+def format_amount(amount, currency=None):
+    if amount is None:
+        return None
+    digits = minor_digits(currency)
+    whole, fraction = divmod(amount, 10 ** digits)
+    return f"{whole}.{fraction:0{digits}d}" if fraction else str(whole)
+
+
+def discount_percent(original, sale):
+    if not original or sale is None or sale >= original:
+        return None
+    return round((original - sale) * 100 / original)
+
+
+def normalize_prices(original_text, sale_text=None, default_currency=None):
+    original = parse_price(original_text, default_currency)
+    sale = parse_price(sale_text, default_currency)
+    currency = (original or sale).currency if (original or sale) else default_currency
+    original_minor = original.amount if original else None
+    sale_minor = sale.amount if sale else None
+    return {
+        'original_price': format_amount(original_minor, currency),
+        'sale_price': format_amount(sale_minor, currency),
+        'original_price_minor': original_minor,
+        'sale_price_minor': sale_minor,
+        'currency': currency,
+        'discount_percent': discount_percent(original_minor, sale_minor),
+    }
+
+
+def parse_prices(texts, default_currency=None):
+    return [parse_price(text, default_currency) for text in texts]
+
+
+def normalize_record(record, default_currency=None):
+    # Stores report currency as a symbol, a code or not at all; the price
+    # text itself is the most reliable hint, then the store-level default.
+    hint = parse_currency(record.get('currency')) or default_currency
+    record.update(normalize_prices(record.get('original_price'), record.get('sale_price'), hint))
+    return record
+
+
+def normalize_records(records, default_currency=None):
+    for record in records:
+        normalize_record(record, default_currency)
+    return records
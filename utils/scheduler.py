@@ -0,0 +1,103 @@
+import os
+import time
+import asyncio
+import functools
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+
+class FairLimiter:
+    """Global concurrency limit handed out max-min fair between stores."""
+
+    def __init__(self, max_concurrency):
+        self.max_concurrency = max_concurrency
+        self.in_use = 0
+        self.active = {}
+        self.waiters = OrderedDict()
+
+    def _grant(self, store):
+        self.in_use += 1
+        self.active[store] = self.active.get(store, 0) + 1
+
+    def _wake(self):
+        while self.in_use < self.max_concurrency and self.waiters:
+            store = min(self.waiters, key=lambda s: self.active.get(s, 0))
+            queue = self.waiters[store]
+            future = queue.popleft()
+            if queue:
+                self.waiters.move_to_end(store)
+            else:
+                del self.waiters[store]
+            if future.done():
+                continue
+            self._grant(store)
+            future.set_result(None)
+
+    async def acquire(self, store):
+        if self.in_use < self.max_concurrency and not self.waiters:
+            self._grant(store)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault(store, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(store)
+            raise
+
+    def release(self, store):
+        self.in_use -= 1
+        self.active[store] -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, store):
+        await self.acquire(store)
+        try:
+            yield
+        finally:
+            self.release(store)
+
+
+class StoreScheduler:
+    def __init__(self, max_concurrency=16, max_active_stores=None, deadlines=None, default_deadline=None):
+        self.limiter = FairLimiter(max_concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="scraper")
+        self.max_active_stores = max_active_stores
+        self.deadlines = deadlines or {}
+        self.default_deadline = default_deadline
+
+    async def run(self, store, func, *args):
+        async with self.limiter.slot(store):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args))
+
+    def staleness(self, scraper):
+        # Stores without a snapshot are the stalest of all.
+        path = scraper.snapshot_path()
+        return os.path.getmtime(path) if os.path.exists(path) else 0
+
+    def prioritize(self, scrapers):
+        return sorted(scrapers, key=self.staleness)
+
+    async def _run_store(self, scraper, store_slots):
+        async with store_slots:
+            deadline = self.deadlines.get(scraper.store_name, self.default_deadline)
+            scraper.scheduler = self
+            scraper.deadline = time.monotonic() + deadline if deadline else None
+            scraper.log_info(f"Scheduled with deadline {deadline}s" if deadline else "Scheduled without deadline")
+            return await scraper.scrape_data()
+
+    async def run_stores(self, scrapers):
+        store_slots = asyncio.Semaphore(self.max_active_stores or len(scrapers) or 1)
+        ordered = self.prioritize(scrapers)
+        try:
+            results = await asyncio.gather(
+                *(self._run_store(scraper, store_slots) for scraper in ordered),
+                return_exceptions=True
+            )
+        finally:
+            self.executor.shutdown(wait=False)
+        return list(zip(ordered, results))
@@ -0,0 +1,255 @@
+import io
+import os
+import gzip
+import json
+import time
+import logging
+from utils.prices import normalize_record
+from utils.variants import VariantMatrix
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+# File suffix of each compression; '' is plain NDJSON.
+COMPRESSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+# Extensions a store's current snapshot may have, the streamed formats first.
+SNAPSHOT_EXTENSIONS = ('.jsonl.zst', '.jsonl.gz', '.jsonl', '.json')
+PARTIAL_SUFFIX = '.partial'
+# Snapshot lines hold ``variants`` in VariantMatrix's compact form under this key.
+COMPACT_VARIANTS_KEY = 'variants_compact'
+# Below this many variants the per-variant dicts are about as small as the compact form.
+COMPACT_MIN_VARIANTS = 4
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+logger = logging.getLogger(__name__)
+_warned_compressions = set()
+
+
+def resolve_compression(compression):
+    if compression == "zstd" and not HAS_ZSTD:
+        fallback = "gzip"
+    elif compression not in COMPRESSIONS:
+        fallback = "none"
+    else:
+        return compression
+    if compression not in _warned_compressions:
+        _warned_compressions.add(compression)
+        logger.warning(f"Snapshot compression {compression!r} is unavailable, falling back to {fallback!r}")
+    return fallback
+
+
+def dumps_line(record):
+    """One minified NDJSON line as bytes, through orjson when it is installed."""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(record) + b'\n'
+        except TypeError:
+            # Integers beyond 64 bits and other values only the json module accepts.
+            pass
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def loads_line(line):
+    return orjson.loads(line) if HAS_ORJSON else json.loads(line)
+
+
+def snapshot_extension(path):
+    return next((ext for ext in SNAPSHOT_EXTENSIONS if path.endswith(ext)), os.path.splitext(path)[1])
+
+
+def snapshot_files(directory, store_name):
+    """Existing snapshots of ``store_name`` in ``directory``, preferred first."""
+    paths = [os.path.join(directory, store_name + ext) for ext in SNAPSHOT_EXTENSIONS]
+    return [path for path in paths if os.path.exists(path)]
+
+
+def is_snapshot(filename):
+    return filename.endswith(SNAPSHOT_EXTENSIONS)
+
+
+def open_compressed(path, mode, compression="none", level=None):
+    """Binary file object for ``path``; reading ignores ``compression`` and sniffs the file."""
+    if mode.startswith('r'):
+        raw = open(path, 'rb')
+        magic = raw.peek(4)[:4]
+        if magic.startswith(GZIP_MAGIC):
+            return gzip.GzipFile(fileobj=raw, mode='rb')
+        if magic == ZSTD_MAGIC:
+            if not HAS_ZSTD:
+                raw.close()
+                raise RuntimeError(f"{path} is zstd-compressed; install the zstandard package to read it")
+            return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+        return raw
+    level = DEFAULT_LEVELS.get(compression) if level is None else level
+    if compression == "gzip":
+        return gzip.open(path, mode + 'b', compresslevel=level)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=level).stream_writer(open(path, mode + 'b'), closefd=True)
+    return open(path, mode + 'b')
+
+
+def fsync_path(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        # Some platforms and file systems cannot fsync a directory.
+        pass
+    finally:
+        os.close(fd)
+
+
+def replace_durably(source, destination):
+    """``os.replace`` with the data fsynced before and the directory entry after."""
+    fsync_path(source)
+    os.replace(source, destination)
+    fsync_path(os.path.dirname(os.path.abspath(destination)))
+
+
+def compact_variants(record):
+    """``record`` with its ``variants`` list swapped for the compact form, in the same position.
+
+    Records whose variants the compact form cannot reproduce exactly are returned as they are.
+    """
+    variants = record.get('variants')
+    if not isinstance(variants, list) or len(variants) < COMPACT_MIN_VARIANTS:
+        return record
+    matrix = VariantMatrix.from_list(variants)
+    if matrix is None:
+        return record
+    compacted = {}
+    for key, value in record.items():
+        if key == 'variants':
+            compacted[COMPACT_VARIANTS_KEY] = matrix.to_compact()
+        else:
+            compacted[key] = value
+    return compacted
+
+
+def expand_variants(record):
+    if COMPACT_VARIANTS_KEY not in record:
+        return record
+    expanded = {}
+    for key, value in record.items():
+        if key == COMPACT_VARIANTS_KEY:
+            expanded['variants'] = VariantMatrix.from_compact(value).to_list()
+        else:
+            expanded[key] = value
+    return expanded
+
+
+def iter_records(path):
+    """Records of a snapshot in any format: NDJSON, gzip/zstd NDJSON or a legacy JSON array.
+
+    Compact variants are expanded back into the ``variants`` list.
+    """
+    with open_compressed(path, 'r') as f:
+        first = f.peek(64).lstrip()[:1] if hasattr(f, 'peek') else b''
+        if first == b'[':
+            yield from json.load(f)
+            return
+        # A .partial file may end in an unterminated line or before the compressed trailer.
+        try:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    logger.warning(f"Ignoring unterminated last line of {path}")
+                    break
+                if line.strip():
+                    yield expand_variants(loads_line(line))
+        except EOFError:
+            logger.warning(f"{path} ends before its compressed stream does")
+
+
+class SnapshotWriter:
+    """Streams a store's records to ``<path>.partial`` as NDJSON while it is scraped.
+
+    Records are normalized and written as soon as they are added, with their variants
+    in VariantMatrix's compact form, so only each product's category list stays in
+    memory. Categories a product turns up in later are appended to that list and merged
+    into its line when the file is published. A run that dies before :meth:`publish`
+    leaves the ``.partial`` file behind.
+    """
+
+    def __init__(self, path, default_currency=None, flush_every=50, flush_interval=30,
+                 compression="none", level=None):
+        self.path = path
+        self.partial_path = path + PARTIAL_SUFFIX
+        self.default_currency = default_currency
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.compression = compression
+        self.level = level
+        self.count = 0
+        self.sample = None
+        # Per line: the record's categories list and how many it had when written.
+        self._memberships = []
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open_compressed(self.partial_path, 'w', compression, level)
+
+    def write(self, record):
+        if 'error' not in record:
+            normalize_record(record, self.default_currency)
+        line = dumps_line(compact_variants(record))
+        self._file.write(line)
+        categories = record.get('categories')
+        self._memberships.append((categories, len(categories) if categories is not None else 0))
+        if self.sample is None:
+            self.sample = line.decode('utf-8').rstrip('\n')
+        self.count += 1
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every or time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+        return categories
+
+    def flush(self):
+        # Compressors end the current block here, so everything so far can be read back.
+        if self.compression == "zstd":
+            self._file.flush(zstandard.FLUSH_BLOCK)
+        else:
+            self._file.flush()
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+
+    def _merged_lines(self):
+        with open_compressed(self.partial_path, 'r') as f:
+            for line, (categories, written) in zip(f, self._memberships):
+                if categories is not None and len(categories) != written:
+                    record = loads_line(line)
+                    record['categories'] = categories
+                    line = dumps_line(record)
+                yield line
+
+    def publish(self):
+        """Atomically replace ``path`` with the finished snapshot; returns its path.
+
+        Readers of ``path`` see either the previous complete file or this one.
+        """
+        self.close()
+        if any(categories is not None and len(categories) != written for categories, written in self._memberships):
+            merged_path = self.partial_path + '.merged'
+            with open_compressed(merged_path, 'w', self.compression, self.level) as f:
+                for line in self._merged_lines():
+                    f.write(line)
+            replace_durably(merged_path, self.path)
+            os.remove(self.partial_path)
+        else:
+            replace_durably(self.partial_path, self.path)
+        self._memberships = []
+        return self.path
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
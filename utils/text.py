@@ -0,0 +1,120 @@
+import html
+from bs4.element import Tag, NavigableString, CData
+from utils.html_parser import FastNode, FastDocument
+
+# What get_text() reads: plain text and CDATA, not comments, doctypes or script/style bodies.
+TEXT_TYPES = (NavigableString, CData)
+NBSP = '\xa0'
+
+
+def clean_text(text):
+    """Strip a raw string, decoding entities and turning non-breaking spaces into spaces."""
+    if not text:
+        return text
+    if '&' in text:
+        text = html.unescape(text)
+    return text.replace(NBSP, ' ').strip()
+
+
+def _skipped(node, skip_classes):
+    return skip_classes and not skip_classes.isdisjoint(node.get('class') or ())
+
+
+def _events(node, skip_classes=frozenset(), tags=None):
+    # One pass over the subtree without touching it. Yields ('text', str) for each text
+    # node, plus ('start', tag) / ('end', tag) around descendants named in ``tags``.
+    if isinstance(node, FastNode):
+        roots = node.roots if isinstance(node, FastDocument) and node.roots is not None else [node._node]
+        for root in roots:
+            yield from _fast_events(root, skip_classes, tags)
+        return
+    stack = [iter(node.contents)]
+    open_tags = [None]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, Tag):
+                if _skipped(child, skip_classes):
+                    continue
+                if tags is not None and child.name in tags:
+                    yield 'start', child
+                    open_tags.append(child)
+                else:
+                    open_tags.append(None)
+                stack.append(iter(child.contents))
+                break
+            if type(child) in TEXT_TYPES:
+                yield 'text', str(child)
+        else:
+            stack.pop()
+            closed = open_tags.pop()
+            if closed is not None:
+                yield 'end', closed
+
+
+def _fast_events(node, skip_classes, tags):
+    for child in node.iter(include_text=True):
+        if child.tag == '-text':
+            yield 'text', child.text_content or ''
+            continue
+        if child.tag in ('script', 'style', 'template', '_comment'):
+            continue
+        if skip_classes and not skip_classes.isdisjoint((child.attributes.get('class') or '').split()):
+            continue
+        named = tags is not None and child.tag in tags
+        if named:
+            yield 'start', child
+        yield from _fast_events(child, skip_classes, tags)
+        if named:
+            yield 'end', child
+
+
+def iter_strings(node, skip_classes=()):
+    """Text nodes under ``node`` in document order, leaving out subtrees with any of ``skip_classes``."""
+    for _, text in _events(node, frozenset(skip_classes)):
+        yield text
+
+
+def node_text(node, separator='\n', skip_classes=()):
+    """Same as ``node.get_text(separator, strip=True)`` with non-breaking spaces as spaces.
+
+    ``<br>`` needs no special handling: it has no text, so the pieces on either side
+    already end up on their own lines.
+    """
+    pieces = []
+    for text in iter_strings(node, skip_classes):
+        text = text.strip()
+        if text:
+            pieces.append(text.replace(NBSP, ' '))
+    return separator.join(pieces)
+
+
+def text_lines(node, skip_classes=()):
+    """Non-empty, stripped lines of ``node``'s text, breaking at every tag and newline."""
+    lines = []
+    for text in iter_strings(node, skip_classes):
+        for line in text.split('\n'):
+            line = line.strip()
+            if line:
+                lines.append(line.replace(NBSP, ' '))
+    return lines
+
+
+def paragraphs(node, tags=('p',), separator='\n', skip_classes=()):
+    """``[node_text(tag, separator) for tag in node.find_all(tags)]`` in a single walk."""
+    tags = {tags} if isinstance(tags, str) else set(tags)
+    found, open_pieces = [], []
+    for event, value in _events(node, frozenset(skip_classes), tags):
+        if event == 'text':
+            text = value.strip()
+            if text:
+                text = text.replace(NBSP, ' ')
+                for pieces in open_pieces:
+                    pieces.append(text)
+        elif event == 'start':
+            # Reserve the slot now so nested matches keep find_all()'s document order.
+            pieces = []
+            open_pieces.append(pieces)
+            found.append(pieces)
+        else:
+            open_pieces.pop()
+    return [separator.join(pieces) for pieces in found]
@@ -0,0 +1,121 @@
+import os
+import re
+import mmap
+import math
+import hashlib
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that never change which product a URL points at.
+TRACKING_PARAMS = {
+    'variant', 'fbclid', 'gclid', 'msclkid', 'ref', 'ref_', 'srsltid',
+    '_pos', '_sid', '_ss', '_psq', '_fid', '_v', 'currency', 'view',
+}
+TRACKING_PREFIXES = ('utm_', 'pf_', 'mc_')
+COLLECTION_PRODUCT_RE = re.compile(r'^(?:/[a-z]{2}(?:-[a-z]{2})?)?/collections/[^/]+(/products/[^/]+)', re.IGNORECASE)
+MULTI_SLASH_RE = re.compile(r'/{2,}')
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def canonicalize_url(url, base_url=None):
+    if not url:
+        return url
+    url = url.strip()
+    if url.startswith('//'):
+        url = 'https:' + url
+    elif base_url and not url.startswith(('http://', 'https://')):
+        url = urljoin(base_url, url)
+
+    scheme, netloc, path, query, _ = urlsplit(url)
+    scheme = scheme.lower() or 'https'
+    netloc = netloc.lower()
+    host, _, port = netloc.partition(':')
+    if port and DEFAULT_PORTS.get(scheme) == port:
+        netloc = host
+
+    path = MULTI_SLASH_RE.sub('/', path or '/')
+    match = COLLECTION_PRODUCT_RE.match(path)
+    if match:
+        path = match.group(1)
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    params = [
+        (key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    params.sort()
+    return urlunsplit((scheme, netloc, path, urlencode(params), ''))
+
+
+class ProductFrontier:
+    def __init__(self):
+        self._seen = set()
+
+    def _key(self, url):
+        return hashlib.blake2b(canonicalize_url(url).encode('utf-8'), digest_size=16).digest()
+
+    def add(self, url):
+        key = self._key(url)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+    def __contains__(self, url):
+        return self._key(url) in self._seen
+
+    def __len__(self):
+        return len(self._seen)
+
+
+class BloomFrontier:
+    """ProductFrontier with bounded memory: a Bloom filter in a memory-mapped file.
+
+    The file is scratch space for one run and is cleared when the frontier is opened.
+    A false positive (``error_rate``) skips a product that was not fetched yet.
+    """
+
+    def __init__(self, path, capacity=1_000_000, error_rate=0.001):
+        self.path = path
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._count = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.truncate((self.num_bits + 7) // 8)
+        self._file = open(path, 'r+b')
+        self._bits = mmap.mmap(self._file.fileno(), 0)
+
+    def _positions(self, url):
+        digest = hashlib.blake2b(canonicalize_url(url).encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, url):
+        is_new = False
+        for pos in self._positions(url):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not self._bits[byte] & mask:
+                self._bits[byte] |= mask
+                is_new = True
+        if is_new:
+            self._count += 1
+        return is_new
+
+    def __contains__(self, url):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(url))
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        self._bits.close()
+        self._file.close()
+
+
+def create_frontier(bloom_path=None, capacity=1_000_000, error_rate=0.001):
+    if bloom_path:
+        return BloomFrontier(bloom_path, capacity=capacity, error_rate=error_rate)
+    return ProductFrontier()
@@ -0,0 +1,194 @@
+import math
+from array import array
+
+# Column value of a variant that has no value on an axis added after it.
+MISSING = 0xFFFF
+NUMERIC_FIELDS = ('price', 'original_price')
+FIELDS = ('availability',) + NUMERIC_FIELDS + ('sku',)
+
+
+class VariantMatrix:
+    """Product variants as option axes stored once instead of one dict per combination.
+
+    Each axis keeps its distinct values; a variant is one small index per axis, its stock
+    is a bit in a bitmap and prices/SKUs are columns that only exist once a store sets
+    them. Adding a combination again updates it, so cross products cannot duplicate.
+    ``to_list()`` gives the ``variants`` list records have always carried and
+    ``to_compact()`` the form snapshots store it in (see ``utils.snapshots``).
+    """
+
+    __slots__ = ('axes', '_values', '_columns', '_positions', '_available', '_numbers', '_skus', '_count')
+
+    def __init__(self, axes=(), fields=()):
+        self.axes = []
+        self._values = {}
+        self._columns = {}
+        self._positions = {}
+        self._available = bytearray()
+        self._numbers = {}
+        self._skus = None
+        self._count = 0
+        for axis in axes:
+            self._axis(axis)
+        # Fields every variant carries, even when the store has no value for it.
+        for field in fields:
+            if field == 'sku':
+                self._skus = []
+            else:
+                self._number_column(field)
+
+    def _axis(self, axis):
+        if axis not in self._values:
+            self.axes.append(axis)
+            self._values[axis] = {}
+            self._columns[axis] = array('H', [MISSING]) * self._count
+        return self._values[axis]
+
+    def _value_index(self, axis, value):
+        values = self._axis(axis)
+        index = values.get(value)
+        if index is None:
+            index = values[value] = len(values)
+            if index >= MISSING:
+                raise ValueError(f"Too many values for variant axis {axis!r}")
+        return index
+
+    def add(self, options, available=False, price=None, original_price=None, sku=None):
+        """Add (or update) the variant with ``options``, a ``{axis: value}`` dict; returns its position."""
+        indexes = {axis: self._value_index(axis, value) for axis, value in options.items()}
+        key = [indexes.get(axis, MISSING) for axis in self.axes]
+        # Axes added later must not change the key of variants that predate them.
+        while key and key[-1] == MISSING:
+            key.pop()
+        key = tuple(key)
+        position = self._positions.get(key)
+        if position is None:
+            position = self._positions[key] = self._count
+            self._count += 1
+            for axis, column in self._columns.items():
+                column.append(indexes.get(axis, MISSING))
+            if position % 8 == 0:
+                self._available.append(0)
+            for column in self._numbers.values():
+                column.append(math.nan)
+            if self._skus is not None:
+                self._skus.append(None)
+
+        byte, bit = divmod(position, 8)
+        if available:
+            self._available[byte] |= 1 << bit
+        else:
+            self._available[byte] &= ~(1 << bit) & 0xFF
+        for field, value in (('price', price), ('original_price', original_price)):
+            if value is not None:
+                self._number_column(field)[position] = value
+        if sku is not None:
+            if self._skus is None:
+                self._skus = [None] * self._count
+            self._skus[position] = sku
+        return position
+
+    def _number_column(self, field):
+        column = self._numbers.get(field)
+        if column is None:
+            column = self._numbers[field] = array('d', [math.nan]) * self._count
+        return column
+
+    def is_available(self, position):
+        byte, bit = divmod(position, 8)
+        return bool(self._available[byte] >> bit & 1)
+
+    def values(self, axis):
+        return list(self._values.get(axis, ()))
+
+    def available_values(self, axis):
+        """Values of ``axis`` that at least one in-stock variant has."""
+        column, names = self._columns.get(axis), self.values(axis)
+        if column is None:
+            return []
+        found = {column[position] for position in range(self._count) if self.is_available(position)}
+        return [name for index, name in enumerate(names) if index in found]
+
+    def variant(self, position):
+        names = {axis: self.values(axis) for axis in self.axes}
+        return self._variant(position, names)
+
+    def _variant(self, position, names):
+        entry = {}
+        for axis in self.axes:
+            index = self._columns[axis][position]
+            if index != MISSING:
+                entry[axis] = names[axis][index]
+        entry['availability'] = self.is_available(position)
+        for field in NUMERIC_FIELDS:
+            column = self._numbers.get(field)
+            if column is not None:
+                value = column[position]
+                entry[field] = None if math.isnan(value) else value
+        if self._skus is not None:
+            entry['sku'] = self._skus[position]
+        return entry
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        names = {axis: self.values(axis) for axis in self.axes}
+        return (self._variant(position, names) for position in range(self._count))
+
+    def to_list(self):
+        return list(self)
+
+    def to_compact(self):
+        """JSON-ready form: axis values once, one index row per variant and the stock bitmap in hex."""
+        data = {
+            'axes': {axis: self.values(axis) for axis in self.axes},
+            'variants': [[None if column[position] == MISSING else column[position] for column in self._columns.values()]
+                         for position in range(self._count)],
+            'available': bytes(self._available).hex(),
+        }
+        for field, column in self._numbers.items():
+            data[field] = [None if math.isnan(value) else value for value in column]
+        if self._skus is not None:
+            data['sku'] = list(self._skus)
+        return data
+
+    @classmethod
+    def from_compact(cls, data):
+        columns = {field: data[field] for field in NUMERIC_FIELDS + ('sku',) if field in data}
+        matrix = cls(data['axes'], fields=columns)
+        names = data['axes']
+        available = bytes.fromhex(data['available'])
+        for position, row in enumerate(data['variants']):
+            options = {axis: names[axis][index] for axis, index in zip(matrix.axes, row) if index is not None}
+            byte, bit = divmod(position, 8)
+            matrix.add(options, bool(available[byte] >> bit & 1),
+                       **{field: column[position] for field, column in columns.items()})
+        return matrix
+
+    @classmethod
+    def from_list(cls, variants):
+        """The matrix of an existing ``variants`` list, or None when it cannot reproduce it exactly."""
+        if not isinstance(variants, list):
+            return None
+        fields = [field for field in FIELDS[1:] if any(isinstance(entry, dict) and field in entry for entry in variants)]
+        matrix = cls(fields=fields)
+        try:
+            for entry in variants:
+                if not isinstance(entry, dict) or not isinstance(entry.get('availability'), bool):
+                    return None
+                options = {key: value for key, value in entry.items() if key not in FIELDS}
+                matrix.add(options, entry['availability'],
+                           entry.get('price'), entry.get('original_price'), entry.get('sku'))
+        except (TypeError, ValueError):
+            return None
+        if not all(_same_variant(built, entry) for built, entry in zip(matrix, variants)) or len(matrix) != len(variants):
+            return None
+        return matrix
+
+
+def _same_variant(built, entry):
+    # Equal values are not enough: 1500 would come back as 1500.0 and keys could move.
+    return list(built) == list(entry) and all(
+        type(value) is type(entry[key]) and value == entry[key] for key, value in built.items()
+    )
@@ -0,0 +1,399 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+
+class LocalWorkQueue:
+    """In-process stand-in for the shared queues, used for local runs and tests."""
+
+    def __init__(self, visibility_timeout=300):
+        self.visibility_timeout = visibility_timeout
+        self._lock = threading.Lock()
+        self._tasks = {}
+        self._ready = []
+        self._leases = {}
+        self._dedupe_keys = set()
+        self._results = {}
+        self._memberships = {}
+
+    def enqueue(self, task, dedupe_key=None):
+        with self._lock:
+            if dedupe_key is not None:
+                if dedupe_key in self._dedupe_keys:
+                    return None
+                self._dedupe_keys.add(dedupe_key)
+            task_id = uuid.uuid4().hex
+            self._tasks[task_id] = task
+            self._ready.append(task_id)
+            return task_id
+
+    def lease(self, worker_id):
+        with self._lock:
+            now = time.time()
+            for task_id, (_, expires) in list(self._leases.items()):
+                if expires <= now:
+                    del self._leases[task_id]
+                    self._ready.append(task_id)
+            while self._ready:
+                task_id = self._ready.pop(0)
+                # Acked or reset since it was queued.
+                if task_id in self._tasks and task_id not in self._leases:
+                    self._leases[task_id] = (worker_id, now + self.visibility_timeout)
+                    return task_id, self._tasks[task_id]
+            return None
+
+    def _holds(self, task_id, worker_id):
+        lease = self._leases.get(task_id)
+        return lease is not None and lease[0] == worker_id
+
+    def extend(self, task_id, worker_id):
+        with self._lock:
+            if self._holds(task_id, worker_id):
+                self._leases[task_id] = (worker_id, time.time() + self.visibility_timeout)
+
+    def ack(self, task_id, worker_id):
+        """Finish the task; ignored unless ``worker_id`` still holds its lease."""
+        with self._lock:
+            if not self._holds(task_id, worker_id):
+                return False
+            del self._leases[task_id]
+            self._tasks.pop(task_id, None)
+            return True
+
+    def release(self, task_id, worker_id):
+        with self._lock:
+            if self._holds(task_id, worker_id):
+                del self._leases[task_id]
+                self._ready.append(task_id)
+
+    def pending(self):
+        with self._lock:
+            return len(self._tasks)
+
+    def add_membership(self, store, product_key, category):
+        with self._lock:
+            categories = self._memberships.setdefault((store, product_key), [])
+            if category not in categories:
+                categories.append(category)
+
+    def put_result(self, store, product_key, record):
+        with self._lock:
+            self._results[(store, product_key)] = record
+
+    def results(self, store):
+        with self._lock:
+            items = [(key, record) for (s, key), record in self._results.items() if s == store]
+            return [(record, list(self._memberships.get((store, key), []))) for key, record in items]
+
+    def reset(self):
+        with self._lock:
+            self._tasks.clear()
+            self._ready.clear()
+            self._leases.clear()
+            self._dedupe_keys.clear()
+            self._results.clear()
+            self._memberships.clear()
+
+    def close(self):
+        pass
+
+
+class SQLiteWorkQueue:
+    """Work queue in a SQLite file, meant for a volume shared between hosts."""
+
+    def __init__(self, path, visibility_timeout=300):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._conn().executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY,
+                    dedupe_key TEXT UNIQUE,
+                    payload TEXT NOT NULL,
+                    worker_id TEXT,
+                    lease_until REAL NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    done INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS tasks_lease ON tasks (done, lease_until, created_at);
+                CREATE TABLE IF NOT EXISTS results (
+                    store TEXT NOT NULL,
+                    product_key TEXT NOT NULL,
+                    record TEXT NOT NULL,
+                    PRIMARY KEY (store, product_key)
+                );
+                CREATE TABLE IF NOT EXISTS memberships (
+                    store TEXT NOT NULL,
+                    product_key TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    PRIMARY KEY (store, product_key, category)
+                );
+            """)
+
+    def _conn(self):
+        # One connection per thread; the default rollback journal (not WAL) is
+        # used because WAL does not work across hosts on a network volume.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _connection(self):
+        return _Transaction(self._conn())
+
+    def enqueue(self, task, dedupe_key=None):
+        task_id = uuid.uuid4().hex
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO tasks (id, dedupe_key, payload, created_at) VALUES (?, ?, ?, ?)",
+                (task_id, dedupe_key, json.dumps(task), time.time())
+            )
+            return task_id if cursor.rowcount else None
+
+    def lease(self, worker_id):
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT id, payload FROM tasks WHERE done = 0 AND lease_until <= ? ORDER BY created_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET worker_id = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker_id, now + self.visibility_timeout, row[0])
+            )
+            return row[0], json.loads(row[1])
+
+    def extend(self, task_id, worker_id):
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE tasks SET lease_until = ? WHERE id = ? AND worker_id = ?",
+                (time.time() + self.visibility_timeout, task_id, worker_id)
+            )
+
+    def ack(self, task_id, worker_id):
+        """Finish the task; ignored unless ``worker_id`` still holds its lease."""
+        # Finished rows are kept so their dedupe keys keep blocking re-enqueues until the
+        # coordinator resets the queue for the next run.
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET done = 1, payload = '{}' WHERE id = ? AND worker_id = ? AND done = 0",
+                (task_id, worker_id)
+            )
+            return cursor.rowcount > 0
+
+    def release(self, task_id, worker_id):
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE tasks SET lease_until = 0, worker_id = NULL WHERE id = ? AND worker_id = ? AND done = 0",
+                (task_id, worker_id)
+            )
+
+    def pending(self):
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM tasks WHERE done = 0").fetchone()[0]
+
+    def add_membership(self, store, product_key, category):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO memberships (store, product_key, category, position) "
+                "VALUES (?, ?, ?, (SELECT COUNT(*) FROM memberships WHERE store = ? AND product_key = ?))",
+                (store, product_key, category, store, product_key)
+            )
+
+    def put_result(self, store, product_key, record):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (store, product_key, record) VALUES (?, ?, ?)",
+                (store, product_key, json.dumps(record, ensure_ascii=False))
+            )
+
+    def results(self, store):
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT product_key, record FROM results WHERE store = ? ORDER BY rowid", (store,)
+            ).fetchall()
+            memberships = {}
+            for product_key, category in conn.execute(
+                "SELECT product_key, category FROM memberships WHERE store = ? ORDER BY position", (store,)
+            ):
+                memberships.setdefault(product_key, []).append(category)
+        return [(json.loads(record), memberships.get(key, [])) for key, record in rows]
+
+    def reset(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM tasks")
+            conn.execute("DELETE FROM results")
+            conn.execute("DELETE FROM memberships")
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+# Moving a task between the ready list and the leased set happens in one script, so a
+# worker dying halfway cannot leave it in neither.
+LEASE_SCRIPT = """
+local task_id = redis.call('LPOP', KEYS[1])
+if not task_id then return nil end
+redis.call('ZADD', KEYS[2], ARGV[1], task_id)
+redis.call('HSET', KEYS[4], task_id, ARGV[2])
+return {task_id, redis.call('HGET', KEYS[3], task_id)}
+"""
+REQUEUE_EXPIRED_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], 0, ARGV[1])
+for _, task_id in ipairs(expired) do
+    redis.call('ZREM', KEYS[1], task_id)
+    redis.call('HDEL', KEYS[3], task_id)
+    redis.call('RPUSH', KEYS[2], task_id)
+end
+return #expired
+"""
+# The lease scripts below only act for the worker recorded as the task's holder, so a
+# worker whose lease expired cannot finish or extend the task of its new holder.
+EXTEND_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then return 0 end
+return redis.call('ZADD', KEYS[1], 'XX', 'CH', ARGV[3], ARGV[1])
+"""
+ACK_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[3], ARGV[1])
+return 1
+"""
+RELEASE_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('RPUSH', KEYS[3], ARGV[1])
+return 1
+"""
+# Keeps the categories in the order they were first seen, without duplicates.
+ADD_MEMBERSHIP_SCRIPT = """
+for _, category in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    if category == ARGV[1] then return 0 end
+end
+return redis.call('RPUSH', KEYS[1], ARGV[1])
+"""
+
+
+class RedisWorkQueue:
+    """Work queue on a Redis-compatible server; requires the optional redis package."""
+
+    def __init__(self, url, visibility_timeout=300, namespace="handpik"):
+        import redis
+
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.visibility_timeout = visibility_timeout
+        self.ns = namespace
+        self._lease_script = self.redis.register_script(LEASE_SCRIPT)
+        self._requeue_script = self.redis.register_script(REQUEUE_EXPIRED_SCRIPT)
+        self._extend_script = self.redis.register_script(EXTEND_SCRIPT)
+        self._ack_script = self.redis.register_script(ACK_SCRIPT)
+        self._release_script = self.redis.register_script(RELEASE_SCRIPT)
+        self._membership_script = self.redis.register_script(ADD_MEMBERSHIP_SCRIPT)
+
+    def _key(self, name):
+        return f"{self.ns}:{name}"
+
+    def enqueue(self, task, dedupe_key=None):
+        if dedupe_key is not None and not self.redis.sadd(self._key("dedupe"), dedupe_key):
+            return None
+        task_id = uuid.uuid4().hex
+        pipe = self.redis.pipeline()
+        pipe.hset(self._key("tasks"), task_id, json.dumps(task))
+        pipe.rpush(self._key("ready"), task_id)
+        pipe.execute()
+        return task_id
+
+    def _requeue_expired(self):
+        self._requeue_script(keys=[self._key("leased"), self._key("ready"), self._key("holders")], args=[time.time()])
+
+    def lease(self, worker_id):
+        self._requeue_expired()
+        leased = self._lease_script(
+            keys=[self._key("ready"), self._key("leased"), self._key("tasks"), self._key("holders")],
+            args=[time.time() + self.visibility_timeout, worker_id]
+        )
+        if leased is None:
+            return None
+        task_id, payload = leased[0], leased[1] if len(leased) > 1 else None
+        if payload is None:
+            # Acked or reset since it was queued.
+            self._ack_script(keys=[self._key("leased"), self._key("holders"), self._key("tasks")],
+                             args=[task_id, worker_id])
+            return None
+        return task_id, json.loads(payload)
+
+    def extend(self, task_id, worker_id):
+        self._extend_script(keys=[self._key("leased"), self._key("holders")],
+                            args=[task_id, worker_id, time.time() + self.visibility_timeout])
+
+    def ack(self, task_id, worker_id):
+        """Finish the task; ignored unless ``worker_id`` still holds its lease."""
+        return bool(self._ack_script(keys=[self._key("leased"), self._key("holders"), self._key("tasks")],
+                                     args=[task_id, worker_id]))
+
+    def release(self, task_id, worker_id):
+        self._release_script(keys=[self._key("leased"), self._key("holders"), self._key("ready")],
+                             args=[task_id, worker_id])
+
+    def pending(self):
+        return self.redis.hlen(self._key("tasks"))
+
+    def add_membership(self, store, product_key, category):
+        self._membership_script(keys=[self._key(f"categories:{store}:{product_key}")], args=[category])
+
+    def put_result(self, store, product_key, record):
+        self.redis.hset(self._key(f"results:{store}"), product_key, json.dumps(record, ensure_ascii=False))
+
+    def results(self, store):
+        rows = self.redis.hgetall(self._key(f"results:{store}"))
+        return [
+            (json.loads(record), self.redis.lrange(self._key(f"categories:{store}:{key}"), 0, -1))
+            for key, record in rows.items()
+        ]
+
+    def reset(self):
+        keys = [self._key(name) for name in ("dedupe", "tasks", "ready", "leased", "holders")]
+        for pattern in ("results:*", "categories:*"):
+            keys.extend(self.redis.scan_iter(match=self._key(pattern), count=1000))
+        for start in range(0, len(keys), 1000):
+            self.redis.delete(*keys[start:start + 1000])
+
+    def close(self):
+        self.redis.close()
+
+
+def open_work_queue(spec, visibility_timeout=300):
+    if not spec or spec == "local":
+        return LocalWorkQueue(visibility_timeout=visibility_timeout)
+    if spec.startswith(("redis://", "rediss://")):
+        return RedisWorkQueue(spec, visibility_timeout=visibility_timeout)
+    if spec.startswith("sqlite:///"):
+        spec = spec[len("sqlite:///"):]
+    return SQLiteWorkQueue(spec, visibility_timeout=visibility_timeout)